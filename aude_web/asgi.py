@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Sous ASGI (daphne aude_web.asgi:application), les vues async du site
+sont servies (VUES_ASYNC, voir blog/urls.py et website/urls.py) ;
+AUDE_VUES_ASYNC=0 revient aux vues synchrones.
 """
 
 import os
@@ -12,5 +16,14 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'aude_web.settings')
+os.environ.setdefault('AUDE_VUES_ASYNC', '1')
 
 application = get_asgi_application()
+
+# Templates compilés avant la première requête (voir aude_web/precompilation.py)
+from django.conf import settings  # noqa: E402
+
+if settings.PRECHARGER_TEMPLATES:
+    from aude_web.precompilation import precompiler_templates
+
+    precompiler_templates()
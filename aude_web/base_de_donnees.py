@@ -0,0 +1,178 @@
+"""
+Profils de connexion à la base de données
+Conventions :
+- Importé par settings.py : aucune dépendance à Django ou aux applications
+- Un profil = options de connexion + durée de vie des connexions
+- Moteur choisi par variables d'environnement (voir base_depuis_environnement)
+
+Profils SQLite :
+- 'defaut' : réglages d'origine de Django (une connexion par requête)
+- 'production' : WAL (lecteurs non bloqués par l'écrivain), synchronous=NORMAL,
+  mmap, cache de pages, tables temporaires en mémoire, attente de 20 s sur
+  un verrou au lieu de "database is locked", transactions IMMEDIATE
+  (verrou d'écriture pris dès BEGIN : pas d'impasse lecture -> écriture)
+  et connexions persistantes
+
+Variables d'environnement :
+    AUDE_DB_MOTEUR        sqlite (défaut), postgresql ou mysql
+    AUDE_DB_NOM           nom de la base (chemin du fichier pour SQLite)
+    AUDE_DB_UTILISATEUR, AUDE_DB_MOT_DE_PASSE, AUDE_DB_HOTE, AUDE_DB_PORT
+    AUDE_DB_CONN_MAX_AGE  durée de vie des connexions persistantes (600 s)
+    AUDE_DB_POOL_MIN, AUDE_DB_POOL_MAX
+                          taille du pool PostgreSQL (psycopg 3 + psycopg_pool)
+    AUDE_DB_REPLIQUES     hôtes des réplicas en lecture, séparés par des
+                          virgules (hote ou hote:port, même base et mêmes
+                          identifiants que la base principale)
+    AUDE_DB_SOURCE        fichier SQLite lu par migrer_depuis_sqlite
+                          (alias 'sqlite_source', défaut : db.sqlite3)
+
+PostgreSQL : requirements.txt installe psycopg 3 et psycopg_pool ; sans
+eux (psycopg2 seul), manage.py check avertit que le pool est remplacé
+par des connexions persistantes (voir aude_web/verifications.py)
+"""
+
+import os
+from importlib.util import find_spec
+
+ALIAS_SOURCE_SQLITE = 'sqlite_source'
+
+PROFILS_SQLITE = {
+    'defaut': {
+        'pragmas': {},
+        'timeout': 5,
+        'transaction_mode': None,
+        'conn_max_age': 0,
+    },
+    'production': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64000,  # en Kio (valeur négative) : 64 Mo
+            'temp_store': 'MEMORY',
+        },
+        'timeout': 20,
+        'transaction_mode': 'IMMEDIATE',
+        'conn_max_age': 600,
+    },
+}
+
+
+def pragmas_sqlite(profil):
+    """Commandes PRAGMA exécutées à l'ouverture de chaque connexion"""
+    return [f'PRAGMA {nom}={valeur}' for nom, valeur in PROFILS_SQLITE[profil]['pragmas'].items()]
+
+
+def base_sqlite(nom, profil='production'):
+    """Entrée de DATABASES pour un fichier SQLite avec le profil donné"""
+    if profil not in PROFILS_SQLITE:
+        raise ValueError(f"Profil SQLite inconnu : {profil} ({', '.join(PROFILS_SQLITE)})")
+
+    reglages = PROFILS_SQLITE[profil]
+    options = {'timeout': reglages['timeout']}
+    if reglages['pragmas']:
+        options['init_command'] = ';'.join(pragmas_sqlite(profil))
+    if reglages['transaction_mode']:
+        options['transaction_mode'] = reglages['transaction_mode']
+
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': nom,
+        'OPTIONS': options,
+        'CONN_MAX_AGE': reglages['conn_max_age'],
+        # Connexion persistante vérifiée avant réutilisation
+        'CONN_HEALTH_CHECKS': reglages['conn_max_age'] != 0,
+    }
+
+
+def _entier(variable, defaut):
+    return int(os.environ.get(variable, defaut))
+
+
+def pool_disponible():
+    """Pool natif de Django (5.1+) : nécessite psycopg 3 et psycopg_pool"""
+    return find_spec('psycopg') is not None and find_spec('psycopg_pool') is not None
+
+
+def base_postgresql():
+    """
+    PostgreSQL avec pool de connexions si psycopg 3 est installé,
+    sinon (psycopg2) connexions persistantes vérifiées avant réutilisation
+    """
+    base = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('AUDE_DB_NOM', 'aude_web'),
+        'USER': os.environ.get('AUDE_DB_UTILISATEUR', ''),
+        'PASSWORD': os.environ.get('AUDE_DB_MOT_DE_PASSE', ''),
+        'HOST': os.environ.get('AUDE_DB_HOTE', ''),
+        'PORT': os.environ.get('AUDE_DB_PORT', ''),
+        'OPTIONS': {},
+    }
+    if pool_disponible():
+        # Le pool remplace les connexions persistantes (CONN_MAX_AGE doit valoir 0)
+        base['OPTIONS']['pool'] = {
+            'min_size': _entier('AUDE_DB_POOL_MIN', 2),
+            'max_size': _entier('AUDE_DB_POOL_MAX', 10),
+            'timeout': 10,
+        }
+        base['CONN_MAX_AGE'] = 0
+    else:
+        base['CONN_MAX_AGE'] = _entier('AUDE_DB_CONN_MAX_AGE', 600)
+        base['CONN_HEALTH_CHECKS'] = True
+    return base
+
+
+def base_mysql():
+    """MySQL / MariaDB via mysql-connector-python, connexions persistantes"""
+    return {
+        'ENGINE': 'mysql.connector.django',
+        'NAME': os.environ.get('AUDE_DB_NOM', 'aude_web'),
+        'USER': os.environ.get('AUDE_DB_UTILISATEUR', ''),
+        'PASSWORD': os.environ.get('AUDE_DB_MOT_DE_PASSE', ''),
+        'HOST': os.environ.get('AUDE_DB_HOTE', ''),
+        'PORT': os.environ.get('AUDE_DB_PORT', ''),
+        'OPTIONS': {'charset': 'utf8mb4'},
+        'CONN_MAX_AGE': _entier('AUDE_DB_CONN_MAX_AGE', 600),
+        'CONN_HEALTH_CHECKS': True,
+    }
+
+
+def base_depuis_environnement(fichier_sqlite, profil_sqlite='production'):
+    """Entrée DATABASES['default'] selon AUDE_DB_MOTEUR"""
+    moteur = os.environ.get('AUDE_DB_MOTEUR', 'sqlite').lower()
+    if moteur in ('postgresql', 'postgres'):
+        return base_postgresql()
+    if moteur == 'mysql':
+        return base_mysql()
+    if moteur == 'sqlite':
+        return base_sqlite(os.environ.get('AUDE_DB_NOM', fichier_sqlite), profil_sqlite)
+    raise ValueError(f"AUDE_DB_MOTEUR inconnu : {moteur} (sqlite, postgresql ou mysql)")
+
+
+def repliques_depuis_environnement(principale):
+    """
+    Alias 'replique_1', 'replique_2'... construits à partir de la base
+    principale et de AUDE_DB_REPLIQUES (ignoré pour SQLite)
+    """
+    hotes = [hote.strip() for hote in os.environ.get('AUDE_DB_REPLIQUES', '').split(',') if hote.strip()]
+    if principale['ENGINE'] == 'django.db.backends.sqlite3':
+        return {}
+
+    repliques = {}
+    for numero, hote in enumerate(hotes, start=1):
+        nom_hote, _, port = hote.partition(':')
+        repliques[f'replique_{numero}'] = {
+            **principale,
+            'HOST': nom_hote,
+            'PORT': port or principale.get('PORT', ''),
+            # Les tests lisent la base de test principale au lieu d'un réplica
+            'TEST': {'MIRROR': 'default'},
+        }
+    return repliques
+
+
+def source_sqlite_depuis_environnement(fichier_sqlite):
+    """Alias 'sqlite_source' : fichier copié par migrer_depuis_sqlite (AUDE_DB_SOURCE)"""
+    return {
+        ALIAS_SOURCE_SQLITE: base_sqlite(os.environ.get('AUDE_DB_SOURCE', fichier_sqlite), 'defaut'),
+    }
@@ -0,0 +1,69 @@
+"""
+Cache partagé entre les processus du serveur
+Conventions :
+- Importé par settings.py : aucune dépendance à Django ou aux applications
+  (la vérification au démarrage est dans aude_web/verifications.py)
+- LocMemCache est propre à chaque processus : avec plusieurs workers, une
+  invalidation (version incrémentée, page supprimée) n'atteint que le
+  processus qui l'a faite et les autres servent un contenu périmé jusqu'à
+  expiration. Caches concernés : pages vitrine (website/cache_pages.py),
+  agrégats (blog/agregats.py), flux (blog/flux.py), sitemaps
+  (aude_web/plan_du_site.py), fragments (blog/fragments.py), pages
+  planifiées (blog/planification.py) et tampon des vues (blog/compteur.py)
+
+Variables d'environnement :
+    AUDE_CACHE_URL    redis://hote:6379/0 (ou rediss://), ou
+                      memcached://hote:11211 (plusieurs serveurs séparés
+                      par des virgules, nécessite pymemcache) ;
+                      LocMemCache si absente
+    AUDE_PROCESSUS    nombre de processus du serveur (workers) : au-delà
+                      de 1, LocMemCache est refusé par manage.py check
+"""
+
+import os
+from urllib.parse import urlsplit
+
+PREFIXE = 'aude-web'
+
+
+def cache_local():
+    """LocMemCache : un cache par processus (développement, worker unique)"""
+    return {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': PREFIXE,
+    }
+
+
+def cache_redis(url):
+    return {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': url,
+        'KEY_PREFIX': PREFIXE,
+    }
+
+
+def cache_memcached(url):
+    # memcached://hote1:11211,hote2:11211
+    serveurs = [serveur.strip() for serveur in urlsplit(url).netloc.split(',') if serveur.strip()]
+    return {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': serveurs,
+        'KEY_PREFIX': PREFIXE,
+    }
+
+
+def cache_depuis_environnement():
+    """Entrée CACHES['default'] selon AUDE_CACHE_URL"""
+    url = os.environ.get('AUDE_CACHE_URL', '').strip()
+    if not url:
+        return cache_local()
+    schema = urlsplit(url).scheme.lower()
+    if schema in ('redis', 'rediss', 'unix'):
+        return cache_redis(url)
+    if schema == 'memcached':
+        return cache_memcached(url)
+    raise ValueError(f"AUDE_CACHE_URL inconnue : {url} (redis://, rediss:// ou memcached://)")
+
+
+def processus_depuis_environnement():
+    return int(os.environ.get('AUDE_PROCESSUS', 1))
@@ -0,0 +1,224 @@
+"""
+Plan du site (sitemaps) : index + sections découpées en tranches
+Principe :
+- Chaque section (articles, catégories, tags, pages vitrine) est découpée
+  par plage de clés primaires : tranche n = pk de n * 50 000 à
+  (n + 1) * 50 000 - 1, donc au plus 50 000 URL par fichier (limite du
+  protocole) et un nouvel objet ne décale pas les autres tranches
+- /sitemap.xml liste les tranches non vides avec leur lastmod
+  (une requête groupée par section), /sitemap-<section>-<n>.xml les URL
+- Index et tranches sont conservés dans le cache sans expiration ; une
+  modification n'invalide que la tranche concernée (versions incrémentées
+  après le commit, voir blog/signals.py et website/signals.py)
+- Commande ecrire_plan_du_site : mêmes fichiers écrits sur disque pour
+  être servis comme fichiers statiques par le serveur web
+
+Les sections sont déclarées dans aude_web/urls.py (SITEMAPS).
+"""
+
+from abc import ABCMeta, abstractmethod
+from pathlib import Path
+from types import SimpleNamespace
+
+from django.contrib.sitemaps import Sitemap
+from django.contrib.sitemaps.views import SitemapIndexItem, x_robots_tag
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.db.models import F, Max
+from django.db.models.functions import Floor
+from django.http import Http404, HttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from aude_web.repliques import invalider_apres_commit
+
+# Nombre maximal d'URL par fichier (protocole sitemaps)
+LIMITE = 50_000
+
+CLE_VERSION_INDEX = 'plan_du_site:version:index'
+
+
+class SitemapParTranches(Sitemap, metaclass=ABCMeta):
+    """
+    Section du plan du site découpée par plage de clés primaires
+    Les sous-classes définissent section, objets() et lastmod()
+    """
+    section = None
+    limit = LIMITE
+
+    def __init__(self, tranche=0):
+        self.tranche = tranche
+
+    @abstractmethod
+    def objets(self):
+        """Objets publics de la section (queryset)"""
+
+    def expression_lastmod(self):
+        """Agrégat donnant le lastmod d'une tranche"""
+        return Max('date_modification')
+
+    def items(self):
+        debut = self.tranche * self.limit
+        return self.objets().filter(pk__gte=debut, pk__lt=debut + self.limit).order_by('pk')
+
+    def tranches(self):
+        """[(numéro, lastmod)] des tranches non vides, en une requête"""
+        lignes = self.objets().order_by().annotate(
+            tranche=Floor(F('pk') / self.limit)
+        ).values('tranche').annotate(
+            lastmod=self.expression_lastmod()
+        ).order_by('tranche')
+        return [(int(ligne['tranche']), ligne['lastmod']) for ligne in lignes]
+
+    @classmethod
+    def tranche_de(cls, pk):
+        return pk // cls.limit
+
+    def duree_cache(self):
+        """Durée de validité en cache (None : jusqu'à la prochaine invalidation)"""
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Versions et invalidation
+# ---------------------------------------------------------------------------
+
+def _cle_version(section, tranche=None):
+    if tranche is None:
+        return f'plan_du_site:version:{section}'
+    return f'plan_du_site:version:{section}:{tranche}'
+
+
+def _version(cle):
+    return cache.get_or_set(cle, 1, timeout=None)
+
+
+def _incrementer(cle):
+    try:
+        cache.incr(cle)
+    except ValueError:
+        # Pas encore de version : rien à invalider
+        cache.set(cle, 1, timeout=None)
+
+
+def invalider(section, tranche=None):
+    """
+    Nouvelle version de la tranche (ou de toute la section si tranche
+    vaut None) et de l'index, après le commit de la transaction en cours
+    """
+    def incrementer():
+        _incrementer(_cle_version(section, tranche))
+        _incrementer(CLE_VERSION_INDEX)
+
+    invalider_apres_commit(incrementer)
+
+
+def _plus_courte(durees):
+    durees = [duree for duree in durees if duree is not None]
+    return min(durees) if durees else None
+
+
+# ---------------------------------------------------------------------------
+# Rendu (avec cache)
+# ---------------------------------------------------------------------------
+
+def url_tranche(section, tranche):
+    return reverse('sitemap_section', kwargs={'section': section, 'tranche': tranche})
+
+
+def contenu_index(sitemaps, domaine, protocole):
+    """XML de l'index : une entrée par tranche non vide"""
+    cle = f'plan_du_site:index:{_version(CLE_VERSION_INDEX)}:{protocole}://{domaine}'
+    contenu = cache.get(cle)
+    if contenu is None:
+        elements = []
+        durees = []
+        for section, classe in sitemaps.items():
+            sitemap = classe()
+            for tranche, lastmod in sitemap.tranches():
+                elements.append(SitemapIndexItem(
+                    f'{protocole}://{domaine}{url_tranche(section, tranche)}',
+                    lastmod,
+                ))
+            durees.append(sitemap.duree_cache())
+        contenu = render_to_string('sitemap_index.xml', {'sitemaps': elements}).encode()
+        cache.set(cle, contenu, timeout=_plus_courte(durees))
+    return contenu
+
+
+def contenu_tranche(sitemaps, section, tranche, domaine, protocole):
+    """XML d'une tranche (None si la section est inconnue ou la tranche vide)"""
+    classe = sitemaps.get(section)
+    if classe is None:
+        return None
+
+    cle = (
+        f'plan_du_site:{section}:{_version(_cle_version(section))}'
+        f':{tranche}:{_version(_cle_version(section, tranche))}:{protocole}://{domaine}'
+    )
+    contenu = cache.get(cle)
+    if contenu is None:
+        sitemap = classe(tranche)
+        urls = sitemap.get_urls(site=SimpleNamespace(domain=domaine), protocol=protocole)
+        if not urls:
+            return None
+        contenu = render_to_string('sitemap.xml', {'urlset': urls}).encode()
+        cache.set(cle, contenu, timeout=sitemap.duree_cache())
+    return contenu
+
+
+# ---------------------------------------------------------------------------
+# Vues
+# ---------------------------------------------------------------------------
+
+@x_robots_tag
+def index(request, sitemaps):
+    contenu = contenu_index(sitemaps, get_current_site(request).domain, request.scheme)
+    return HttpResponse(contenu, content_type='application/xml')
+
+
+@x_robots_tag
+def section(request, sitemaps, section, tranche):
+    contenu = contenu_tranche(
+        sitemaps, section, tranche, get_current_site(request).domain, request.scheme
+    )
+    if contenu is None:
+        raise Http404(f'Tranche {section}-{tranche} vide ou inconnue')
+    return HttpResponse(contenu, content_type='application/xml')
+
+
+# ---------------------------------------------------------------------------
+# Écriture sur disque
+# ---------------------------------------------------------------------------
+
+def ecrire(sitemaps, dossier, domaine, protocole='https'):
+    """
+    Écrit sitemap.xml et les tranches dans le dossier
+    Seuls les fichiers modifiés sont réécrits, les tranches disparues supprimées
+    Retourne (écrits, inchangés, supprimés)
+    """
+    dossier = Path(dossier)
+    dossier.mkdir(parents=True, exist_ok=True)
+
+    fichiers = {reverse('sitemap_index'): contenu_index(sitemaps, domaine, protocole)}
+    for nom, classe in sitemaps.items():
+        for tranche, _ in classe().tranches():
+            contenu = contenu_tranche(sitemaps, nom, tranche, domaine, protocole)
+            if contenu is not None:
+                fichiers[url_tranche(nom, tranche)] = contenu
+
+    ecrits, inchanges = [], []
+    for url, contenu in fichiers.items():
+        chemin = dossier / url.lstrip('/')
+        if chemin.exists() and chemin.read_bytes() == contenu:
+            inchanges.append(chemin)
+            continue
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        chemin.write_bytes(contenu)
+        ecrits.append(chemin)
+
+    attendus = {dossier / url.lstrip('/') for url in fichiers}
+    supprimes = [chemin for chemin in dossier.glob('sitemap-*.xml') if chemin not in attendus]
+    for chemin in supprimes:
+        chemin.unlink()
+    return ecrits, inchanges, supprimes
@@ -0,0 +1,54 @@
+"""
+Précompilation des templates au démarrage
+Principe :
+- Le chargeur en cache (django.template.loaders.cached) garde chaque
+  template compilé en mémoire, mais seulement après sa première
+  utilisation : sans préchargement, la première requête de chaque
+  processus lit et analyse tous les templates de sa page (base, inclusions,
+  bibliothèques de balises)
+- precompiler_templates() charge tous les templates des dossiers DIRS
+  au démarrage du processus (aude_web/wsgi.py, aude_web/asgi.py)
+- Un template invalide est signalé dans les logs sans bloquer le
+  démarrage : seules les pages qui l'utilisent sont en erreur
+
+Configuration (settings.py) :
+PRECHARGER_TEMPLATES = True   # défaut : hors DEBUG
+"""
+
+import logging
+import os
+from pathlib import Path
+
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def noms_templates(dossier):
+    """Noms (relatifs au dossier) des templates d'un dossier DIRS"""
+    dossier = Path(dossier)
+    for racine, _, fichiers in os.walk(dossier):
+        for nom in sorted(fichiers):
+            if nom.endswith(EXTENSIONS):
+                yield (Path(racine) / nom).relative_to(dossier).as_posix()
+
+
+def precompiler_templates():
+    """Compile les templates des dossiers DIRS : (nombre compilé, noms en erreur)"""
+    compiles, erreurs = 0, []
+    for moteur in engines.all():
+        if not isinstance(moteur, DjangoTemplates):
+            continue
+        for dossier in moteur.engine.dirs:
+            for nom in noms_templates(dossier):
+                try:
+                    moteur.engine.get_template(nom)
+                except TemplateSyntaxError as exc:
+                    logger.warning('Template %s invalide : %s', nom, exc)
+                    erreurs.append(nom)
+                else:
+                    compiles += 1
+    return compiles, erreurs
@@ -0,0 +1,385 @@
+"""
+Profilage des requêtes (SQL, rendu des templates, durée totale)
+Principe :
+- Chaque requête mesure le nombre et la durée des requêtes SQL
+  (execute_wrapper sur toutes les connexions), le temps de rendu des
+  templates et la durée totale
+- Les mesures sont renvoyées dans l'en-tête Server-Timing (onglet
+  Réseau du navigateur, outils de benchmark), en DEBUG ou aux membres
+  du staff seulement : les durées SQL ne sont pas publiques
+- Inactif (ACTIF False) : ni middleware, ni chronométrage des templates
+  (Template.render n'est remplacé qu'à la création du middleware, et
+  rétabli dès que PROFILAGE est désactivé : override_settings des tests)
+- Les dernières mesures par nom d'URL sont conservées en mémoire :
+  centiles consultables par le staff sur /admin/profilage/ (remise à
+  zéro par POST, avec jeton CSRF)
+- Budget de requêtes SQL par vue : avertissement dans les logs, ou
+  exception en mode strict (pour faire échouer les tests)
+- Listes de l'administration (SansRequeteParLigneMixin) : même traitement
+  pour les requêtes exécutées par ligne (N+1 d'une colonne calculée)
+
+Configuration (settings.py) :
+    PROFILAGE = {
+        'ACTIF': True,
+        'ECHANTILLONS': 1000,      # mesures conservées par nom d'URL
+        'BUDGETS': {               # nom d'URL ou nom de la vue -> requêtes max
+            'blog:article_list': 10,
+            'ArticleDetailView': 12,
+        },
+        'STRICT': False,           # True : lève BudgetRequetesDepasse
+    }
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import setting_changed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import JsonResponse
+from django.template.backends import django as backend_django
+from django.views.decorators.csrf import csrf_protect
+from django.views.decorators.http import require_http_methods
+
+logger = logging.getLogger(__name__)
+
+CONFIGURATION_PAR_DEFAUT = {
+    'ACTIF': True,
+    'ECHANTILLONS': 1000,
+    'BUDGETS': {},
+    'STRICT': False,
+}
+
+CENTILES = (50, 95, 99)
+
+
+def configuration():
+    return {**CONFIGURATION_PAR_DEFAUT, **getattr(settings, 'PROFILAGE', {})}
+
+
+class BudgetRequetesDepasse(AssertionError):
+    """Vue ayant exécuté plus de requêtes SQL que son budget (mode strict)"""
+
+
+class RequetesParLigne(BudgetRequetesDepasse):
+    """Liste d'administration exécutant des requêtes SQL par ligne (mode strict)"""
+
+
+class Mesure:
+    """Compteurs d'une requête HTTP"""
+
+    def __init__(self):
+        self.debut = time.perf_counter()
+        self.requetes = 0
+        self.duree_sql = 0.0
+        self.duree_rendu = 0.0
+        self._profondeur_rendu = 0
+
+    @property
+    def duree_totale(self):
+        return time.perf_counter() - self.debut
+
+    def server_timing(self):
+        """Valeur de l'en-tête Server-Timing (durées en millisecondes)"""
+        return ', '.join([
+            f'sql;desc="{self.requetes} requetes";dur={self.duree_sql * 1000:.1f}',
+            f'rendu;dur={self.duree_rendu * 1000:.1f}',
+            f'total;dur={self.duree_totale * 1000:.1f}',
+        ])
+
+
+_mesure = ContextVar('profilage_mesure', default=None)
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation (SQL et templates)
+# ---------------------------------------------------------------------------
+
+def _chronometrer_sql(execute, sql, params, many, context):
+    mesure = _mesure.get()
+    if mesure is None:
+        return execute(sql, params, many, context)
+
+    debut = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        mesure.requetes += 1
+        mesure.duree_sql += time.perf_counter() - debut
+
+
+def _instrumenter_connexion(connection, **kwargs):
+    if _chronometrer_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_chronometrer_sql)
+
+
+# Template.render d'origine tant que le chronométrage est en place
+_render_d_origine = None
+
+
+def _instrumenter_templates():
+    """Chronomètre le rendu des templates de premier niveau (include compris)"""
+    global _render_d_origine
+    if _render_d_origine is not None:
+        return
+    render = _render_d_origine = backend_django.Template.render
+
+    def render_chronometre(self, context=None, request=None):
+        mesure = _mesure.get()
+        if mesure is None:
+            return render(self, context, request)
+
+        mesure._profondeur_rendu += 1
+        debut = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            mesure._profondeur_rendu -= 1
+            # render_to_string appelé pendant un rendu : déjà compté
+            if not mesure._profondeur_rendu:
+                mesure.duree_rendu += time.perf_counter() - debut
+
+    backend_django.Template.render = render_chronometre
+
+
+def desinstrumenter():
+    """Retire le chronométrage des requêtes SQL et des templates"""
+    global _render_d_origine
+    connection_created.disconnect(dispatch_uid='profilage')
+    for connection in connections.all(initialized_only=True):
+        if _chronometrer_sql in connection.execute_wrappers:
+            connection.execute_wrappers.remove(_chronometrer_sql)
+    if _render_d_origine is not None:
+        backend_django.Template.render = _render_d_origine
+        _render_d_origine = None
+
+
+@receiver(setting_changed, dispatch_uid='profilage_desactive')
+def _profilage_desactive(setting, **kwargs):
+    """Profilage désactivé (override_settings) : instrumentation retirée"""
+    if setting == 'PROFILAGE' and not configuration()['ACTIF']:
+        desinstrumenter()
+
+
+# ---------------------------------------------------------------------------
+# Statistiques en mémoire
+# ---------------------------------------------------------------------------
+
+class Statistiques:
+    """Dernières mesures par nom d'URL (fenêtre glissante)"""
+
+    def __init__(self, taille):
+        self.taille = taille
+        self._verrou = threading.Lock()
+        self._mesures = {}
+
+    def ajouter(self, nom, mesure):
+        with self._verrou:
+            if nom not in self._mesures:
+                self._mesures[nom] = deque(maxlen=self.taille)
+            self._mesures[nom].append((mesure.duree_totale, mesure.duree_sql, mesure.requetes))
+
+    def vider(self):
+        with self._verrou:
+            self._mesures.clear()
+
+    def resume(self):
+        """{nom: {'nombre', 'total_ms': {p50, p95, p99}, 'sql_ms': ..., 'requetes': ...}}"""
+        with self._verrou:
+            copie = {nom: list(mesures) for nom, mesures in self._mesures.items()}
+
+        resume = {}
+        for nom, mesures in sorted(copie.items()):
+            totaux, sql, requetes = zip(*mesures)
+            resume[nom] = {
+                'nombre': len(mesures),
+                'total_ms': _centiles(totaux, 1000),
+                'sql_ms': _centiles(sql, 1000),
+                'requetes': _centiles(requetes),
+            }
+        return resume
+
+
+def centile(valeurs_triees, p):
+    """Centile au rang le plus proche d'une liste triée non vide"""
+    rang = max(0, -(-len(valeurs_triees) * p // 100) - 1)
+    return valeurs_triees[rang]
+
+
+def _centiles(valeurs, facteur=1):
+    valeurs = sorted(valeurs)
+    return {f'p{p}': round(centile(valeurs, p) * facteur, 1) for p in CENTILES}
+
+
+statistiques = Statistiques(configuration()['ECHANTILLONS'])
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+def _noms_vue(request):
+    """Nom d'URL ('blog:article_list') et nom de la vue ('ArticleListView')"""
+    correspondance = getattr(request, 'resolver_match', None)
+    if correspondance is None:
+        return None, None
+    vue = getattr(correspondance.func, 'view_class', correspondance.func)
+    return correspondance.view_name, getattr(vue, '__name__', None)
+
+
+def _est_staff(user):
+    return user is not None and user.is_active and user.is_staff
+
+
+class ProfilageMiddleware:
+    """
+    À placer en tête de MIDDLEWARE pour inclure les requêtes
+    des autres middlewares (session, authentification)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        conf = configuration()
+        if not conf['ACTIF']:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.budgets = conf['BUDGETS']
+        self.strict = conf['STRICT']
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+        connection_created.connect(_instrumenter_connexion, dispatch_uid='profilage')
+        for connection in connections.all():
+            _instrumenter_connexion(connection)
+        _instrumenter_templates()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        jeton = _mesure.set(Mesure())
+        try:
+            response = self.get_response(request)
+            server_timing = _mesure.get().server_timing()
+            if settings.DEBUG or _est_staff(getattr(request, 'user', None)):
+                response['Server-Timing'] = server_timing
+            return self._terminer(request, response)
+        finally:
+            _mesure.reset(jeton)
+
+    async def __acall__(self, request):
+        jeton = _mesure.set(Mesure())
+        try:
+            response = await self.get_response(request)
+            server_timing = _mesure.get().server_timing()
+            if settings.DEBUG or (hasattr(request, 'auser') and _est_staff(await request.auser())):
+                response['Server-Timing'] = server_timing
+            return self._terminer(request, response)
+        finally:
+            _mesure.reset(jeton)
+
+    def _terminer(self, request, response):
+        mesure = _mesure.get()
+
+        nom_url, nom_vue = _noms_vue(request)
+        if nom_url is None:
+            return response
+        statistiques.ajouter(nom_url, mesure)
+
+        budget = self.budgets.get(nom_url, self.budgets.get(nom_vue))
+        if budget is not None and mesure.requetes > budget:
+            message = (
+                f"{nom_url} ({nom_vue}) : {mesure.requetes} requêtes SQL "
+                f"pour un budget de {budget} ({request.path})"
+            )
+            if self.strict:
+                raise BudgetRequetesDepasse(message)
+            logger.warning(message)
+        return response
+
+
+# ---------------------------------------------------------------------------
+# Administration : requêtes par ligne des listes
+# ---------------------------------------------------------------------------
+
+class LignesSurveillees(list):
+    """
+    Lignes d'une liste d'administration (cl.result_list) : les requêtes
+    exécutées pendant l'affichage de chaque ligne sont relevées, puis
+    transmises au rapport une fois toutes les lignes affichées
+    """
+
+    def __init__(self, lignes, rapport):
+        super().__init__(lignes)
+        self.rapport = rapport
+
+    def __iter__(self):
+        par_ligne = []
+
+        def relever(execute, sql, params, many, context):
+            par_ligne[-1].append(sql)
+            return execute(sql, params, many, context)
+
+        with ExitStack() as pile:
+            for connection in connections.all():
+                pile.enter_context(connection.execute_wrapper(relever))
+            for ligne in super().__iter__():
+                # Les colonnes de la ligne sont calculées entre deux itérations
+                par_ligne.append([])
+                yield ligne
+        self.rapport(par_ligne)
+
+
+class SansRequeteParLigneMixin:
+    """
+    ModelAdmin : signale les colonnes de list_display qui exécutent une
+    requête par ligne (compteur sans annotation, clé étrangère sans
+    list_select_related) ; avertissement ou RequetesParLigne en mode strict
+    """
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        liste = (getattr(response, 'context_data', None) or {}).get('cl')
+        if liste is not None:
+            liste.result_list = LignesSurveillees(
+                liste.result_list, partial(self._signaler_requetes_par_ligne, request)
+            )
+        return response
+
+    def _signaler_requetes_par_ligne(self, request, par_ligne):
+        fautives = [requetes for requetes in par_ligne if requetes]
+        if not fautives:
+            return
+        message = (
+            f"{self.model._meta.label} : {len(fautives)} ligne(s) sur {len(par_ligne)} "
+            f"exécutent des requêtes SQL dans la liste ({request.path}), "
+            f"par exemple : {fautives[0][0][:200]}"
+        )
+        if configuration()['STRICT']:
+            raise RequetesParLigne(message)
+        logger.warning(message)
+
+
+@staff_member_required
+@require_http_methods(['GET', 'HEAD', 'POST'])
+@csrf_protect
+def tableau_profilage(request):
+    """Centiles par nom d'URL (JSON) ; un POST remet les compteurs à zéro"""
+    if request.method == 'POST':
+        statistiques.vider()
+    return JsonResponse(
+        {'echantillons': statistiques.taille, 'vues': statistiques.resume()},
+        json_dumps_params={'indent': 2, 'ensure_ascii': False},
+    )
@@ -0,0 +1,166 @@
+"""
+Lecture sur réplicas pour les vues publiques
+Principe :
+- Le middleware marque les requêtes GET/HEAD servies par une vue publique
+  (blog.views, website.views) : leurs lectures peuvent aller sur un réplica
+- Le routeur envoie ces lectures sur un réplica tiré au hasard ; tout le
+  reste reste sur la base principale : écritures (dont le compteur de vues),
+  lectures dans une transaction, administration, commandes
+- Après une écriture (POST, PUT, PATCH, DELETE), un cookie maintient les
+  requêtes suivantes du même visiteur sur la base principale pendant
+  quelques secondes : il relit ce qu'il vient d'écrire malgré le retard
+  de réplication
+- Une nouvelle version de cache (invalider_apres_commit) renvoie toutes
+  les vues publiques sur la base principale pendant la même durée : les
+  entrées reconstruites juste après ne reprennent pas les données d'un
+  réplica en retard sous la nouvelle version
+
+Configuration (settings.py) :
+    REPLIQUES = {
+        'ALIAS': ['replique_1'],   # alias de DATABASES en lecture seule
+        'MODULES': ('blog.views', 'website.views'),
+        'DUREE_PRIMAIRE': 5,       # secondes sur la base principale après écriture
+                                   # ou nouvelle version de cache
+        'COOKIE': 'aude_primaire',
+    }
+    DATABASE_ROUTERS = ['aude_web.repliques.RouteurRepliques']
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+CONFIGURATION_PAR_DEFAUT = {
+    'ALIAS': [],
+    'MODULES': ('blog.views', 'website.views'),
+    'DUREE_PRIMAIRE': 5,
+    'COOKIE': 'aude_primaire',
+}
+
+METHODES_LECTURE = ('GET', 'HEAD', 'OPTIONS')
+
+# Présente pendant DUREE_PRIMAIRE après une nouvelle version de cache
+CLE_VERSION_RECENTE = 'repliques:version_recente'
+
+
+def configuration():
+    return {**CONFIGURATION_PAR_DEFAUT, **getattr(settings, 'REPLIQUES', {})}
+
+
+def invalider_apres_commit(incrementer):
+    """
+    Nouvelle version de cache après le commit (incrementer), précédée de la
+    bascule des vues publiques sur la base principale
+    """
+    def executer():
+        conf = configuration()
+        if conf['ALIAS']:
+            cache.set(CLE_VERSION_RECENTE, True, timeout=conf['DUREE_PRIMAIRE'])
+        incrementer()
+
+    transaction.on_commit(executer)
+
+
+def version_recente():
+    """Une version de cache a changé il y a moins de DUREE_PRIMAIRE secondes"""
+    return cache.get(CLE_VERSION_RECENTE, False)
+
+
+class EtatRequete:
+    """Autorisation de lire sur un réplica pour la requête en cours"""
+
+    def __init__(self):
+        self.repliques = False
+
+
+_etat = ContextVar('repliques_etat', default=None)
+
+
+class RouteurRepliques:
+    """Routeur de base de données (DATABASE_ROUTERS)"""
+
+    def _repliques(self):
+        return configuration()['ALIAS']
+
+    def db_for_read(self, model, **hints):
+        etat = _etat.get()
+        repliques = self._repliques()
+        if etat is None or not etat.repliques or not repliques:
+            return DEFAULT_DB_ALIAS
+        # Lecture dans une transaction d'écriture : même base que l'écriture
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(repliques)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Mêmes données partout : un objet lu sur un réplica peut être lié
+        bases = {DEFAULT_DB_ALIAS, *self._repliques()}
+        if obj1._state.db in bases and obj2._state.db in bases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Les réplicas reçoivent le schéma par la réplication
+        if db in self._repliques():
+            return False
+        return None
+
+
+class RepliquesMiddleware:
+    """
+    Autorise les réplicas pour les vues publiques en lecture
+    et pose le cookie de base principale après une écriture
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        conf = configuration()
+        self.get_response = get_response
+        self.modules = tuple(conf['MODULES'])
+        self.duree = conf['DUREE_PRIMAIRE']
+        self.cookie = conf['COOKIE']
+        self.repliques = bool(conf['ALIAS'])
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        jeton = _etat.set(EtatRequete())
+        try:
+            return self._terminer(request, self.get_response(request))
+        finally:
+            _etat.reset(jeton)
+
+    async def __acall__(self, request):
+        jeton = _etat.set(EtatRequete())
+        try:
+            return self._terminer(request, await self.get_response(request))
+        finally:
+            _etat.reset(jeton)
+
+    def process_view(self, request, vue, args, kwargs):
+        etat = _etat.get()
+        etat.repliques = (
+            self.repliques
+            and request.method in METHODES_LECTURE
+            and self.cookie not in request.COOKIES
+            and (vue.__module__ or '').startswith(self.modules)
+            and not version_recente()
+        )
+
+    def _terminer(self, request, response):
+        if request.method not in METHODES_LECTURE:
+            response.set_cookie(
+                self.cookie, '1', max_age=self.duree, httponly=True, samesite='Lax'
+            )
+        return response
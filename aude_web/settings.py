@@ -13,6 +13,13 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 
+from aude_web.base_de_donnees import (
+    base_depuis_environnement,
+    repliques_depuis_environnement,
+    source_sqlite_depuis_environnement,
+)
+from aude_web.caches import cache_depuis_environnement, processus_depuis_environnement
+
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -25,7 +32,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-sm^z3)&669p**ir$c3_v&xpm%m(8*7q-y-dp0z*w@*971ih8jz'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# AUDE_DEBUG=0 en production (voir aude_web/settings_production.py)
+DEBUG = os.environ.get('AUDE_DEBUG', '1') == '1'
 
 ALLOWED_HOSTS = []
 
@@ -38,9 +46,11 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    # Avant staticfiles : sa commande collectstatic extrait aussi le CSS critique
+    'website',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
 
-    'website',
     'blog',
 
     'ckeditor',
@@ -48,7 +58,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # En premier : mesure aussi les requêtes des middlewares suivants
+    'aude_web.profilage.ProfilageMiddleware',
+    'aude_web.repliques.RepliquesMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Statiques servis avant les autres middlewares (voir aude_web/statiques.py)
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -62,7 +77,7 @@ ROOT_URLCONF = 'aude_web.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [   'templates'],
+        'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -74,17 +89,69 @@ TEMPLATES = [
     },
 ]
 
+# Templates des dossiers DIRS compilés au démarrage du processus
+# (voir aude_web/precompilation.py)
+PRECHARGER_TEMPLATES = not DEBUG
+
 WSGI_APPLICATION = 'aude_web.wsgi.application'
 
+# Vues async (accueil, tarifs, liste et détail du blog) : activées par
+# aude_web/asgi.py. Sous WSGI, chaque vue async coûterait une boucle
+# d'événements par requête : les vues synchrones restent servies
+VUES_ASYNC = os.environ.get('AUDE_VUES_ASYNC', '0') == '1'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Moteur choisi par AUDE_DB_MOTEUR (sqlite, postgresql, mysql) et
+# AUDE_DB_NOM / AUDE_DB_HOTE... (voir aude_web/base_de_donnees.py)
+# Passage de SQLite à PostgreSQL : python manage.py migrer_depuis_sqlite
+
+# Profil SQLite : 'production' (WAL, mmap, attente sur verrou, connexions
+# persistantes) par défaut hors DEBUG, 'defaut' (réglages Django) en développement
+SQLITE_PROFIL = os.environ.get('AUDE_SQLITE_PROFIL', 'defaut' if DEBUG else 'production')
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': base_depuis_environnement(BASE_DIR / 'db.sqlite3', SQLITE_PROFIL),
+}
+
+# Réplicas en lecture (AUDE_DB_REPLIQUES) pour les vues publiques
+# (voir aude_web/repliques.py)
+DATABASES.update(repliques_depuis_environnement(DATABASES['default']))
+
+DATABASE_ROUTERS = ['aude_web.repliques.RouteurRepliques']
+
+REPLIQUES = {
+    'ALIAS': [alias for alias in DATABASES if alias.startswith('replique_')],
+    'MODULES': ('blog.views', 'website.views'),
+    'DUREE_PRIMAIRE': 5,
+    'COOKIE': 'aude_primaire',
+}
+
+# Fichier SQLite lu par migrer_depuis_sqlite (AUDE_DB_SOURCE), jamais routé
+DATABASES.update(source_sqlite_depuis_environnement(BASE_DIR / 'db.sqlite3'))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# AUDE_CACHE_URL : cache partagé redis ou memcached, LocMemCache sinon
+# (voir aude_web/caches.py)
+
+CACHES = {
+    'default': cache_depuis_environnement(),
+}
+
+# Processus du serveur (AUDE_PROCESSUS) : au-delà de 1, un cache partagé
+# est exigé par manage.py check (voir aude_web/verifications.py)
+PROCESSUS = processus_depuis_environnement()
+
+# Cache des pages vitrine (voir website/cache_pages.py)
+CACHE_PAGES = {
+    'ALIAS': 'default',
+    'TIMEOUT': 86400,
+    # Paramètres d'URL dans la clé (les autres sont ignorés)
+    'PARAMETRES': (),
 }
 
 
@@ -118,10 +185,6 @@ USE_I18N = True
 
 USE_TZ = True
 
-STATIC_URL = 'static/'
-STATICFILES_DIRS = ['static/']
-
-
 MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
@@ -141,11 +204,90 @@ CKEDITOR_CONFIGS = {
     },
 }
 
+# Compteur de vues différé (voir blog/compteur.py)
+BLOG_COMPTEUR_VUES = {
+    'BACKEND': 'memoire',
+    'SEUIL': 100,
+    'INTERVALLE': 30,
+}
+
+# Flux RSS / Atom du blog (voir blog/flux.py)
+BLOG_FLUX = {
+    'ARTICLES': 50,  # None : toute l'archive
+    'TAILLE_CACHE': 1024 * 1024,
+}
+
+# Rendu du contenu des articles à la sauvegarde : iframes autorisées,
+# attribut sizes des images insérées, niveaux de titres du sommaire
+# (voir blog/rendu.py)
+BLOG_RENDU = {
+    'IFRAMES': ('www.youtube.com', 'www.youtube-nocookie.com', 'player.vimeo.com'),
+    'SIZES': '(min-width: 992px) 83vw, 100vw',
+    'SOMMAIRE': (2, 3),
+}
+
+# Temps de lecture calculé à la sauvegarde : vitesse de lecture du texte
+# et des blocs de code, secondes par image (voir blog/lecture.py)
+BLOG_TEMPS_LECTURE = {
+    'MOTS_PAR_MINUTE': 230,
+    'MOTS_PAR_MINUTE_CODE': 80,
+    'SECONDES_IMAGE': 12,
+    'SECONDES_IMAGE_MIN': 3,
+}
+
+# Articles liés : recalcul différé à la commande
+# python manage.py calculer_articles_lies --en-attente (cron), immédiat
+# en développement (voir blog/articles_lies.py)
+BLOG_ARTICLES_LIES = {
+    'DIFFERER': not DEBUG,
+}
+
+# Pagination par curseur des listes du blog (voir blog/pagination.py)
+BLOG_PAGINATION_CURSEUR = False
+
+# Variantes responsives des images envoyées (voir website/images.py)
+IMAGES_RESPONSIVES = {
+    'LARGEURS': (320, 640, 960, 1280, 1920),
+    'QUALITE': 80,
+    'GENERATION': 'envoi',
+}
+
+# Profilage des requêtes : Server-Timing, centiles sur /admin/profilage/,
+# budgets de requêtes SQL par vue (voir aude_web/profilage.py)
+# Actif en DEBUG, ailleurs seulement avec AUDE_PROFILAGE=1
+PROFILAGE = {
+    'ACTIF': os.environ.get('AUDE_PROFILAGE', '1' if DEBUG else '0') == '1',
+    'ECHANTILLONS': 1000,
+    'BUDGETS': {
+        'blog:article_list': 10,
+        'blog:article_detail': 12,
+        'blog:categorie_detail': 10,
+        'blog:tag_detail': 10,
+    },
+    'STRICT': False,
+}
+
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Hors DEBUG : minification, noms hachés (manifeste) et copies .gz / .br
+# générées par collectstatic, servies par WhiteNoise en cache immutable
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'aude_web.statiques.StockageStatique'
+        ),
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -0,0 +1,51 @@
+"""
+Réglages de production
+
+Usage:
+    DJANGO_SETTINGS_MODULE=aude_web.settings_production AUDE_HOTES=www.aude.fr \\
+        AUDE_CACHE_URL=redis://127.0.0.1:6379/1 AUDE_PROCESSUS=4 \\
+        daphne aude_web.asgi:application
+
+Reprend aude_web/settings.py sans DEBUG (profil SQLite, statiques
+compressés...) avec :
+- chargeur de templates en cache explicite : chaque template est lu et
+  compilé une seule fois par processus, les modifications de fichiers
+  demandent un redémarrage
+- templates des dossiers DIRS compilés au démarrage du processus
+  (voir aude_web/precompilation.py) : la première requête après un
+  déploiement ne paie pas la lecture ni l'analyse des templates
+- cache partagé entre les workers : AUDE_CACHE_URL (redis:// ou
+  memcached://) et AUDE_PROCESSUS (nombre de workers), manage.py check
+  refuse LocMemCache avec plusieurs processus (voir aude_web/caches.py)
+"""
+
+import os
+
+os.environ.setdefault('AUDE_DEBUG', '0')
+
+from .settings import *  # noqa: E402,F401,F403
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.environ.get('AUDE_SECRET_KEY', SECRET_KEY)  # noqa: F405
+
+# Domaines servis, séparés par des virgules
+ALLOWED_HOSTS = [hote.strip() for hote in os.environ.get('AUDE_HOTES', '').split(',') if hote.strip()]
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],  # noqa: F405
+        # Chargeurs explicites : incompatibles avec APP_DIRS
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],  # noqa: F405
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+PRECHARGER_TEMPLATES = True
@@ -0,0 +1,304 @@
+"""
+Chaîne des fichiers statiques (collectstatic + WhiteNoise)
+Principe :
+- Les CSS / JS du projet sont minifiés au moment de collectstatic,
+  avant le calcul de l'empreinte (nom haché = contenu minifié) ; le JS
+  est découpé en chaînes, gabarits, expressions régulières et
+  commentaires, seuls les blancs du code sont réduits
+- Noms hachés via le manifeste (style.3f2a9c.css) : servis par WhiteNoise
+  avec Cache-Control immutable, un an
+- Copies .gz et .br générées à l'avance par WhiteNoise (Brotli si installé)
+- Bootstrap et Bootstrap Icons copiés dans static/vendor
+  (commande vendoriser_statiques) : plus de connexion vers un CDN tiers ;
+  collectstatic échoue s'il en manque un (le site retomberait sur le CDN)
+"""
+
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+# Dépendances front servies localement : chemin sous static/vendor -> URL du CDN
+CDN = 'https://cdnjs.cloudflare.com/ajax/libs/'
+
+FICHIERS_TIERS = [
+    'bootstrap/5.3.0/css/bootstrap.min.css',
+    'bootstrap/5.3.0/js/bootstrap.bundle.min.js',
+    'bootstrap-icons/1.11.3/font/bootstrap-icons.min.css',
+    'bootstrap-icons/1.11.3/font/fonts/bootstrap-icons.woff2',
+    'bootstrap-icons/1.11.3/font/fonts/bootstrap-icons.woff',
+]
+
+DOSSIER_TIERS = 'vendor'
+
+
+def chemin_tiers(fichier):
+    """Chemin statique du fichier tiers (vendor/bootstrap/...)"""
+    return f'{DOSSIER_TIERS}/{fichier}'
+
+
+def url_cdn(fichier):
+    return CDN + fichier
+
+
+# ---------------------------------------------------------------------------
+# Minification
+# ---------------------------------------------------------------------------
+
+# Chaînes (conservées telles quelles) ou commentaires (supprimés)
+_CSS_CHAINES_COMMENTAIRES = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+_CSS_ESPACES = re.compile(r'\s+')
+# Pas d'espace autour de { } ; , ni après : (jamais avant : -> "a :hover")
+_CSS_PONCTUATION = re.compile(r'\s*([{};,])\s*|:\s+')
+
+
+def minifier_css(css):
+    """
+    Minification prudente : commentaires, espaces, dernier point-virgule
+    d'un bloc (les chaînes ne sont jamais modifiées)
+    """
+    morceaux = []
+    texte = []
+    position = 0
+    for correspondance in _CSS_CHAINES_COMMENTAIRES.finditer(css):
+        texte.append(css[position:correspondance.start()])
+        if correspondance.group(1):
+            morceaux.extend([_compacter_css(''.join(texte)), correspondance.group(1)])
+            texte = []
+        else:
+            # Commentaire : remplacé par un espace (a/**/b -> a b)
+            texte.append(' ')
+        position = correspondance.end()
+    texte.append(css[position:])
+    morceaux.append(_compacter_css(''.join(texte)))
+    return ''.join(morceaux).strip()
+
+
+def _compacter_css(texte):
+    texte = _CSS_ESPACES.sub(' ', texte)
+    texte = _CSS_PONCTUATION.sub(lambda m: m.group(1) or ':', texte)
+    return texte.replace(';}', '}')
+
+
+# Avant un / : début d'expression régulière (sinon division)
+_JS_AVANT_REGEX = set('(,=:[!&|?{};+-*%<>~^')
+_JS_MOTS_AVANT_REGEX = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+}
+# Espace inutile à côté de ces caractères (ni + - / * . < > ! : a + +b,
+# a / *b, 1 .toString(), a < !--b changeraient de sens)
+_JS_SANS_ESPACE = set('{}()[];,:=?&|%^~')
+# Retour à la ligne inutile après / avant ces caractères (jamais
+# d'insertion automatique de point-virgule à cet endroit)
+_JS_SANS_LIGNE_APRES = set('{;,([')
+_JS_SANS_LIGNE_AVANT = set('})]')
+_JS_MOT = re.compile(r'[\w$]+$')
+
+
+class _JSIllisible(ValueError):
+    """Chaîne, gabarit ou expression régulière non terminé"""
+
+
+def _fin_chaine(js, debut):
+    """Fin (exclue) de la chaîne '...' ou "..." commençant à debut"""
+    guillemet = js[debut]
+    i = debut + 1
+    while i < len(js):
+        caractere = js[i]
+        if caractere == '\\':
+            i += 2
+            continue
+        if caractere == guillemet:
+            return i + 1
+        if caractere == '\n':
+            break
+        i += 1
+    raise _JSIllisible(debut)
+
+
+def _fin_gabarit(js, debut):
+    """Fin (exclue) du littéral de gabarit `...${...}...` commençant à debut"""
+    i = debut + 1
+    while i < len(js):
+        caractere = js[i]
+        if caractere == '\\':
+            i += 2
+        elif caractere == '`':
+            return i + 1
+        elif js.startswith('${', i):
+            i = _fin_substitution(js, i + 2)
+        else:
+            i += 1
+    raise _JSIllisible(debut)
+
+
+def _fin_substitution(js, debut):
+    """Fin (exclue) de l'expression ${...} (accolades, chaînes et gabarits imbriqués)"""
+    profondeur = 1
+    i = debut
+    while i < len(js):
+        caractere = js[i]
+        if caractere in '"\'':
+            i = _fin_chaine(js, i)
+        elif caractere == '`':
+            i = _fin_gabarit(js, i)
+        elif caractere == '{':
+            profondeur += 1
+            i += 1
+        elif caractere == '}':
+            profondeur -= 1
+            i += 1
+            if not profondeur:
+                return i
+        else:
+            i += 1
+    raise _JSIllisible(debut)
+
+
+def _fin_regex(js, debut):
+    """Fin (exclue, drapeaux compris) de l'expression régulière /.../ commençant à debut"""
+    i = debut + 1
+    classe = False
+    while i < len(js):
+        caractere = js[i]
+        if caractere == '\\':
+            i += 2
+            continue
+        if caractere == '\n':
+            break
+        if caractere == '[':
+            classe = True
+        elif caractere == ']':
+            classe = False
+        elif caractere == '/' and not classe:
+            i += 1
+            while i < len(js) and (js[i].isalnum() or js[i] in '_$'):
+                i += 1
+            return i
+        i += 1
+    raise _JSIllisible(debut)
+
+
+def _regex_possible(sortie):
+    """Un / à cette position ouvre-t-il une expression régulière ?"""
+    code = ''.join(sortie[-3:]).rstrip()
+    if not code:
+        return True
+    if code[-1] in _JS_AVANT_REGEX:
+        return True
+    mot = _JS_MOT.search(code)
+    return mot is not None and mot.group() in _JS_MOTS_AVANT_REGEX
+
+
+def _espace(sortie, js, suivant, ligne):
+    """Blanc entre deux morceaux de code : rien, un espace ou un retour à la ligne"""
+    precedent = sortie[-1][-1:] if sortie else ''
+    if not precedent or suivant >= len(js):
+        return
+    prochain = js[suivant]
+    if ligne:
+        if precedent not in _JS_SANS_LIGNE_APRES and prochain not in _JS_SANS_LIGNE_AVANT:
+            sortie.append('\n')
+    elif precedent not in _JS_SANS_ESPACE and prochain not in _JS_SANS_ESPACE:
+        sortie.append(' ')
+
+
+def minifier_js(js):
+    """
+    Minification prudente : commentaires, indentation et blancs inutiles
+    Chaînes, littéraux de gabarit (expressions ${...} comprises) et
+    expressions régulières sont recopiés tels quels ; un retour à la
+    ligne n'est supprimé que là où il ne peut pas terminer une instruction
+    Un fichier que ce découpage ne sait pas lire est laissé tel quel
+    """
+    try:
+        return _minifier_js(js)
+    except _JSIllisible:
+        return js
+
+
+def _minifier_js(js):
+    sortie = []
+    i = 0
+    while i < len(js):
+        caractere = js[i]
+        if caractere.isspace() or js.startswith(('//', '/*'), i):
+            # Blancs et commentaires : un seul séparateur
+            ligne = False
+            while i < len(js):
+                if js[i].isspace():
+                    ligne = ligne or js[i] == '\n'
+                    i += 1
+                elif js.startswith('//', i):
+                    fin = js.find('\n', i)
+                    i = len(js) if fin < 0 else fin
+                elif js.startswith('/*', i):
+                    fin = js.find('*/', i + 2)
+                    if fin < 0:
+                        raise _JSIllisible(i)
+                    ligne = ligne or '\n' in js[i:fin]
+                    i = fin + 2
+                else:
+                    break
+            _espace(sortie, js, i, ligne)
+            continue
+
+        if caractere in '"\'':
+            fin = _fin_chaine(js, i)
+        elif caractere == '`':
+            fin = _fin_gabarit(js, i)
+        elif caractere == '/' and _regex_possible(sortie):
+            fin = _fin_regex(js, i)
+        else:
+            fin = i + 1
+        sortie.append(js[i:fin])
+        i = fin
+    return ''.join(sortie).strip() + '\n'
+
+
+MINIFICATEURS = {
+    '.css': minifier_css,
+    '.js': minifier_js,
+}
+
+
+class StockageStatique(CompressedManifestStaticFilesStorage):
+    """
+    Manifeste + compression WhiteNoise, avec minification préalable
+    des fichiers du projet (ceux des applications - admin, ckeditor - et
+    les .min.css / .min.js tiers sont laissés tels quels)
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        manquants = [fichier for fichier in FICHIERS_TIERS if chemin_tiers(fichier) not in paths]
+        if manquants:
+            # collectstatic lève l'exception transmise
+            yield DOSSIER_TIERS, None, ImproperlyConfigured(
+                f"Dépendances front absentes de static/{DOSSIER_TIERS} : {', '.join(manquants)} "
+                "(python manage.py vendoriser_statiques)"
+            )
+            return
+        if not dry_run:
+            projet = {Path(dossier).resolve() for dossier in settings.STATICFILES_DIRS}
+            paths = dict(paths)
+            for chemin, (source, _) in paths.items():
+                if Path(source.location).resolve() in projet and self._minifier(chemin):
+                    # Le manifeste lit la source : lui donner la copie minifiée
+                    paths[chemin] = (self, chemin)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def _minifier(self, chemin):
+        extension = chemin[chemin.rfind('.'):]
+        minificateur = MINIFICATEURS.get(extension)
+        if minificateur is None or '.min.' in chemin:
+            return False
+
+        with self.open(chemin) as fichier:
+            contenu = fichier.read().decode('utf-8')
+        self.delete(chemin)
+        self._save(chemin, ContentFile(minificateur(contenu).encode('utf-8')))
+        return True
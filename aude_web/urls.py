@@ -2,11 +2,30 @@ from django.contrib import admin
 from django.urls import path, include
 from . import settings
 from django.conf.urls.static import static
+from .profilage import tableau_profilage
+from . import plan_du_site
+from blog.sitemaps import ArticleSitemap, CategorieSitemap, TagSitemap
+from website.sitemaps import PagesSitemap
+
+# Sections du plan du site (voir aude_web/plan_du_site.py)
+SITEMAPS = {
+    sitemap.section: sitemap
+    for sitemap in (PagesSitemap, ArticleSitemap, CategorieSitemap, TagSitemap)
+}
 
 urlpatterns = [
+    # Avant admin/ : sinon capturé par le site d'administration
+    path('admin/profilage/', tableau_profilage, name='profilage'),
     path('admin/', admin.site.urls),
     path('', include('website.urls')),
     path('blog/', include('blog.urls')),
     path('ckeditor/', include('ckeditor_uploader.urls')),
+    path('sitemap.xml', plan_du_site.index, {'sitemaps': SITEMAPS}, name='sitemap_index'),
+    path(
+        'sitemap-<slug:section>-<int:tranche>.xml',
+        plan_du_site.section,
+        {'sitemaps': SITEMAPS},
+        name='sitemap_section',
+    ),
 
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
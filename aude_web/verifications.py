@@ -0,0 +1,50 @@
+"""
+Vérifications au démarrage (manage.py check, runserver, migrate...)
+Principe :
+- Plusieurs processus (PROCESSUS > 1) avec un cache LocMemCache : erreur,
+  les invalidations ne seraient pas partagées (voir aude_web/caches.py)
+- PostgreSQL sans psycopg 3 / psycopg_pool : avertissement, connexions
+  persistantes au lieu du pool (voir aude_web/base_de_donnees.py)
+- Enregistrées dans WebsiteConfig.ready()
+
+Configuration (settings.py) :
+PROCESSUS = 1   # AUDE_PROCESSUS
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+from aude_web.base_de_donnees import pool_disponible
+
+LOCMEM = 'django.core.cache.backends.locmem.LocMemCache'
+POSTGRESQL = 'django.db.backends.postgresql'
+
+
+@register(Tags.caches)
+def verifier_cache_partage(app_configs, **kwargs):
+    processus = getattr(settings, 'PROCESSUS', 1)
+    if processus <= 1:
+        return []
+    return [
+        Error(
+            f"Le cache '{alias}' (LocMemCache) n'est pas partagé entre les {processus} processus",
+            hint="Définir AUDE_CACHE_URL (redis:// ou memcached://), voir aude_web/caches.py",
+            id='aude_web.E001',
+        )
+        for alias, reglages in settings.CACHES.items()
+        if reglages.get('BACKEND') == LOCMEM
+    ]
+
+
+@register()
+def verifier_pool_postgresql(app_configs, **kwargs):
+    if settings.DATABASES['default']['ENGINE'] != POSTGRESQL or pool_disponible():
+        return []
+    return [
+        Warning(
+            "PostgreSQL sans pool de connexions : psycopg 3 ou psycopg_pool absent, "
+            "connexions persistantes (CONN_MAX_AGE) à la place",
+            hint="pip install -r requirements.txt (psycopg, psycopg-binary, psycopg-pool)",
+            id='aude_web.W001',
+        )
+    ]
@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'aude_web.settings')
 
 application = get_wsgi_application()
+
+# Templates compilés avant la première requête (voir aude_web/precompilation.py)
+from django.conf import settings  # noqa: E402
+
+if settings.PRECHARGER_TEMPLATES:
+    from aude_web.precompilation import precompiler_templates
+
+    precompiler_templates()
@@ -5,17 +5,29 @@ Conventions :
 - list_filter et search_fields pour faciliter recherche
 - prepopulated_fields pour slugs automatiques
 - Auto-attribution de l'auteur à l'utilisateur connecté
+- Compteurs annotés dans get_queryset() (aucune requête par ligne,
+  vérifié par SansRequeteParLigneMixin)
 """
 
 from django.contrib import admin
+from django.db.models import Count, Q
+from django.utils import timezone
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from aude_web.profilage import SansRequeteParLigneMixin
+
 from .models import Article, Categorie, Tag, Auteur
+from .signals import articles_mis_a_jour
+
+
+def _nb_articles_publies():
+    """Annotation : nombre d'articles publiés liés"""
+    return Count('articles', filter=Q(articles__statut='publie'))
 
 
 @admin.register(Categorie)
-class CategorieAdmin(admin.ModelAdmin):
+class CategorieAdmin(SansRequeteParLigneMixin, admin.ModelAdmin):
     """
     Administration des catégories
     """
@@ -38,16 +50,19 @@ class CategorieAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(nb_articles_publies=_nb_articles_publies())
+
     def nb_articles(self, obj):
         """Affiche le nombre d'articles dans la catégorie"""
-        count = obj.articles.filter(statut='publie').count()
         url = reverse('admin:blog_article_changelist') + f'?categorie__id__exact={obj.id}'
-        return format_html('<a href="{}">{} articles</a>', url, count)
+        return format_html('<a href="{}">{} articles</a>', url, obj.nb_articles_publies)
     nb_articles.short_description = 'Articles publiés'
+    nb_articles.admin_order_field = 'nb_articles_publies'
 
 
 @admin.register(Tag)
-class TagAdmin(admin.ModelAdmin):
+class TagAdmin(SansRequeteParLigneMixin, admin.ModelAdmin):
     """
     Administration des tags
     """
@@ -65,15 +80,19 @@ class TagAdmin(admin.ModelAdmin):
         )
     couleur_preview.short_description = 'Couleur'
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(nb_articles_publies=_nb_articles_publies())
+
     def nb_articles(self, obj):
         """Nombre d'articles avec ce tag"""
-        count = obj.articles.filter(statut='publie').count()
+        count = obj.nb_articles_publies
         return f"{count} article{'s' if count > 1 else ''}"
     nb_articles.short_description = 'Utilisations'
+    nb_articles.admin_order_field = 'nb_articles_publies'
 
 
 @admin.register(Auteur)
-class AuteurAdmin(admin.ModelAdmin):
+class AuteurAdmin(SansRequeteParLigneMixin, admin.ModelAdmin):
     """
     Administration des auteurs
     """
@@ -119,14 +138,18 @@ class AuteurAdmin(admin.ModelAdmin):
         return 'Aucune photo'
     photo_preview_large.short_description = 'Aperçu de la photo'
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(nb_articles_publies=_nb_articles_publies())
+
     def nb_articles_publie(self, obj):
-        """Nombre d'articles publiés par l'auteur"""
-        return obj.get_nombre_articles()
+        """Nombre d'articles publiés par l'auteur (annoté, voir get_nombre_articles())"""
+        return obj.nb_articles_publies
     nb_articles_publie.short_description = 'Articles publiés'
+    nb_articles_publie.admin_order_field = 'nb_articles_publies'
 
 
 @admin.register(Article)
-class ArticleAdmin(admin.ModelAdmin):
+class ArticleAdmin(SansRequeteParLigneMixin, admin.ModelAdmin):
     """
     Administration des articles avec auto-attribution de l'auteur
     """
@@ -140,6 +163,8 @@ class ArticleAdmin(admin.ModelAdmin):
         'en_vedette',
         'actions_rapides'
     ]
+    # auteur est nullable : ignoré par le select_related() automatique
+    list_select_related = ['categorie', 'auteur__user']
     list_filter = [
         'statut',
         'categorie',
@@ -152,6 +177,8 @@ class ArticleAdmin(admin.ModelAdmin):
     date_hierarchy = 'date_publication'
     readonly_fields = [
         'vues',
+        'temps_lecture',
+        'nombre_mots',
         'date_creation',
         'date_modification',
         'image_preview',
@@ -175,7 +202,7 @@ class ArticleAdmin(admin.ModelAdmin):
             'fields': ('image_couverture', 'image_alt', 'image_preview')
         }),
         ('Publication', {
-            'fields': ('statut', 'date_publication', 'temps_lecture')
+            'fields': ('statut', 'date_publication', 'temps_lecture', 'nombre_mots')
         }),
         ('Options avancées', {
             'fields': ('en_vedette', 'autoriser_commentaires', 'meta_description'),
@@ -291,20 +318,33 @@ class ArticleAdmin(admin.ModelAdmin):
         )
     actions_rapides.short_description = 'Actions'
 
+    def changer_statut(self, queryset, statut):
+        """
+        update() n'envoie pas post_save : articles_mis_a_jour déclenche les
+        mêmes invalidations (articles liés, agrégats, flux, plan du site,
+        pages en cache, prochaine publication, voir blog/signals.py)
+        update() ne passe pas non plus par auto_now : date_modification est
+        fixée ici (validateurs HTTP, export incrémental)
+        """
+        ids = list(queryset.values_list('pk', flat=True))
+        updated = queryset.update(statut=statut, date_modification=timezone.now())
+        articles_mis_a_jour.send(sender=Article, ids=ids)
+        return updated
+
     # Actions personnalisées
     @admin.action(description='✅ Publier les articles sélectionnés')
     def publier_articles(self, request, queryset):
-        updated = queryset.update(statut='publie')
+        updated = self.changer_statut(queryset, 'publie')
         self.message_user(request, f'✅ {updated} article(s) publié(s) avec succès.')
 
     @admin.action(description='📝 Mettre en brouillon')
     def mettre_en_brouillon(self, request, queryset):
-        updated = queryset.update(statut='brouillon')
+        updated = self.changer_statut(queryset, 'brouillon')
         self.message_user(request, f'📝 {updated} article(s) mis en brouillon.')
 
     @admin.action(description='📦 Archiver les articles')
     def archiver_articles(self, request, queryset):
-        updated = queryset.update(statut='archive')
+        updated = self.changer_statut(queryset, 'archive')
         self.message_user(request, f'📦 {updated} article(s) archivé(s).')
 
     class Media:
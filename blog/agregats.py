@@ -0,0 +1,79 @@
+"""
+Agrégats de la barre latérale du blog (catégories, tags populaires, article en vedette)
+Principe :
+- Calculés une seule fois puis conservés dans le cache, jusqu'à la
+  prochaine publication programmée (voir blog/planification.py)
+- Une version est incrémentée après chaque modification d'un article,
+  de ses tags, d'une catégorie, d'un tag, d'un auteur ou de son
+  utilisateur, hors simple connexion (voir blog/signals.py)
+- L'invalidation attend le commit : une requête concurrente ne peut pas
+  remettre en cache des agrégats calculés avant la modification
+"""
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from aude_web.repliques import invalider_apres_commit
+
+from .models import Article, Categorie, Tag
+from .planification import duree_cache
+
+CLE_VERSION = 'blog:agregats:version'
+
+# Nombre de tags affichés dans les filtres
+NOMBRE_TAGS_POPULAIRES = 10
+
+
+def _cle(version):
+    return f'blog:agregats:{version}'
+
+
+def calculer_agregats():
+    """Requêtes d'agrégation (listes évaluées pour pouvoir être mises en cache)"""
+    # Articles visibles seulement : un article programmé n'est pas compté
+    maintenant = timezone.now()
+    publies = Q(articles__statut='publie', articles__date_publication__lte=maintenant)
+    return {
+        # Toutes les catégories avec compteur d'articles
+        'categories': list(
+            Categorie.objects.annotate(
+                nb_articles=Count('articles', filter=publies)
+            ).filter(nb_articles__gt=0)
+        ),
+        # Tous les tags populaires
+        'tags_populaires': list(
+            Tag.objects.annotate(
+                nb_articles=Count('articles', filter=publies)
+            ).filter(nb_articles__gt=0).order_by('-nb_articles')[:NOMBRE_TAGS_POPULAIRES]
+        ),
+        # Article en vedette (tags préchargés : affichés sur la carte)
+        'article_vedette': Article.objects.filter(
+            statut='publie',
+            date_publication__lte=maintenant,
+            en_vedette=True
+        ).select_related('categorie', 'auteur').prefetch_related('tags').defer(*Article.CHAMPS_CONTENU).first(),
+    }
+
+
+def get_agregats():
+    """Agrégats de la version courante (calculés au premier appel)"""
+    version = cache.get_or_set(CLE_VERSION, 1, timeout=None)
+    agregats = cache.get(_cle(version))
+    if agregats is None:
+        agregats = calculer_agregats()
+        cache.set(_cle(version), agregats, timeout=duree_cache())
+    return agregats
+
+
+def _incrementer_version():
+    try:
+        cache.incr(CLE_VERSION)
+    except ValueError:
+        # Pas encore de version : rien à invalider
+        cache.set(CLE_VERSION, 1, timeout=None)
+
+
+def invalider_agregats():
+    """Nouvelle version après le commit de la transaction en cours"""
+    invalider_apres_commit(_incrementer_version)
@@ -0,0 +1,300 @@
+"""
+Moteur d'articles liés
+Principe :
+- Score = tags communs (Jaccard) + même catégorie + similarité cosinus
+  des vecteurs TF-IDF (titre, résumé, contenu) calculés avec NumPy
+- Les K meilleurs voisins de chaque article sont stockés dans ArticleLie
+- Après une modification, seuls les articles concernés sont recalculés :
+  l'article modifié, ceux qui le citaient, et ceux dont il entre
+  désormais dans le top K
+- Les poids IDF évoluent avec le corpus sans recalcul des autres articles :
+  une reconstruction complète périodique (calculer_articles_lies) les réaligne
+- Seuls les articles visibles (publiés, date de publication passée) sont
+  dans le corpus : la reconstruction périodique ajoute aussi les articles
+  programmés devenus visibles
+- Termes de chaque article (titre, résumé, contenu) stockés dans
+  ArticleTermes avec sa date_modification : une mise à jour ne relit et
+  n'analyse le contenu que des articles modifiés
+- Recalcul différé (DIFFERER) : la sauvegarde ne fait que noter les
+  articles modifiés (ArticleLieEnAttente, dans la même transaction) ;
+  python manage.py calculer_articles_lies --en-attente (cron) les traite
+  en un seul chargement du corpus. Sinon, recalcul après le commit de
+  chaque modification
+
+Configuration (settings.py) :
+    BLOG_ARTICLES_LIES = {
+        'DIFFERER': True,
+    }
+"""
+
+import math
+import threading
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Article, ArticleLie, ArticleLieEnAttente, ArticleTermes
+from .recherche import termes, texte_brut
+
+# Nombre de voisins stockés par article
+NOMBRE_VOISINS = 6
+
+# Taille maximale du vocabulaire TF-IDF (termes les plus fréquents)
+TAILLE_VOCABULAIRE = 2000
+
+POIDS_TAGS = 0.4
+POIDS_CATEGORIE = 0.2
+POIDS_TEXTE = 0.4
+
+CONFIGURATION_PAR_DEFAUT = {
+    'DIFFERER': True,
+}
+
+
+def configuration():
+    return {**CONFIGURATION_PAR_DEFAUT, **getattr(settings, 'BLOG_ARTICLES_LIES', {})}
+
+
+class Corpus:
+    """
+    Matrices de tous les articles visibles :
+    - textes : TF-IDF normalisé (articles x termes)
+    - tags : présence des tags (articles x tags)
+    """
+
+    def __init__(self):
+        articles = list(
+            Article.objects.filter(
+                statut='publie',
+                date_publication__lte=timezone.now()
+            ).values_list(
+                'pk', 'categorie_id', 'date_modification'
+            )
+        )
+        self.ids = [article[0] for article in articles]
+        self.index = {pk: i for i, pk in enumerate(self.ids)}
+        self.categories = np.array([article[1] for article in articles])
+
+        self.textes = self._tfidf(self._termes(articles))
+        self.tags = self._tags()
+
+    @staticmethod
+    def _termes(articles):
+        """Occurrences de chaque terme, par article (stockées, sinon contenu relu)"""
+        dates = {pk: modification for pk, _, modification in articles}
+        stockes = {
+            pk: termes_article
+            for pk, modification, termes_article in ArticleTermes.objects.values_list(
+                'article_id', 'date_modification', 'termes'
+            )
+            if dates.get(pk) == modification
+        }
+
+        manquants = [pk for pk in dates if pk not in stockes]
+        nouveaux = []
+        textes = Article.objects.filter(pk__in=manquants).values_list('pk', 'titre', 'resume', 'contenu')
+        for pk, titre, resume, contenu in textes.iterator(chunk_size=TAILLE_LOT):
+            # Titre compté deux fois : plus représentatif que le contenu
+            stockes[pk] = Counter(termes(f'{titre} {titre} {resume} {texte_brut(contenu)}'))
+            nouveaux.append(ArticleTermes(article_id=pk, date_modification=dates[pk], termes=stockes[pk]))
+        if nouveaux:
+            ArticleTermes.objects.filter(article_id__in=manquants).delete()
+            ArticleTermes.objects.bulk_create(nouveaux, batch_size=TAILLE_LOT)
+
+        return [stockes[pk] for pk in dates]
+
+    def _tfidf(self, documents):
+        frequences_doc = Counter()
+        for mots in documents:
+            frequences_doc.update(mots.keys())
+
+        vocabulaire = sorted(frequences_doc, key=lambda mot: -frequences_doc[mot])[:TAILLE_VOCABULAIRE]
+        colonnes = {mot: j for j, mot in enumerate(vocabulaire)}
+
+        matrice = np.zeros((len(documents), len(vocabulaire)), dtype=np.float32)
+        for i, mots in enumerate(documents):
+            for mot, nombre in mots.items():
+                j = colonnes.get(mot)
+                if j is not None:
+                    matrice[i, j] = nombre
+
+        # TF sous-linéaire et IDF lissé
+        np.log1p(matrice, out=matrice)
+        nombre = len(documents)
+        idf = np.array(
+            [math.log((1 + nombre) / (1 + frequences_doc[mot])) + 1 for mot in vocabulaire],
+            dtype=np.float32
+        )
+        matrice *= idf
+
+        normes = np.linalg.norm(matrice, axis=1, keepdims=True)
+        normes[normes == 0] = 1
+        return matrice / normes
+
+    def _tags(self):
+        liens = Article.tags.through.objects.filter(
+            article_id__in=self.ids
+        ).values_list('article_id', 'tag_id')
+
+        colonnes = {}
+        lignes = []
+        for article_id, tag_id in liens:
+            lignes.append((self.index[article_id], colonnes.setdefault(tag_id, len(colonnes))))
+
+        matrice = np.zeros((len(self.ids), len(colonnes)), dtype=np.float32)
+        for i, j in lignes:
+            matrice[i, j] = 1
+        return matrice
+
+    def scores(self, positions):
+        """Scores (len(positions) x nombre d'articles) des articles donnés"""
+        texte = self.textes[positions] @ self.textes.T
+
+        communs = self.tags[positions] @ self.tags.T
+        totaux = self.tags.sum(axis=1)
+        union = totaux[positions][:, None] + totaux[None, :] - communs
+        jaccard = np.divide(communs, union, out=np.zeros_like(communs), where=union > 0)
+
+        categorie = (self.categories[positions][:, None] == self.categories[None, :]).astype(np.float32)
+
+        scores = POIDS_TAGS * jaccard + POIDS_CATEGORIE * categorie + POIDS_TEXTE * texte
+        # Un article n'est pas son propre voisin
+        scores[np.arange(len(positions)), positions] = -np.inf
+        return scores
+
+    def voisins(self, scores):
+        """Top K (id, score) d'une ligne de scores"""
+        k = min(NOMBRE_VOISINS, len(scores) - 1)
+        if k <= 0:
+            return []
+        meilleurs = np.argpartition(-scores, k - 1)[:k]
+        meilleurs = meilleurs[np.argsort(-scores[meilleurs])]
+        return [(self.ids[j], float(scores[j])) for j in meilleurs if scores[j] > 0]
+
+
+def _enregistrer(corpus, positions):
+    """Recalcule et remplace les voisins des articles aux positions données"""
+    if not positions:
+        return
+
+    ids = [corpus.ids[i] for i in positions]
+    nouveaux = []
+    for ligne, scores in zip(ids, corpus.scores(positions)):
+        nouveaux.extend(
+            ArticleLie(article_id=ligne, article_lie_id=voisin, score=score, rang=rang)
+            for rang, (voisin, score) in enumerate(corpus.voisins(scores))
+        )
+
+    ArticleLie.objects.filter(article_id__in=ids).delete()
+    ArticleLie.objects.bulk_create(nouveaux)
+
+
+# Nombre de lignes de scores calculées à la fois (mémoire : lot x articles)
+TAILLE_LOT = 256
+
+
+@transaction.atomic
+def reconstruire():
+    """Recalcule les voisins de tous les articles visibles"""
+    debut = timezone.now()
+    corpus = Corpus()
+    ArticleLie.objects.all().delete()
+    # Articles en attente : traités par la reconstruction
+    ArticleLieEnAttente.objects.filter(date__lte=debut).delete()
+    for debut in range(0, len(corpus.ids), TAILLE_LOT):
+        _enregistrer(corpus, list(range(debut, min(debut + TAILLE_LOT, len(corpus.ids)))))
+    return len(corpus.ids)
+
+
+@transaction.atomic
+def mettre_a_jour(article_ids):
+    """
+    Recalcul incrémental après modification des articles donnés
+    Retourne le nombre d'articles dont les voisins ont été recalculés
+    """
+    article_ids = set(article_ids)
+    corpus = Corpus()
+
+    # Articles dépubliés ou supprimés : plus de voisins
+    ArticleLie.objects.filter(article_id__in=article_ids - set(corpus.index)).delete()
+
+    # Articles qui citaient un article modifié
+    concernes = set(
+        ArticleLie.objects.filter(article_lie_id__in=article_ids).values_list('article_id', flat=True)
+    )
+    concernes |= article_ids
+
+    # Articles dont un article modifié entre dans le top K
+    modifies = [corpus.index[pk] for pk in article_ids if pk in corpus.index]
+    if modifies:
+        seuils = {pk: 0.0 for pk in corpus.ids}
+        complets = ArticleLie.objects.filter(rang=NOMBRE_VOISINS - 1).values_list('article_id', 'score')
+        seuils.update(complets)
+
+        # Similarité symétrique : colonne j = score de l'article j avec un article modifié
+        maximums = corpus.scores(modifies).max(axis=0)
+        concernes.update(
+            pk for pk, maximum in zip(corpus.ids, maximums) if maximum > seuils[pk]
+        )
+
+    positions = sorted(corpus.index[pk] for pk in concernes if pk in corpus.index)
+    for debut in range(0, len(positions), TAILLE_LOT):
+        _enregistrer(corpus, positions[debut:debut + TAILLE_LOT])
+    return len(positions)
+
+
+# ---------------------------------------------------------------------------
+# Planification : différée (commande) ou après commit (une seule mise à
+# jour par transaction)
+# ---------------------------------------------------------------------------
+
+_en_attente = threading.local()
+
+
+def mettre_en_attente(article_ids):
+    """Note les articles à recalculer (date remise à jour s'ils y sont déjà)"""
+    article_ids = set(article_ids)
+    # ignore_conflicts puis UPDATE : pas d'upsert (update_conflicts), refusé par MySQL
+    ArticleLieEnAttente.objects.bulk_create(
+        [ArticleLieEnAttente(article_id=pk) for pk in article_ids],
+        ignore_conflicts=True,
+    )
+    ArticleLieEnAttente.objects.filter(article_id__in=article_ids).update(date=timezone.now())
+
+
+def traiter_en_attente():
+    """
+    Recalcule les articles en attente : (articles en attente, articles recalculés)
+    Un article noté de nouveau pendant le calcul reste en attente
+    """
+    debut = timezone.now()
+    en_attente = ArticleLieEnAttente.objects.filter(date__lte=debut)
+    ids = list(en_attente.values_list('article_id', flat=True))
+    if not ids:
+        return 0, 0
+    with transaction.atomic():
+        total = mettre_a_jour(ids)
+        en_attente.filter(article_id__in=ids).delete()
+    return len(ids), total
+
+
+def planifier_mise_a_jour(article_ids):
+    """Note les articles modifiés, ou les regroupe et recalcule après le commit"""
+    if configuration()['DIFFERER']:
+        mettre_en_attente(article_ids)
+        return
+    ids = getattr(_en_attente, 'ids', None)
+    if ids is None:
+        ids = _en_attente.ids = set()
+    ids.update(article_ids)
+    transaction.on_commit(_executer_mise_a_jour)
+
+
+def _executer_mise_a_jour():
+    ids = getattr(_en_attente, 'ids', None)
+    if ids:
+        _en_attente.ids = set()
+        mettre_a_jour(ids)
@@ -0,0 +1,299 @@
+"""
+Compteur de vues différé pour les articles du blog
+Principe :
+- Les vues sont accumulées en mémoire (ou dans le cache Django)
+- Un seul UPDATE groupé est envoyé toutes les N vues ou toutes les X
+  secondes ; un fil d'exécution (minuterie) vide aussi le tampon d'un
+  processus qui ne reçoit plus de vues
+- Le tampon est vidé à la sortie normale de l'interpréteur (atexit) ; un
+  processus tué par un signal (SIGKILL, SIGTERM sans gestionnaire) perd
+  au plus les vues des X dernières secondes. Sous gunicorn, vider aussi
+  à l'arrêt de chaque worker (gunicorn.conf.py) :
+      def worker_exit(server, worker):
+          from blog.compteur import get_compteur
+          get_compteur().vider()
+
+Configuration (settings.py) :
+    BLOG_COMPTEUR_VUES = {
+        'BACKEND': 'memoire',      # 'memoire' ou 'cache'
+        'CACHE_ALIAS': 'default',  # alias utilisé par le backend 'cache'
+        'SEUIL': 100,              # vidage après N vues
+        'INTERVALLE': 30,          # vidage après X secondes
+    }
+"""
+
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, models, transaction
+
+logger = logging.getLogger(__name__)
+
+CONFIGURATION_PAR_DEFAUT = {
+    'BACKEND': 'memoire',
+    'CACHE_ALIAS': 'default',
+    'SEUIL': 100,
+    'INTERVALLE': 30,
+}
+
+# Nombre maximum d'articles mis à jour par requête UPDATE
+TAILLE_LOT = 500
+
+
+def ecrire_vues(increments):
+    """
+    Applique les incréments {article_id: nb_vues} en une requête par lot
+    UPDATE blog_article SET vues = vues + CASE id WHEN ... END WHERE id IN (...)
+    """
+    from .models import Article
+
+    ids = list(increments)
+    for debut in range(0, len(ids), TAILLE_LOT):
+        lot = ids[debut:debut + TAILLE_LOT]
+        Article.objects.filter(pk__in=lot).update(
+            vues=models.F('vues') + models.Case(
+                *[models.When(pk=pk, then=models.Value(increments[pk])) for pk in lot],
+                default=models.Value(0),
+                output_field=models.IntegerField(),
+            )
+        )
+
+
+class TamponMemoire:
+    """
+    Tampon local au processus (dict protégé par un verrou)
+    """
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self._vues = {}
+
+    def ajouter(self, article_id, nombre=1):
+        with self._verrou:
+            self._vues[article_id] = self._vues.get(article_id, 0) + nombre
+
+    def en_attente(self, article_id):
+        return self._vues.get(article_id, 0)
+
+    def extraire(self):
+        """Retire et retourne tout le contenu du tampon"""
+        with self._verrou:
+            vues, self._vues = self._vues, {}
+        return vues
+
+    def restaurer(self, vues):
+        """Remet dans le tampon des incréments qui n'ont pas pu être écrits"""
+        for article_id, nombre in vues.items():
+            self.ajouter(article_id, nombre)
+
+
+class TamponCache:
+    """
+    Tampon partagé via le cache Django (memcached, redis, fichiers...)
+    Permet à la commande flush_vues de vider les vues de tous les processus
+    - Un compteur par article, jamais supprimé (décrémenté au vidage)
+    - Articles vus depuis le dernier vidage : liste numérotée de clés
+      (rang obtenu par incr), une marque par article évite les doublons
+    - Un seul vidage à la fois (verrou posé par add)
+    """
+    PREFIXE = 'blog:vues:'
+    CLE_RANG = 'blog:vues:rang'
+    CLE_LU = 'blog:vues:lu'
+    CLE_ATTENTE = 'blog:vues:attente'
+    CLE_VERROU = 'blog:vues:verrou'
+    DUREE_VERROU = 60
+    # Marque perdue (processus arrêté entre incr et set) : article de
+    # nouveau listé à sa prochaine vue après ce délai
+    DUREE_MARQUE = 86400
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _cle(self, article_id):
+        return f'{self.PREFIXE}{article_id}'
+
+    def _cle_marque(self, article_id):
+        return f'{self.PREFIXE}marque:{article_id}'
+
+    def _cle_rang(self, rang):
+        return f'{self.PREFIXE}sale:{rang}'
+
+    def _incrementer(self, cle, nombre=1):
+        self.cache.add(cle, 0, timeout=None)
+        try:
+            return self.cache.incr(cle, nombre)
+        except ValueError:
+            # Clé expirée entre add() et incr()
+            self.cache.set(cle, nombre, timeout=None)
+            return nombre
+
+    def ajouter(self, article_id, nombre=1):
+        self._incrementer(self._cle(article_id), nombre)
+        # Marque posée après le compteur : un vidage qui l'a retirée avant
+        # de lire le compteur laisse la vue à un article de nouveau listé
+        if self.cache.add(self._cle_marque(article_id), 1, timeout=self.DUREE_MARQUE):
+            rang = self._incrementer(self.CLE_RANG)
+            self.cache.set(self._cle_rang(rang), article_id, timeout=None)
+
+    def en_attente(self, article_id):
+        return self.cache.get(self._cle(article_id), 0)
+
+    def extraire(self):
+        """
+        Lit les compteurs des articles vus depuis le dernier vidage puis les
+        décrémente de la valeur lue (les vues arrivées entre-temps sont conservées)
+        """
+        if not self.cache.add(self.CLE_VERROU, 1, timeout=self.DUREE_VERROU):
+            # Vidage en cours dans un autre processus
+            return {}
+        try:
+            debut = self.cache.get(self.CLE_LU, 0) + 1
+            fin = self.cache.get(self.CLE_RANG, 0)
+            cles_rangs = [self._cle_rang(rang) for rang in range(debut, fin + 1)]
+            listes = self.cache.get_many(cles_rangs)
+
+            # Rang réservé mais pas encore écrit : repris au prochain vidage,
+            # abandonné s'il manque encore (processus arrêté entre-temps)
+            attente = self.cache.get(self.CLE_ATTENTE)
+            lu = debut - 1
+            while lu < fin and (self._cle_rang(lu + 1) in listes or lu + 1 == attente):
+                lu += 1
+            self.cache.set(self.CLE_ATTENTE, lu + 1 if lu < fin else None, timeout=None)
+            ids = {listes[cle] for cle in cles_rangs[:lu - debut + 1] if cle in listes}
+
+            self.cache.delete_many([self._cle_marque(pk) for pk in ids])
+            cles = {self._cle(pk): pk for pk in ids}
+            vues = {}
+            for cle, nombre in self.cache.get_many(list(cles)).items():
+                if nombre:
+                    vues[cles[cle]] = nombre
+                    self.cache.decr(cle, nombre)
+
+            self.cache.set(self.CLE_LU, lu, timeout=None)
+            self.cache.delete_many(cles_rangs[:lu - debut + 1])
+            return vues
+        finally:
+            self.cache.delete(self.CLE_VERROU)
+
+    def restaurer(self, vues):
+        for article_id, nombre in vues.items():
+            self.ajouter(article_id, nombre)
+
+
+class CompteurVues:
+    """
+    Accumule les vues et déclenche un vidage groupé
+    """
+
+    def __init__(self, tampon, seuil, intervalle):
+        self.tampon = tampon
+        self.seuil = seuil
+        self.intervalle = intervalle
+        self._verrou = threading.Lock()
+        self._vues_depuis_vidage = 0
+        self._dernier_vidage = time.monotonic()
+        self._arret = threading.Event()
+
+    def incrementer(self, article_id):
+        """Enregistre une vue et vide le tampon si nécessaire"""
+        self.tampon.ajouter(article_id)
+
+        with self._verrou:
+            self._vues_depuis_vidage += 1
+            doit_vider = (
+                self._vues_depuis_vidage >= self.seuil or
+                time.monotonic() - self._dernier_vidage >= self.intervalle
+            )
+            if doit_vider:
+                self._vues_depuis_vidage = 0
+                self._dernier_vidage = time.monotonic()
+
+        if doit_vider:
+            self.vider()
+
+    def demarrer_minuterie(self):
+        """Vidage toutes les `intervalle` secondes, même sans nouvelle vue"""
+        threading.Thread(target=self._minuterie, name='compteur-vues', daemon=True).start()
+
+    def arreter_minuterie(self):
+        self._arret.set()
+
+    def _minuterie(self):
+        while not self._arret.wait(self.intervalle):
+            with self._verrou:
+                doit_vider = time.monotonic() - self._dernier_vidage >= self.intervalle
+                if doit_vider:
+                    self._vues_depuis_vidage = 0
+                    self._dernier_vidage = time.monotonic()
+            if doit_vider:
+                try:
+                    self.vider()
+                finally:
+                    # Connexions ouvertes par ce fil : jamais réutilisées par une requête
+                    connections.close_all()
+
+    def en_attente(self, article_id):
+        """Vues pas encore écrites en base pour cet article"""
+        return self.tampon.en_attente(article_id)
+
+    def vider(self):
+        """
+        Écrit toutes les vues en attente en base
+        Retourne le nombre total de vues écrites
+        """
+        vues = self.tampon.extraire()
+        if not vues:
+            return 0
+
+        try:
+            with transaction.atomic():
+                ecrire_vues(vues)
+        except Exception:
+            logger.exception("Échec de l'écriture des vues, remise en tampon")
+            self.tampon.restaurer(vues)
+            return 0
+
+        return sum(vues.values())
+
+
+def _creer_compteur():
+    configuration = {
+        **CONFIGURATION_PAR_DEFAUT,
+        **getattr(settings, 'BLOG_COMPTEUR_VUES', {}),
+    }
+
+    if configuration['BACKEND'] == 'cache':
+        tampon = TamponCache(configuration['CACHE_ALIAS'])
+    else:
+        tampon = TamponMemoire()
+
+    return CompteurVues(
+        tampon,
+        seuil=configuration['SEUIL'],
+        intervalle=configuration['INTERVALLE'],
+    )
+
+
+_compteur = None
+_verrou_creation = threading.Lock()
+
+
+def get_compteur():
+    """Compteur unique du processus (créé à la première utilisation)"""
+    global _compteur
+    if _compteur is None:
+        with _verrou_creation:
+            if _compteur is None:
+                _compteur = _creer_compteur()
+                _compteur.demarrer_minuterie()
+                # Sortie normale de l'interpréteur (fin de commande, Ctrl+C)
+                atexit.register(_compteur.vider)
+    return _compteur
@@ -0,0 +1,246 @@
+"""
+GET conditionnel (ETag / Last-Modified / 304) pour les vues du blog
+Principe :
+- Les validateurs sont calculés avec quelques agrégats légers
+  (max date_modification, nombre d'articles, tags, auteur) et la version
+  des fragments (blog/fragments.py), changée par toute modification d'une
+  catégorie, d'un tag ou d'un auteur
+- If-None-Match / If-Modified-Since sont évalués AVANT tout rendu :
+  un client à jour reçoit un 304 sans corps
+- Variantes async (aetat_*) pour les vues async (voir blog/views.py)
+"""
+
+import asyncio
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from . import fragments
+from .models import Article, Categorie, Tag
+
+
+def calculer_etag(*elements):
+    """ETag fort à partir d'éléments quelconques (repr stable)"""
+    return quote_etag(hashlib.md5(repr(elements).encode()).hexdigest())
+
+
+def plus_recente(*dates):
+    """Plus récente des dates non nulles (ou None)"""
+    dates = [date for date in dates if date is not None]
+    return max(dates) if dates else None
+
+
+def etat_articles(queryset):
+    """Agrégats du queryset : (max date_modification, max date_publication, nombre)"""
+    etat = queryset.order_by().aggregate(
+        modification=Max('date_modification'),
+        publication=Max('date_publication'),
+        nombre=Count('id', distinct=True),
+    )
+    return etat['modification'], etat['publication'], etat['nombre']
+
+
+async def aetat_articles(queryset):
+    """Version async de etat_articles()"""
+    etat = await queryset.order_by().aaggregate(
+        modification=Max('date_modification'),
+        publication=Max('date_publication'),
+        nombre=Count('id', distinct=True),
+    )
+    return etat['modification'], etat['publication'], etat['nombre']
+
+
+async def alister(queryset):
+    """Évalue le queryset avec l'ORM async (préchargements compris)"""
+    return [objet async for objet in queryset]
+
+
+def articles_visibles():
+    return Article.objects.filter(
+        statut='publie',
+        date_publication__lte=timezone.now()
+    )
+
+
+def etat_blog():
+    """Agrégats de tous les articles visibles (navigation, articles liés)"""
+    return etat_articles(articles_visibles())
+
+
+async def aetat_blog():
+    return await aetat_articles(articles_visibles())
+
+
+def etat_taxonomie():
+    """
+    Catégories et tags affichés dans les filtres, puis version des fragments
+    (noms et couleurs des tags, noms des auteurs)
+    """
+    categories = Categorie.objects.aggregate(
+        modification=Max('date_modification'),
+        nombre=Count('id'),
+    )
+    tags = Tag.objects.aggregate(nombre=Count('id'), dernier=Max('id'))
+    return (
+        categories['modification'], categories['nombre'], tags['nombre'], tags['dernier'],
+        *fragments.etat(),
+    )
+
+
+async def aetat_taxonomie():
+    """Version async de etat_taxonomie() (agrégats et cache lancés ensemble)"""
+    categories, tags, version = await asyncio.gather(
+        Categorie.objects.aaggregate(
+            modification=Max('date_modification'),
+            nombre=Count('id'),
+        ),
+        Tag.objects.aaggregate(nombre=Count('id'), dernier=Max('id')),
+        fragments.aetat(),
+    )
+    return (
+        categories['modification'], categories['nombre'], tags['nombre'], tags['dernier'],
+        *version,
+    )
+
+
+class GetConditionnelMixin:
+    """
+    Mixin de vue : répond 304 avant rendu si le client est à jour
+    Les vues définissent get_validateurs() -> (etag, derniere_modification)
+    """
+
+    def get_validateurs(self):
+        return None, None
+
+    def get(self, request, *args, **kwargs):
+        etag, derniere_modification = self.get_validateurs()
+        response = self.reponse_conditionnelle(request, etag, derniere_modification)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        elif response.status_code == 304:
+            self.client_a_jour()
+        return self.ajouter_validateurs(response, etag, derniere_modification)
+
+    def client_a_jour(self):
+        """Réponse 304 : appelé à la place du rendu (ex: compteur de vues)"""
+
+    @staticmethod
+    def _horodatage(derniere_modification):
+        # Précision HTTP : la seconde
+        return int(derniere_modification.timestamp()) if derniere_modification else None
+
+    def reponse_conditionnelle(self, request, etag, derniere_modification):
+        """Réponse 304 (ou 412) si le client est à jour, sinon None"""
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=self._horodatage(derniere_modification),
+        )
+
+    def ajouter_validateurs(self, response, etag, derniere_modification):
+        horodatage = self._horodatage(derniere_modification)
+        if etag:
+            response.headers.setdefault('ETag', etag)
+        if horodatage:
+            response.headers.setdefault('Last-Modified', http_date(horodatage))
+        return response
+
+
+def queryset_par_requete(get_queryset):
+    """
+    Décorateur de get_queryset() des listes : appelée par les validateurs
+    puis par la liste, construite une seule fois par requête (filtres,
+    catégorie ou tag de l'URL, interrogation de l'index de recherche)
+    """
+    @wraps(get_queryset)
+    def queryset_memorise(self):
+        if '_queryset_requete' not in self.__dict__:
+            self._queryset_requete = get_queryset(self)
+        return self._queryset_requete
+
+    return queryset_memorise
+
+
+class ListeConditionnelleMixin(GetConditionnelMixin):
+    """
+    Validateurs des listes : articles filtrés + filtres de la page
+    (catégorie, tag, recherche, numéro de page)
+    """
+
+    def get_validateurs(self):
+        return self.validateurs(etat_articles(self.get_queryset()), etat_taxonomie())
+
+    def validateurs(self, etat, taxonomie):
+        """(etag, dernière modification) à partir des agrégats"""
+        modification, publication, nombre = etat
+        # Repris par la pagination (voir blog/pagination.py) : un seul COUNT
+        self.nombre_articles = nombre
+        etag = calculer_etag(
+            self.request.get_full_path(),
+            modification, publication, nombre,
+            taxonomie,
+        )
+        return etag, plus_recente(modification, publication, taxonomie[0], taxonomie[-1])
+
+
+class DetailConditionnelMixin(GetConditionnelMixin):
+    """
+    Validateurs du détail : article, catégorie, auteur, tags, version
+    des fragments et état global du blog (article précédent/suivant,
+    articles liés)
+    """
+    # Article de l'URL (pk), connu une fois les validateurs calculés
+    pk_article = None
+
+    def _article_de_l_url(self):
+        """Article de l'URL (même filtre que la vue)"""
+        return self.get_queryset().filter(slug=self.kwargs.get(self.slug_url_kwarg))
+
+    def _etat_article(self):
+        return self._article_de_l_url().values(
+            'pk',
+            'date_modification',
+            'categorie__date_modification',
+            'auteur__poste',
+            'auteur__photo',
+            'auteur__user__first_name',
+            'auteur__user__last_name',
+        )
+
+    def _tags_article(self):
+        return Tag.objects.filter(
+            articles__in=self._article_de_l_url().values('pk')
+        ).values_list('pk', 'nom', 'slug', 'couleur')
+
+    def get_validateurs(self):
+        article = self._etat_article().first()
+        if article is None:
+            # Laisser la vue lever la 404
+            return None, None
+        return self.validateurs(article, list(self._tags_article()), etat_blog(), fragments.etat())
+
+    async def aget_validateurs(self):
+        # Requêtes indépendantes : article, tags, état du blog et version ensemble
+        article, tags, blog, version = await asyncio.gather(
+            self._etat_article().afirst(),
+            alister(self._tags_article()),
+            aetat_blog(),
+            fragments.aetat(),
+        )
+        if article is None:
+            return None, None
+        return self.validateurs(article, tags, blog, version)
+
+    def validateurs(self, article, tags, blog, version):
+        self.pk_article = article['pk']
+        etag = calculer_etag(sorted(article.items()), tags, blog, version)
+        return etag, plus_recente(
+            article['date_modification'],
+            article['categorie__date_modification'],
+            *blog[:2],
+            version[1],
+        )
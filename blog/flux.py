@@ -0,0 +1,287 @@
+"""
+Flux RSS / Atom des articles publiés (blog, catégorie, tag)
+Principe :
+- Une seule requête (select_related catégorie + auteur, sans le contenu)
+  parcourue avec iterator() : le XML est envoyé par morceaux
+  (StreamingHttpResponse), une archive complète n'est jamais en mémoire
+- Le flux généré est conservé dans le cache (s'il reste sous TAILLE_CACHE)
+  jusqu'à la prochaine modification (version incrémentée par
+  blog/signals.py) ou jusqu'à la prochaine publication programmée
+  (voir blog/planification.py)
+- ETag / Last-Modified : un agrégat léger au premier appel, puis lus
+  dans le cache ; un client à jour reçoit un 304 sans requête SQL
+
+Configuration (settings.py) :
+    BLOG_FLUX = {
+        'ARTICLES': 50,             # None : toute l'archive
+        'TAILLE_CACHE': 1024 * 1024,  # octets, au-delà le flux n'est pas mis en cache
+    }
+"""
+
+import io
+from abc import ABCMeta, abstractmethod
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from aude_web.repliques import invalider_apres_commit
+
+from .conditionnel import calculer_etag, etat_articles, plus_recente
+from .models import Article, Categorie, Tag
+from .planification import duree_cache
+
+CONFIGURATION_PAR_DEFAUT = {
+    'ARTICLES': 50,
+    'TAILLE_CACHE': 1024 * 1024,
+}
+
+CLE_VERSION = 'blog:flux:version'
+
+# Taille des morceaux envoyés au client (caractères)
+TAILLE_MORCEAU = 16 * 1024
+
+TITRE = 'Blog Aude'
+DESCRIPTION = 'Articles du blog Aude : gestion de projets BTP et architecture'
+
+
+def configuration():
+    return {**CONFIGURATION_PAR_DEFAUT, **getattr(settings, 'BLOG_FLUX', {})}
+
+
+# ---------------------------------------------------------------------------
+# Génération par morceaux
+# ---------------------------------------------------------------------------
+
+class FluxContinuMixin(metaclass=ABCMeta):
+    """
+    Écriture du flux article par article (même XML que write())
+    Les sous-classes définissent l'ouverture, la fermeture et la balise d'un article
+    """
+    balise_article = None
+
+    @abstractmethod
+    def ouvrir(self, handler):
+        """Début du document jusqu'aux éléments du flux (avant le premier article)"""
+
+    @abstractmethod
+    def fermer(self, handler):
+        """Fermeture des éléments ouverts par ouvrir()"""
+
+    def latest_post_date(self):
+        # Date fournie à la construction : les articles ne sont pas en mémoire
+        return self.feed['derniere_modification'] or super().latest_post_date()
+
+    def morceaux(self, articles, encoding='utf-8'):
+        tampon = io.StringIO()
+        handler = SimplerXMLGenerator(tampon, encoding, short_empty_elements=True)
+        self.ouvrir(handler)
+
+        for champs in articles:
+            # add_item() normalise les champs : l'élément est retiré aussitôt
+            self.add_item(**champs)
+            article = self.items.pop()
+            handler.startElement(self.balise_article, self.item_attributes(article))
+            self.add_item_elements(handler, article)
+            handler.endElement(self.balise_article)
+            if tampon.tell() >= TAILLE_MORCEAU:
+                yield _vider(tampon, encoding)
+
+        self.fermer(handler)
+        yield _vider(tampon, encoding)
+
+
+def _vider(tampon, encoding):
+    morceau = tampon.getvalue().encode(encoding)
+    tampon.seek(0)
+    tampon.truncate()
+    return morceau
+
+
+class FluxRss(FluxContinuMixin, Rss201rev2Feed):
+    balise_article = 'item'
+
+    def ouvrir(self, handler):
+        handler.startDocument()
+        self.add_stylesheets(handler)
+        handler.startElement('rss', self.rss_attributes())
+        handler.startElement('channel', self.root_attributes())
+        self.add_root_elements(handler)
+
+    def fermer(self, handler):
+        self.endChannelElement(handler)
+        handler.endElement('rss')
+
+
+class FluxAtom(FluxContinuMixin, Atom1Feed):
+    balise_article = 'entry'
+
+    def ouvrir(self, handler):
+        handler.startDocument()
+        handler.startElement('feed', self.root_attributes())
+        self.add_root_elements(handler)
+
+    def fermer(self, handler):
+        handler.endElement('feed')
+
+
+FORMATS = {
+    'rss': FluxRss,
+    'atom': FluxAtom,
+}
+
+
+# ---------------------------------------------------------------------------
+# Articles
+# ---------------------------------------------------------------------------
+
+def articles_du_flux(categorie=None, tag=None):
+    """Articles visibles, du plus récent au plus ancien (sans le contenu)"""
+    articles = Article.objects.filter(
+        statut='publie',
+        date_publication__lte=timezone.now()
+    )
+    if categorie is not None:
+        articles = articles.filter(categorie=categorie)
+    if tag is not None:
+        articles = articles.filter(tags=tag)
+    return articles
+
+
+def _champs(article, request):
+    """Arguments de add_item() pour un article"""
+    lien = request.build_absolute_uri(article.get_absolute_url())
+    return {
+        'title': article.titre,
+        'link': lien,
+        'unique_id': lien,
+        'description': article.resume,
+        'pubdate': article.date_publication,
+        'updateddate': article.date_modification,
+        'author_name': str(article.auteur) if article.auteur else None,
+        'categories': [article.categorie.nom],
+    }
+
+
+def _lignes(articles, request, nombre):
+    articles = articles.select_related(
+        'categorie', 'auteur__user'
+    ).only(
+        'titre', 'slug', 'resume', 'date_publication', 'date_modification',
+        'categorie__nom',
+        'auteur__user__username', 'auteur__user__first_name', 'auteur__user__last_name',
+    ).order_by('-date_publication')
+    if nombre:
+        articles = articles[:nombre]
+    for article in articles.iterator(chunk_size=200):
+        yield _champs(article, request)
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+def _cle(version, request):
+    # URL absolue : les liens du flux dépendent de l'hôte
+    return f'blog:flux:{version}:{request.build_absolute_uri(request.path)}'
+
+
+def _avec_mise_en_cache(morceaux, cle, entree, taille_max, duree):
+    """Transmet les morceaux et met le flux complet en cache s'il est assez petit"""
+    contenu = []
+    taille = 0
+    for morceau in morceaux:
+        taille += len(morceau)
+        if contenu is not None and taille <= taille_max:
+            contenu.append(morceau)
+        else:
+            # Flux trop volumineux : les morceaux ne sont plus conservés
+            contenu = None
+        yield morceau
+    if contenu is not None:
+        cache.set(cle, {**entree, 'contenu': b''.join(contenu)}, timeout=duree)
+
+
+def _reponse_conditionnelle(request, entree):
+    horodatage = int(entree['modification'].timestamp()) if entree['modification'] else None
+    return get_conditional_response(request, etag=entree['etag'], last_modified=horodatage)
+
+
+def _ajouter_validateurs(response, entree):
+    response.headers['ETag'] = entree['etag']
+    if entree['modification']:
+        response.headers['Last-Modified'] = http_date(entree['modification'].timestamp())
+    return response
+
+
+def reponse_flux(request, format='rss', categorie=None, tag=None):
+    """
+    Réponse HTTP du flux (categorie / tag : slug ou None)
+    Cache -> 304 ou flux en cache ; sinon flux généré par morceaux
+    """
+    conf = configuration()
+    classe = FORMATS[format]
+    version = cache.get_or_set(CLE_VERSION, 1, timeout=None)
+    cle = _cle(version, request)
+
+    entree = cache.get(cle)
+    if entree is not None:
+        response = _reponse_conditionnelle(request, entree)
+        if response is None:
+            response = HttpResponse(entree['contenu'], content_type=entree['type'])
+        return _ajouter_validateurs(response, entree)
+
+    titre, lien = TITRE, reverse('blog:article_list')
+    if categorie is not None:
+        categorie = get_object_or_404(Categorie, slug=categorie)
+        titre, lien = f'{TITRE} – {categorie.nom}', categorie.get_absolute_url()
+    if tag is not None:
+        tag = get_object_or_404(Tag, slug=tag)
+        titre, lien = f'{TITRE} – {tag.nom}', reverse('blog:tag_detail', kwargs={'slug': tag.slug})
+
+    articles = articles_du_flux(categorie, tag)
+    modification, publication, nombre = etat_articles(articles)
+    derniere = plus_recente(modification, publication)
+    entree = {
+        'etag': calculer_etag(cle, modification, publication, nombre),
+        'modification': derniere,
+        'type': classe.content_type,
+    }
+    response = _reponse_conditionnelle(request, entree)
+    if response is not None:
+        return _ajouter_validateurs(response, entree)
+
+    flux = classe(
+        title=titre,
+        link=request.build_absolute_uri(lien),
+        description=DESCRIPTION,
+        language='fr',
+        feed_url=request.build_absolute_uri(),
+        derniere_modification=derniere,
+    )
+    morceaux = flux.morceaux(_lignes(articles, request, conf['ARTICLES']))
+    response = StreamingHttpResponse(
+        _avec_mise_en_cache(morceaux, cle, entree, conf['TAILLE_CACHE'], duree_cache()),
+        content_type=entree['type'],
+    )
+    return _ajouter_validateurs(response, entree)
+
+
+def _incrementer_version():
+    try:
+        cache.incr(CLE_VERSION)
+    except ValueError:
+        # Pas encore de version : rien à invalider
+        cache.set(CLE_VERSION, 1, timeout=None)
+
+
+def invalider_flux():
+    """Nouvelle version des flux après le commit de la transaction en cours"""
+    invalider_apres_commit(_incrementer_version)
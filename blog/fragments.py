@@ -0,0 +1,74 @@
+"""
+Fragments de templates en cache (carte d'article, en-tête et contenu du détail)
+Principe :
+- {% fragment_article article 'carte' %}...{% endfragment_article %} : le
+  HTML rendu est conservé dans le cache et réutilisé par toutes les pages
+  qui affichent l'article (liste, catégorie, tag, recherche)
+- Clé : article (pk, date_modification, tags), emplacement dans le
+  template (fichier, date du fichier) et version de la taxonomie ;
+  modifier un article ne change que ses clés, les anciens fragments
+  expirent d'eux-mêmes
+- Catégories, tags et auteurs sont affichés dans les fragments de tous
+  leurs articles : leur modification incrémente la version après le
+  commit (voir blog/signals.py)
+- La version et la date de son dernier changement entrent aussi dans les
+  validateurs HTTP des listes et du détail (voir blog/conditionnel.py) :
+  renommer un tag ou un auteur ne répond plus 304
+- {% hors_cache %}...{% fin_hors_cache %} : parties rendues à chaque
+  affichage (compteur de vues, liens dépendant de l'URL demandée)
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from aude_web.repliques import invalider_apres_commit
+
+CLE_VERSION = 'blog:fragments:version'
+CLE_DATE = 'blog:fragments:date'
+
+# Clés changées à chaque modification : durée de nettoyage des anciens fragments
+DUREE = 7 * 86400
+
+
+def version():
+    return cache.get_or_set(CLE_VERSION, 1, timeout=None)
+
+
+def _etat(valeurs):
+    if CLE_VERSION not in valeurs:
+        return None
+    return valeurs[CLE_VERSION], valeurs.get(CLE_DATE)
+
+
+def etat():
+    """(version, date du dernier changement de version ou None)"""
+    return _etat(cache.get_many([CLE_VERSION, CLE_DATE])) or (version(), None)
+
+
+async def aetat():
+    """Version async de etat()"""
+    valeurs = await cache.aget_many([CLE_VERSION, CLE_DATE])
+    return _etat(valeurs) or (await cache.aget_or_set(CLE_VERSION, 1, timeout=None), None)
+
+
+def cle_fragment(version, nom, article, source):
+    """Clé du fragment (tags lus dans le préchargement de la vue)"""
+    tags = sorted(tag.pk for tag in article.tags.all())
+    brut = repr((nom, article.pk, article.date_modification.isoformat(), tags, source))
+    return f'blog:fragment:{version}:{hashlib.md5(brut.encode()).hexdigest()}'
+
+
+def _incrementer_version():
+    try:
+        cache.incr(CLE_VERSION)
+    except ValueError:
+        # Pas encore de version : rien à invalider
+        cache.set(CLE_VERSION, 1, timeout=None)
+    cache.set(CLE_DATE, timezone.now(), timeout=None)
+
+
+def invalider_fragments():
+    """Nouvelle version de tous les fragments après le commit"""
+    invalider_apres_commit(_incrementer_version)
@@ -0,0 +1,66 @@
+"""
+Temps de lecture des articles
+Principe :
+- Calculé dans Article.save() à partir du contenu saisi (contenu) et
+  stocké (nombre_mots, temps_lecture) : rien n'est analysé à l'affichage ;
+  indépendant du rendu (contenu_html, voir blog/rendu.py)
+- Texte : mots sans balises (texte_brut, voir blog/recherche.py)
+- Blocs de code (<pre>) : mots lus plus lentement
+- Images : SECONDES_IMAGE pour la première, une seconde de moins pour
+  chacune des suivantes, jusqu'à SECONDES_IMAGE_MIN
+- Articles existants : remplis par la migration 0006, recalculés après un
+  changement de réglages par python manage.py calculer_temps_lecture
+
+Configuration (settings.py) :
+    BLOG_TEMPS_LECTURE = {
+        'MOTS_PAR_MINUTE': 230,
+        'MOTS_PAR_MINUTE_CODE': 80,
+        'SECONDES_IMAGE': 12,
+        'SECONDES_IMAGE_MIN': 3,
+    }
+"""
+
+import math
+import re
+
+from django.conf import settings
+
+from .recherche import texte_brut
+
+CONFIGURATION_PAR_DEFAUT = {
+    'MOTS_PAR_MINUTE': 230,
+    'MOTS_PAR_MINUTE_CODE': 80,
+    'SECONDES_IMAGE': 12,
+    'SECONDES_IMAGE_MIN': 3,
+}
+
+BLOC_CODE = re.compile(r'<pre\b[^>]*>(.*?)</pre>', re.IGNORECASE | re.DOTALL)
+IMAGE = re.compile(r'<img\b', re.IGNORECASE)
+
+
+def configuration():
+    return {**CONFIGURATION_PAR_DEFAUT, **getattr(settings, 'BLOG_TEMPS_LECTURE', {})}
+
+
+def _mots(contenu):
+    return len(texte_brut(contenu).split())
+
+
+def mesurer(contenu):
+    """(nombre de mots, temps de lecture en minutes, au moins 1) d'un contenu HTML"""
+    conf = configuration()
+    contenu = contenu or ''
+
+    mots_code = sum(_mots(bloc) for bloc in BLOC_CODE.findall(contenu))
+    mots_texte = _mots(BLOC_CODE.sub(' ', contenu))
+    images = len(IMAGE.findall(contenu))
+
+    secondes = (
+        mots_texte * 60 / conf['MOTS_PAR_MINUTE']
+        + mots_code * 60 / conf['MOTS_PAR_MINUTE_CODE']
+        + sum(
+            max(conf['SECONDES_IMAGE'] - rang, conf['SECONDES_IMAGE_MIN'])
+            for rang in range(images)
+        )
+    )
+    return mots_texte + mots_code, max(1, math.ceil(secondes / 60))
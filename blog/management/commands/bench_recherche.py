@@ -0,0 +1,64 @@
+"""
+Banc d'essai : recherche plein texte contre l'ancien filtre icontains
+
+Usage:
+    python manage.py bench_recherche
+    python manage.py bench_recherche --requete btp --requete "béton armé" --repetitions 50
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Article
+from blog.recherche import filtre_icontains, get_moteur, rechercher
+
+
+class Command(BaseCommand):
+    help = 'Compare les temps de recherche (index plein texte / icontains)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requete',
+            action='append',
+            dest='requetes',
+            help='Requête à mesurer (option répétable)',
+        )
+        parser.add_argument(
+            '--repetitions',
+            type=int,
+            default=20,
+            help='Nombre d\'exécutions par requête',
+        )
+
+    def handle(self, *args, **options):
+        requetes = options['requetes'] or ['btp', 'intelligence artificielle', 'béton', 'chantiers']
+        repetitions = options['repetitions']
+
+        base = Article.objects.filter(statut='publie', date_publication__lte=timezone.now())
+
+        if get_moteur(base.db) is None:
+            self.stdout.write(self.style.WARNING('⚠️  Index plein texte indisponible'))
+
+        self.stdout.write(f'{base.count()} article(s) publiés, {repetitions} répétition(s)\n')
+        self.stdout.write(f"{'Requête':<30} {'icontains':>14} {'index':>14} {'résultats':>12}")
+
+        for requete in requetes:
+            temps_icontains, nb_icontains = self._mesurer(
+                lambda: base.filter(filtre_icontains(requete)), repetitions
+            )
+            temps_index, nb_index = self._mesurer(
+                lambda: rechercher(base, requete)[0], repetitions
+            )
+            self.stdout.write(
+                f'{requete[:30]:<30} {temps_icontains:>11.2f} ms {temps_index:>11.2f} ms '
+                f'{nb_icontains:>5} / {nb_index:<5}'
+            )
+
+    def _mesurer(self, construire, repetitions):
+        """Temps moyen (ms) pour évaluer les ids du queryset"""
+        debut = time.perf_counter()
+        for _ in range(repetitions):
+            ids = list(construire().values_list('pk', flat=True))
+        return (time.perf_counter() - debut) * 1000 / repetitions, len(ids)
@@ -0,0 +1,191 @@
+"""
+Banc d'essai des profils SQLite sous charge mixte lecture / écriture
+
+Usage:
+    python manage.py seed_blog
+    python manage.py bench_sqlite
+    python manage.py bench_sqlite --lecteurs 16 --ecrivains 4 --duree 10 --profil production
+
+Chaque profil (voir aude_web/base_de_donnees.py) est mesuré sur une copie
+de la base dans un dossier temporaire (la base réelle n'est jamais modifiée) :
+- lecteurs : page de liste du blog (SELECT paginé + COUNT)
+- écrivains : vidage du compteur de vues (UPDATE groupé en transaction)
+- profil sans connexions persistantes : une connexion par opération,
+  comme une requête HTTP avec CONN_MAX_AGE = 0
+"""
+
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from aude_web.base_de_donnees import PROFILS_SQLITE, pragmas_sqlite
+from aude_web.profilage import centile
+
+LECTURE = (
+    "SELECT id, titre, slug, resume, date_publication FROM blog_article "
+    "WHERE statut = 'publie' ORDER BY date_publication DESC LIMIT 9 OFFSET ?"
+)
+COMPTAGE = "SELECT COUNT(*) FROM blog_article WHERE statut = 'publie'"
+ECRITURE = "UPDATE blog_article SET vues = vues + 1 WHERE id IN ({})"
+
+# Articles mis à jour par transaction d'écriture (un vidage du compteur)
+TAILLE_LOT = 20
+
+
+class Charge:
+    """Exécute lectures et écritures en parallèle sur une base et un profil"""
+
+    def __init__(self, chemin, profil, ids):
+        self.chemin = chemin
+        self.reglages = PROFILS_SQLITE[profil]
+        self.pragmas = pragmas_sqlite(profil)
+        self.ids = ids
+        self.mesures = {'lecture': [], 'ecriture': []}
+        self.erreurs = {'lecture': 0, 'ecriture': 0}
+        self._verrou = threading.Lock()
+        self._fin = 0
+
+    def connecter(self):
+        connexion = sqlite3.connect(
+            self.chemin, timeout=self.reglages['timeout'],
+            isolation_level=None, check_same_thread=False
+        )
+        for pragma in self.pragmas:
+            connexion.execute(pragma)
+        return connexion
+
+    def lire(self, connexion):
+        connexion.execute(LECTURE, (random.randrange(0, max(1, len(self.ids) - 9)),)).fetchall()
+        connexion.execute(COMPTAGE).fetchone()
+
+    def ecrire(self, connexion):
+        lot = random.sample(self.ids, min(TAILLE_LOT, len(self.ids)))
+        debut = f"BEGIN {self.reglages['transaction_mode']}" if self.reglages['transaction_mode'] else 'BEGIN'
+        connexion.execute(debut)
+        try:
+            connexion.execute(ECRITURE.format(','.join('?' * len(lot))), lot)
+            connexion.execute('COMMIT')
+        except sqlite3.Error:
+            connexion.execute('ROLLBACK')
+            raise
+
+    def travailleur(self, genre):
+        operation = self.lire if genre == 'lecture' else self.ecrire
+        persistante = self.reglages['conn_max_age'] != 0
+        connexion = self.connecter() if persistante else None
+
+        while time.perf_counter() < self._fin:
+            debut = time.perf_counter()
+            try:
+                if not persistante:
+                    connexion = self.connecter()
+                operation(connexion)
+            except sqlite3.OperationalError:
+                # "database is locked" : délai d'attente dépassé
+                with self._verrou:
+                    self.erreurs[genre] += 1
+            else:
+                with self._verrou:
+                    self.mesures[genre].append(time.perf_counter() - debut)
+            finally:
+                if not persistante and connexion is not None:
+                    connexion.close()
+                    connexion = None
+            if genre == 'ecriture':
+                # Un vidage toutes les ~10 ms par écrivain
+                time.sleep(0.01)
+
+        if connexion is not None:
+            connexion.close()
+
+    def executer(self, lecteurs, ecrivains, duree):
+        self._fin = time.perf_counter() + duree
+        threads = [
+            threading.Thread(target=self.travailleur, args=(genre,))
+            for genre, nombre in (('lecture', lecteurs), ('ecriture', ecrivains))
+            for _ in range(nombre)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        resultats = {}
+        for genre, mesures in self.mesures.items():
+            latences = sorted(m * 1000 for m in mesures)
+            resultats[genre] = {
+                'ops_s': len(mesures) / duree,
+                'p50_ms': centile(latences, 50) if latences else None,
+                'p95_ms': centile(latences, 95) if latences else None,
+                'erreurs': self.erreurs[genre],
+            }
+        return resultats
+
+
+class Command(BaseCommand):
+    help = 'Compare les profils SQLite (débit, latences, verrous) sous charge mixte'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lecteurs', type=int, default=8, help='Threads de lecture')
+        parser.add_argument('--ecrivains', type=int, default=2, help='Threads d\'écriture')
+        parser.add_argument('--duree', type=float, default=5, help='Durée par profil (secondes)')
+        parser.add_argument(
+            '--profil',
+            action='append',
+            dest='profils',
+            choices=sorted(PROFILS_SQLITE),
+            help='Profil à mesurer (répétable, tous par défaut)',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('La base par défaut n\'est pas SQLite')
+
+        ids = [
+            ligne[0] for ligne in
+            connection.cursor().execute("SELECT id FROM blog_article WHERE statut = 'publie'").fetchall()
+        ]
+        if not ids:
+            raise CommandError('Aucun article publié : lancer d\'abord python manage.py seed_blog')
+
+        self.stdout.write(
+            f"🚀 {len(ids)} article(s), {options['lecteurs']} lecteur(s), "
+            f"{options['ecrivains']} écrivain(s), {options['duree']:g} s par profil\n"
+        )
+        self.stdout.write(
+            f"{'Profil':<12} {'Opération':<10} {'ops/s':>9} {'p50':>9} {'p95':>9} {'verrous':>8}"
+        )
+
+        with tempfile.TemporaryDirectory() as dossier:
+            for profil in options['profils'] or list(PROFILS_SQLITE):
+                copie = str(Path(dossier) / f'{profil}.sqlite3')
+                self._copier(copie)
+                charge = Charge(copie, profil, ids)
+                resultats = charge.executer(options['lecteurs'], options['ecrivains'], options['duree'])
+                for genre, resultat in resultats.items():
+                    self._afficher(profil, genre, resultat)
+
+    def _copier(self, destination):
+        """Copie cohérente de la base (API de sauvegarde SQLite)"""
+        connection.ensure_connection()
+        cible = sqlite3.connect(destination)
+        try:
+            connection.connection.backup(cible)
+        finally:
+            cible.close()
+
+    def _afficher(self, profil, genre, resultat):
+        def ms(valeur):
+            return '-' if valeur is None else f'{valeur:.2f}'
+
+        ligne = (
+            f"{profil:<12} {genre:<10} {resultat['ops_s']:>9.1f} "
+            f"{ms(resultat['p50_ms']):>9} {ms(resultat['p95_ms']):>9} {resultat['erreurs']:>8}"
+        )
+        self.stdout.write(self.style.ERROR(ligne) if resultat['erreurs'] else ligne)
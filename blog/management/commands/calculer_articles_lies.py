@@ -0,0 +1,41 @@
+"""
+Commande de calcul de l'index des articles liés
+
+Usage:
+    python manage.py calculer_articles_lies
+    python manage.py calculer_articles_lies --en-attente
+
+Sans option : calcul complet (poids IDF réalignés, articles programmés
+devenus visibles). --en-attente : seuls les articles modifiés depuis le
+dernier passage (BLOG_ARTICLES_LIES['DIFFERER'], à lancer par cron).
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.articles_lies import reconstruire, traiter_en_attente
+
+
+class Command(BaseCommand):
+    help = 'Recalcule les articles liés (tags, catégorie, TF-IDF) de tous les articles publiés'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--en-attente',
+            action='store_true',
+            help='Recalcule seulement les articles modifiés depuis le dernier passage',
+        )
+
+    def handle(self, *args, **options):
+        debut = time.perf_counter()
+        if options['en_attente']:
+            en_attente, total = traiter_en_attente()
+            duree = time.perf_counter() - debut
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ {en_attente} article(s) en attente, {total} recalculé(s) en {duree:.1f} s'
+            ))
+            return
+        total = reconstruire()
+        duree = time.perf_counter() - debut
+        self.stdout.write(self.style.SUCCESS(f'✅ {total} article(s) traité(s) en {duree:.1f} s'))
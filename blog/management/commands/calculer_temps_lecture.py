@@ -0,0 +1,65 @@
+"""
+Commande de calcul du nombre de mots et du temps de lecture des articles
+
+Usage:
+    python manage.py calculer_temps_lecture
+    python manage.py calculer_temps_lecture --lot 1000
+
+Articles lus par lots (iterator) avec leur contenu, seuls les articles
+dont les valeurs changent sont écrits (bulk_update, date_modification
+inchangée). Voir blog/lecture.py pour le calcul (même fonction que
+Article.save() et la migration 0006).
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+
+from blog import agregats, fragments, planification
+from blog.lecture import mesurer
+from blog.models import Article
+
+CHAMPS = ['nombre_mots', 'temps_lecture']
+
+
+class Command(BaseCommand):
+    help = 'Calcule le nombre de mots et le temps de lecture de tous les articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lot', type=int, default=500, help='Articles lus et écrits par lot')
+
+    def handle(self, *args, **options):
+        debut = time.perf_counter()
+        alias = router.db_for_write(Article)
+        articles = Article.objects.using(alias).only('id', 'contenu', *CHAMPS)
+
+        total = modifies = 0
+        lot = []
+        with transaction.atomic(using=alias):
+            for article in articles.iterator(chunk_size=options['lot']):
+                total += 1
+                valeurs = mesurer(article.contenu)
+                if valeurs != (article.nombre_mots, article.temps_lecture):
+                    article.nombre_mots, article.temps_lecture = valeurs
+                    lot.append(article)
+                if len(lot) == options['lot']:
+                    modifies += self._ecrire(articles, lot)
+                    lot = []
+            modifies += self._ecrire(articles, lot)
+
+            if modifies:
+                # Temps de lecture affiché dans les cartes, le détail et la barre latérale
+                fragments.invalider_fragments()
+                planification.invalider_pages()
+                agregats.invalider_agregats()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {modifies} article(s) mis à jour sur {total} en {time.perf_counter() - debut:.1f} s'
+        ))
+
+    @staticmethod
+    def _ecrire(articles, lot):
+        if lot:
+            articles.bulk_update(lot, CHAMPS)
+        return len(lot)
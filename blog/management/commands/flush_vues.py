@@ -0,0 +1,22 @@
+"""
+Commande de vidage du compteur de vues différé
+
+Usage:
+    python manage.py flush_vues
+
+Avec le backend 'memoire', seul le tampon du processus courant est vidé
+(chaque serveur vide le sien à l'arrêt). Avec le backend 'cache', les vues
+en attente de tous les processus partageant le cache sont écrites en base.
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog.compteur import get_compteur
+
+
+class Command(BaseCommand):
+    help = 'Écrit en base les vues d\'articles en attente dans le tampon'
+
+    def handle(self, *args, **options):
+        total = get_compteur().vider()
+        self.stdout.write(self.style.SUCCESS(f'✅ {total} vue(s) écrite(s) en base'))
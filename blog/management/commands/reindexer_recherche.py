@@ -0,0 +1,33 @@
+"""
+Commande de reconstruction de l'index de recherche plein texte
+
+Usage:
+    python manage.py reindexer_recherche
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+
+from blog.models import Article
+from blog.recherche import get_moteur, reconstruire_index
+
+
+class Command(BaseCommand):
+    help = 'Reconstruit l\'index de recherche plein texte des articles'
+
+    def handle(self, *args, **options):
+        alias = router.db_for_write(Article)
+
+        if get_moteur(alias) is None:
+            self.stdout.write(self.style.WARNING(
+                '⚠️  Aucun index plein texte sur cette base (recherche en icontains)'
+            ))
+            return
+
+        with transaction.atomic(using=alias):
+            total = reconstruire_index(
+                Article.objects.using(alias).only('titre', 'resume', 'contenu').iterator(),
+                alias
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {total} article(s) indexé(s)'))
@@ -0,0 +1,69 @@
+"""
+Commande de rendu du contenu de tous les articles
+
+Usage:
+    python manage.py rendre_articles
+    python manage.py rendre_articles --lot 1000
+
+À lancer après la migration 0005 (articles existants) ou après un
+changement des règles de rendu (BLOG_RENDU). Recalcule contenu_html,
+table_des_matieres, nombre_mots et temps_lecture ; seuls les articles dont
+les valeurs changent sont écrits (bulk_update, date_modification
+inchangée). Génère les variantes des images insérées (website/images.py).
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+
+from blog import agregats, fragments, planification
+from blog.lecture import mesurer
+from blog.models import Article
+from blog.rendu import rendre
+
+CHAMPS = ['contenu_html', 'table_des_matieres', 'nombre_mots', 'temps_lecture']
+
+
+class Command(BaseCommand):
+    help = 'Rend le contenu de tous les articles (HTML publié, sommaire, temps de lecture)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lot', type=int, default=200, help='Articles lus et écrits par lot')
+
+    def handle(self, *args, **options):
+        debut = time.perf_counter()
+        alias = router.db_for_write(Article)
+        articles = Article.objects.using(alias).only('id', 'contenu', *CHAMPS)
+
+        total = modifies = 0
+        lot = []
+        with transaction.atomic(using=alias):
+            for article in articles.iterator(chunk_size=options['lot']):
+                total += 1
+                contenu_html, sommaire = rendre(article.contenu)
+                valeurs = (contenu_html, sommaire, *mesurer(article.contenu))
+                if valeurs != tuple(getattr(article, champ) for champ in CHAMPS):
+                    for champ, valeur in zip(CHAMPS, valeurs):
+                        setattr(article, champ, valeur)
+                    lot.append(article)
+                if len(lot) == options['lot']:
+                    modifies += self._ecrire(articles, lot)
+                    lot = []
+            modifies += self._ecrire(articles, lot)
+
+            if modifies:
+                # Contenu du détail, temps de lecture des cartes et de la barre latérale
+                fragments.invalider_fragments()
+                planification.invalider_pages()
+                agregats.invalider_agregats()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {modifies} article(s) rendu(s) sur {total} en {time.perf_counter() - debut:.1f} s'
+        ))
+
+    @staticmethod
+    def _ecrire(articles, lot):
+        if lot:
+            articles.bulk_update(lot, CHAMPS)
+        return len(lot)
@@ -0,0 +1,192 @@
+"""
+Django Management Command : jeu de données réaliste pour les bancs d'essai
+
+Usage:
+    python manage.py seed_blog
+    python manage.py seed_blog --articles 5000 --tags 400
+    python manage.py seed_blog --clear  (efface les données générées avant de recréer)
+
+Crée catégories, tags, auteurs et articles publiés (préfixe de slug 'bench-'),
+les tarifs de seed_pricing, puis reconstruit l'index de recherche et les
+articles liés. Génération déterministe (--graine) : deux exécutions produisent
+les mêmes données, et donc des mesures comparables.
+"""
+
+import random
+from datetime import timedelta
+from io import BytesIO
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import Article, Auteur, Categorie, Tag
+
+PREFIXE = 'bench-'
+
+IMAGE_COUVERTURE = 'blog/covers/bench/couverture.jpg'
+
+CATEGORIES = [
+    'Innovation', 'Chantier', 'Architecture', 'Gestion de projet', 'Réglementation',
+    'Matériaux', 'Énergie', 'Sécurité', 'Urbanisme', 'Finance', 'Logiciels', 'Témoignages',
+]
+
+VOCABULAIRE = (
+    'chantier béton armé structure fondation maçonnerie charpente toiture façade isolation '
+    'thermique acoustique plomberie électricité ventilation planning budget devis facture '
+    'maître ouvrage œuvre architecte ingénieur conducteur travaux sécurité norme réglementation '
+    'permis construire urbanisme parcelle terrain étude sol géotechnique coffrage ferraillage '
+    'livraison réception réserve garantie décennale assurance sinistre innovation numérique '
+    'maquette BIM logiciel tablette suivi photo rapport réunion coordination sous-traitant '
+    'artisan fournisseur matériau acier bois brique parpaing enduit peinture carrelage menuiserie '
+    'énergie solaire rénovation performance bâtiment logement bureau immeuble villa Abidjan '
+    'Côte Ivoire Afrique marché croissance équipe client qualité délai coût risque'
+).split()
+
+
+class Command(BaseCommand):
+    help = 'Remplit la base avec un blog volumineux et les tarifs (bancs d\'essai)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=3000, help='Nombre d\'articles')
+        parser.add_argument('--tags', type=int, default=300, help='Nombre de tags')
+        parser.add_argument('--auteurs', type=int, default=12, help='Nombre d\'auteurs')
+        parser.add_argument('--graine', type=int, default=42, help='Graine aléatoire')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Efface les données générées existantes avant le seeding',
+        )
+
+    def handle(self, *args, **options):
+        self.aleatoire = random.Random(options['graine'])
+
+        self.stdout.write("\n" + "="*60)
+        self.stdout.write(self.style.SUCCESS('🚀 GÉNÉRATION DU JEU DE DONNÉES DE BENCHMARK'))
+        self.stdout.write("="*60 + "\n")
+
+        if options['clear']:
+            self.stdout.write(self.style.WARNING('⚠️  Effacement des données générées...'))
+            self._effacer()
+            self.stdout.write(self.style.SUCCESS('✅ Données effacées\n'))
+
+        with transaction.atomic():
+            categories = self._seed_categories()
+            tags = self._seed_tags(options['tags'])
+            auteurs = self._seed_auteurs(options['auteurs'])
+            self._seed_articles(options['articles'], categories, tags, auteurs)
+
+        call_command('seed_pricing', stdout=self.stdout)
+
+        # bulk_create n'envoie pas de signal : index reconstruits d'un bloc
+        self.stdout.write('🔄 Index de recherche et articles liés...')
+        call_command('reindexer_recherche', stdout=self.stdout)
+        call_command('calculer_articles_lies', stdout=self.stdout)
+
+        self.stdout.write("\n" + "="*60)
+        self.stdout.write(self.style.SUCCESS('✅ JEU DE DONNÉES PRÊT'))
+        self.stdout.write("="*60 + "\n")
+
+    def _effacer(self):
+        Article.objects.filter(slug__startswith=PREFIXE).delete()
+        Tag.objects.filter(slug__startswith=PREFIXE).delete()
+        Categorie.objects.filter(slug__startswith=PREFIXE).delete()
+        User.objects.filter(username__startswith=PREFIXE).delete()
+
+    def _seed_categories(self):
+        self.stdout.write('🔄 Seeding Categorie...')
+        categories = []
+        for ordre, nom in enumerate(CATEGORIES):
+            categorie, _ = Categorie.objects.update_or_create(
+                slug=f'{PREFIXE}{ordre}',
+                defaults={'nom': f'{nom} (bench)', 'ordre': ordre, 'description': self._phrase(12)},
+            )
+            categories.append(categorie)
+        self.stdout.write(self.style.SUCCESS(f'  ✅ {len(categories)} catégories'))
+        return categories
+
+    def _seed_tags(self, nombre):
+        self.stdout.write('🔄 Seeding Tag...')
+        existants = set(Tag.objects.filter(slug__startswith=PREFIXE).values_list('slug', flat=True))
+        Tag.objects.bulk_create([
+            Tag(nom=f'{self.aleatoire.choice(VOCABULAIRE)} {i}', slug=f'{PREFIXE}{i}')
+            for i in range(nombre)
+            if f'{PREFIXE}{i}' not in existants
+        ])
+        tags = list(Tag.objects.filter(slug__startswith=PREFIXE))
+        self.stdout.write(self.style.SUCCESS(f'  ✅ {len(tags)} tags'))
+        return tags
+
+    def _seed_auteurs(self, nombre):
+        self.stdout.write('🔄 Seeding Auteur...')
+        auteurs = []
+        for i in range(nombre):
+            user, _ = User.objects.get_or_create(
+                username=f'{PREFIXE}auteur{i}',
+                defaults={'first_name': 'Auteur', 'last_name': str(i)},
+            )
+            auteur, _ = Auteur.objects.get_or_create(user=user, defaults={'bio': self._phrase(20)})
+            auteurs.append(auteur)
+        self.stdout.write(self.style.SUCCESS(f'  ✅ {len(auteurs)} auteurs'))
+        return auteurs
+
+    def _seed_articles(self, nombre, categories, tags, auteurs):
+        self.stdout.write('🔄 Seeding Article...')
+        self._creer_image_couverture()
+
+        existants = Article.objects.filter(slug__startswith=PREFIXE).count()
+        maintenant = timezone.now()
+        articles = []
+        for i in range(existants, nombre):
+            titre = self._phrase(self.aleatoire.randint(4, 9)).capitalize()
+            resume = self._phrase(30)[:300]
+            article = Article(
+                titre=titre,
+                slug=f'{PREFIXE}{i}',
+                resume=resume,
+                meta_description=resume[:160],
+                contenu=''.join(
+                    f'<h2>{self._phrase(5)}</h2><p>{self._phrase(self.aleatoire.randint(60, 160))}</p>'
+                    for _ in range(self.aleatoire.randint(3, 8))
+                ),
+                image_couverture=IMAGE_COUVERTURE,
+                statut='publie',
+                vues=self.aleatoire.randint(0, 5000),
+                categorie=self.aleatoire.choice(categories),
+                auteur=self.aleatoire.choice(auteurs),
+                date_publication=maintenant - timedelta(minutes=self.aleatoire.randint(60, 3 * 365 * 24 * 60)),
+                en_vedette=i == 0,
+            )
+            # bulk_create n'appelle pas save()
+            article.rendre_contenu()
+            article.mesurer_lecture()
+            articles.append(article)
+        articles = Article.objects.bulk_create(articles, batch_size=500)
+
+        # Répartition des tags proche d'un vrai blog : quelques tags très utilisés
+        liens = []
+        for article in articles:
+            choisis = {
+                tags[min(int(self.aleatoire.paretovariate(1.2)) - 1, len(tags) - 1)]
+                for _ in range(self.aleatoire.randint(1, 5))
+            }
+            liens.extend(Article.tags.through(article_id=article.pk, tag_id=tag.pk) for tag in choisis)
+        Article.tags.through.objects.bulk_create(liens, batch_size=1000, ignore_conflicts=True)
+
+        self.stdout.write(self.style.SUCCESS(f'  ✅ {len(articles)} articles créés ({existants} existants)'))
+
+    def _creer_image_couverture(self):
+        """Une seule image partagée par tous les articles générés"""
+        if default_storage.exists(IMAGE_COUVERTURE):
+            return
+        tampon = BytesIO()
+        Image.new('RGB', (1200, 630), (37, 99, 235)).save(tampon, 'JPEG', quality=80)
+        default_storage.save(IMAGE_COUVERTURE, ContentFile(tampon.getvalue()))
+
+    def _phrase(self, nombre_mots):
+        return ' '.join(self.aleatoire.choices(VOCABULAIRE, k=nombre_mots))
@@ -0,0 +1,56 @@
+"""
+Index de recherche plein texte (voir blog/recherche.py)
+SQL figé ici : la migration ne dépend pas du code actuel de l'application
+Index rempli ensuite par : python manage.py reindexer_recherche
+(recherche en icontains tant que l'index ne couvre pas tous les articles)
+"""
+
+import logging
+
+from django.db import DatabaseError, migrations
+
+logger = logging.getLogger(__name__)
+
+CREATION = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS blog_article_fts "
+        "USING fts5(titre, resume, contenu, tokenize='unicode61 remove_diacritics 2')",
+    ],
+    'postgresql': [
+        "CREATE TABLE IF NOT EXISTS blog_article_recherche ("
+        "article_id bigint PRIMARY KEY REFERENCES blog_article (id) ON DELETE CASCADE, "
+        "document tsvector NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS blog_article_recherche_document_idx "
+        "ON blog_article_recherche USING GIN (document)",
+    ],
+}
+
+SUPPRESSION = {
+    'sqlite': ["DROP TABLE IF EXISTS blog_article_fts"],
+    'postgresql': ["DROP TABLE IF EXISTS blog_article_recherche"],
+}
+
+
+def creer_index(apps, schema_editor):
+    try:
+        for sql in CREATION.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    except DatabaseError:
+        # SQLite compilé sans FTS5 : la recherche restera en icontains
+        logger.warning("Index plein texte indisponible sur cette base")
+
+
+def supprimer_index(apps, schema_editor):
+    for sql in SUPPRESSION.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_alter_article_contenu'),
+    ]
+
+    operations = [
+        migrations.RunPython(creer_index, supprimer_index),
+    ]
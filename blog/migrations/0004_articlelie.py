@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 10:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_article_recherche'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleLie',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rang', models.PositiveSmallIntegerField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='voisins', to='blog.article')),
+                ('article_lie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='liens_entrants', to='blog.article')),
+            ],
+            options={
+                'verbose_name': 'Article lié',
+                'verbose_name_plural': 'Articles liés',
+                'ordering': ['article', 'rang'],
+                'constraints': [models.UniqueConstraint(fields=('article', 'rang'), name='blog_articlelie_article_rang')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+# Contenu des articles existants rendu à leur première lecture
+# (Article.completer_rendu) ou d'un coup par :
+# python manage.py rendre_articles (voir blog/rendu.py)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_articlelie'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='contenu_html',
+            field=models.TextField(blank=True, editable=False, help_text='Contenu nettoyé, images optimisées, titres ancrés'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='table_des_matieres',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text="Titres du contenu : [{'niveau', 'ancre', 'titre'}, ...]"),
+        ),
+    ]
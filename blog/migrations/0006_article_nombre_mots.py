@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-18 10:58
+
+from django.db import migrations, models
+
+from blog.lecture import mesurer
+
+TAILLE_LOT = 500
+
+
+def mesurer_articles(apps, schema_editor):
+    """Nombre de mots et temps de lecture des articles existants (même calcul que Article.save())"""
+    Article = apps.get_model('blog', 'Article')
+    articles = Article.objects.using(schema_editor.connection.alias).only('id', 'contenu')
+    lot = []
+    for article in articles.iterator(chunk_size=TAILLE_LOT):
+        article.nombre_mots, article.temps_lecture = mesurer(article.contenu)
+        lot.append(article)
+        if len(lot) == TAILLE_LOT:
+            articles.bulk_update(lot, ['nombre_mots', 'temps_lecture'])
+            lot = []
+    articles.bulk_update(lot, ['nombre_mots', 'temps_lecture'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_article_contenu_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='nombre_mots',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Nombre de mots du contenu'),
+        ),
+        migrations.AlterField(
+            model_name='article',
+            name='temps_lecture',
+            field=models.IntegerField(default=5, editable=False, help_text='Temps de lecture estimé (en minutes)'),
+        ),
+        migrations.RunPython(mesurer_articles, migrations.RunPython.noop),
+    ]
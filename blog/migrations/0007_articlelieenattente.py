@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-18 11:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_article_nombre_mots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleLieEnAttente',
+            fields=[
+                ('article_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Article lié en attente',
+                'verbose_name_plural': 'Articles liés en attente',
+            },
+        ),
+    ]
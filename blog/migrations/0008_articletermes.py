@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-18 11:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_articlelieenattente'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleTermes',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='blog.article')),
+                ('date_modification', models.DateTimeField()),
+                ('termes', models.JSONField(default=dict)),
+            ],
+            options={
+                'verbose_name': "Termes d'un article",
+                'verbose_name_plural': 'Termes des articles',
+            },
+        ),
+    ]
@@ -14,6 +14,9 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from ckeditor_uploader.fields import RichTextUploadingField
 
+from .lecture import mesurer
+from .rendu import rendre
+
 
 class Categorie(models.Model):
     """
@@ -179,6 +182,18 @@ class Article(models.Model):
     contenu = RichTextUploadingField(
         help_text="Contenu complet de l'article (Markdown supporté)"
     )
+    # Rendu calculé à la sauvegarde (voir blog/rendu.py)
+    contenu_html = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="Contenu nettoyé, images optimisées, titres ancrés"
+    )
+    table_des_matieres = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="Titres du contenu : [{'niveau', 'ancre', 'titre'}, ...]"
+    )
 
     # Médias
     image_couverture = models.ImageField(
@@ -191,9 +206,15 @@ class Article(models.Model):
         help_text="Texte alternatif pour l'accessibilité"
     )
 
-    # Métadonnées
+    # Métadonnées (lecture calculée à la sauvegarde, voir blog/lecture.py)
+    nombre_mots = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Nombre de mots du contenu"
+    )
     temps_lecture = models.IntegerField(
         default=5,
+        editable=False,
         help_text="Temps de lecture estimé (en minutes)"
     )
     statut = models.CharField(
@@ -261,38 +282,103 @@ class Article(models.Model):
             models.Index(fields=['statut']),
         ]
 
+    # Colonnes lourdes, inutiles aux listes d'articles
+    CHAMPS_CONTENU = ('contenu', 'contenu_html', 'table_des_matieres')
+
     def __str__(self):
         return self.titre
 
     def save(self, *args, **kwargs):
-        """Génération automatique du slug et de la meta_description"""
+        """Génération automatique du slug, de la meta_description, du rendu du contenu et du temps de lecture"""
         if not self.slug:
             self.slug = slugify(self.titre)
 
         if not self.meta_description:
             self.meta_description = self.resume[:160]
 
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'contenu' in update_fields:
+            self.rendre_contenu()
+            self.mesurer_lecture()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'contenu_html', 'table_des_matieres', 'nombre_mots', 'temps_lecture'
+                }
+
         super().save(*args, **kwargs)
 
+    def rendre_contenu(self):
+        """HTML publié et table des matières (voir blog/rendu.py)"""
+        self.contenu_html, self.table_des_matieres = rendre(self.contenu)
+
+    def completer_rendu(self):
+        """
+        Article enregistré avant la migration 0005 (contenu_html vide) :
+        rendu à sa première lecture puis stocké, sans attendre la commande
+        rendre_articles (UPDATE direct : ni signaux ni date_modification)
+        """
+        if self.contenu_html or not self.contenu:
+            return
+        self.rendre_contenu()
+        Article.objects.filter(pk=self.pk).update(
+            contenu_html=self.contenu_html,
+            table_des_matieres=self.table_des_matieres,
+        )
+
+    def mesurer_lecture(self):
+        """Nombre de mots et temps de lecture du contenu (voir blog/lecture.py)"""
+        self.nombre_mots, self.temps_lecture = mesurer(self.contenu)
+
     def get_absolute_url(self):
         """URL canonique de l'article"""
         return reverse('blog:article_detail', kwargs={'slug': self.slug})
 
     def incrementer_vues(self):
-        """Incrémenter le compteur de vues de manière atomique"""
-        self.vues = models.F('vues') + 1
-        self.save(update_fields=['vues'])
-        self.refresh_from_db()
+        """
+        Incrémenter le compteur de vues
+        La vue est mise en tampon (voir blog/compteur.py) puis écrite
+        en base par lot : pas d'UPDATE ni de SELECT à chaque affichage
+        """
+        from .compteur import get_compteur
+
+        compteur = get_compteur()
+        compteur.incrementer(self.pk)
+        # Valeur affichée : vues en base + vues encore en tampon
+        # (au moins la vue courante si le tampon vient d'être vidé)
+        self.vues += max(compteur.en_attente(self.pk), 1)
 
     def get_articles_lies(self, limit=3):
-        """Articles similaires (même catégorie ou tags communs)"""
+        """
+        Articles similaires classés par pertinence
+        Lus dans l'index précalculé ArticleLie (voir blog/articles_lies.py),
+        repli sur même catégorie / tags communs si l'index est vide
+        """
+        articles = list(self._articles_lies_indexes(limit))
+        if articles:
+            return articles
+        return self._articles_lies_proches(limit)
+
+    async def aget_articles_lies(self, limit=3):
+        """Version async de get_articles_lies() (liste évaluée)"""
+        articles = [article async for article in self._articles_lies_indexes(limit)]
+        if articles:
+            return articles
+        return [article async for article in self._articles_lies_proches(limit)]
+
+    def _articles_lies_indexes(self, limit):
+        return Article.objects.filter(
+            liens_entrants__article=self,
+            statut='publie'
+        ).order_by('liens_entrants__rang').defer(*self.CHAMPS_CONTENU)[:limit]
+
+    def _articles_lies_proches(self, limit):
         return Article.objects.filter(
             statut='publie'
         ).filter(
-            models.Q(categorie=self.categorie) | models.Q(tags__in=self.tags.all())
+            models.Q(categorie=self.categorie_id) | models.Q(tags__in=self.tags.all())
         ).exclude(
             id=self.id
-        ).distinct()[:limit]
+        ).distinct().defer(*self.CHAMPS_CONTENU)[:limit]
 
     @property
     def est_publie(self):
@@ -301,3 +387,73 @@ class Article(models.Model):
             self.statut == 'publie' and
             self.date_publication <= timezone.now()
         )
+
+
+class ArticleLie(models.Model):
+    """
+    Voisin précalculé d'un article (tags, catégorie, similarité TF-IDF)
+    Table maintenue par blog/articles_lies.py, ne pas éditer à la main
+    """
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name='voisins'
+    )
+    article_lie = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name='liens_entrants'
+    )
+    score = models.FloatField()
+    rang = models.PositiveSmallIntegerField()
+
+    class Meta:
+        verbose_name = "Article lié"
+        verbose_name_plural = "Articles liés"
+        ordering = ['article', 'rang']
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'rang'], name='blog_articlelie_article_rang'),
+        ]
+
+    def __str__(self):
+        return f"{self.article} → {self.article_lie} ({self.score:.2f})"
+
+
+class ArticleLieEnAttente(models.Model):
+    """
+    Article dont les voisins sont à recalculer (modifié depuis le dernier
+    passage de calculer_articles_lies --en-attente, voir blog/articles_lies.py)
+    Pas de clé étrangère : un article supprimé reste à traiter
+    """
+    article_id = models.BigIntegerField(primary_key=True)
+    date = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Article lié en attente"
+        verbose_name_plural = "Articles liés en attente"
+
+    def __str__(self):
+        return f"Article {self.article_id} ({self.date:%d/%m/%Y %H:%M})"
+
+
+class ArticleTermes(models.Model):
+    """
+    Termes (racine -> occurrences) du titre, du résumé et du contenu d'un
+    article pour le TF-IDF des articles liés, recalculés quand sa
+    date_modification change (voir blog/articles_lies.py)
+    """
+    article = models.OneToOneField(
+        Article,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+'
+    )
+    date_modification = models.DateTimeField()
+    termes = models.JSONField(default=dict)
+
+    class Meta:
+        verbose_name = "Termes d'un article"
+        verbose_name_plural = "Termes des articles"
+
+    def __str__(self):
+        return f"Termes de l'article {self.article_id}"
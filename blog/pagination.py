@@ -0,0 +1,179 @@
+"""
+Pagination par curseur (keyset / seek) pour les listes d'articles
+Principe :
+- Pas d'OFFSET : la page suivante est lue avec
+  WHERE (date_publication, id) < (dernière date, dernier id)
+  en s'appuyant sur l'index -date_publication
+- Curseurs opaques (?curseur=...) pour page suivante / précédente
+- Nombre total repris des validateurs de la liste (blog/conditionnel.py,
+  déjà compté pour l'ETag) ; à défaut, mis en cache par filtres (vue,
+  catégorie, tag, recherche) : pas de COUNT(DISTINCT) par page
+
+Activation :
+- Par vue : pagination_par_curseur = True
+- Globalement : BLOG_PAGINATION_CURSEUR = True (settings.py)
+- Par requête : présence du paramètre ?curseur= (défilement infini)
+"""
+
+import base64
+import binascii
+import hashlib
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import Http404
+
+# Durée de mise en cache du nombre total d'articles (secondes)
+DUREE_CACHE_NOMBRE = 300
+
+SUIVANT = 's'
+PRECEDENT = 'p'
+
+
+def encoder_curseur(sens, article):
+    """Curseur opaque : sens + (date_publication, id) de l'article pivot"""
+    brut = f'{sens}|{article.date_publication.isoformat()}|{article.pk}'
+    return base64.urlsafe_b64encode(brut.encode()).decode().rstrip('=')
+
+
+def decoder_curseur(curseur):
+    """Retourne (sens, date_publication, id) ou lève Http404"""
+    try:
+        brut = base64.urlsafe_b64decode(curseur + '=' * (-len(curseur) % 4)).decode()
+        sens, date, pk = brut.split('|')
+        if sens not in (SUIVANT, PRECEDENT):
+            raise ValueError(sens)
+        return sens, datetime.fromisoformat(date), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise Http404("Curseur de pagination invalide")
+
+
+class PaginateurCurseur:
+    """
+    Équivalent minimal de django.core.paginator.Paginator
+    (count approximatif, pas de page_range)
+    """
+
+    def __init__(self, queryset, per_page, filtres=(), nombre=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.filtres = filtres
+        self.nombre = nombre
+
+    @property
+    def count(self):
+        """Nombre total connu, sinon mis en cache par filtres (approximatif)"""
+        if self.nombre is not None:
+            return self.nombre
+        # Pas le SQL du queryset : il contient l'instant de la requête (timezone.now())
+        cle = 'blog:nombre:' + hashlib.md5(repr(self.filtres).encode()).hexdigest()
+        return cache.get_or_set(cle, self.queryset.order_by().count, DUREE_CACHE_NOMBRE)
+
+    def page(self, curseur=None):
+        queryset = self.queryset.order_by('-date_publication', '-id')
+        sens = SUIVANT
+
+        if curseur:
+            sens, date, pk = decoder_curseur(curseur)
+            if sens == SUIVANT:
+                queryset = queryset.filter(
+                    Q(date_publication__lt=date) | Q(date_publication=date, id__lt=pk)
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(date_publication__gt=date) | Q(date_publication=date, id__gt=pk)
+                ).order_by('date_publication', 'id')
+
+        # Un élément de plus pour savoir s'il reste une page
+        articles = list(queryset[:self.per_page + 1])
+        encore = len(articles) > self.per_page
+        articles = articles[:self.per_page]
+
+        if sens == PRECEDENT:
+            articles.reverse()
+            return PageCurseur(articles, self, a_precedente=encore, a_suivante=True)
+        return PageCurseur(articles, self, a_precedente=bool(curseur), a_suivante=encore)
+
+
+class PageCurseur:
+    """Page compatible avec les templates (has_next, has_previous, object_list...)"""
+    est_curseur = True
+
+    def __init__(self, object_list, paginator, a_precedente, a_suivante):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._a_precedente = a_precedente and bool(object_list)
+        self._a_suivante = a_suivante and bool(object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._a_suivante
+
+    def has_previous(self):
+        return self._a_precedente
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def curseur_suivant(self):
+        if self.has_next():
+            return encoder_curseur(SUIVANT, self.object_list[-1])
+        return None
+
+    @property
+    def curseur_precedent(self):
+        if self.has_previous():
+            return encoder_curseur(PRECEDENT, self.object_list[0])
+        return None
+
+
+class PaginationCurseurMixin:
+    """
+    Mixin pour ListView : pagination par curseur si activée
+    et si la liste est triée par date (pas pour une recherche classée)
+    """
+    pagination_par_curseur = None
+    # Nombre d'articles de la liste s'il est déjà connu (voir ListeConditionnelleMixin)
+    nombre_articles = None
+    PARAMETRES_FILTRES = ('categorie', 'tag', 'q')
+
+    def utilise_curseur(self, queryset):
+        active = self.pagination_par_curseur
+        if active is None:
+            active = getattr(settings, 'BLOG_PAGINATION_CURSEUR', False)
+        active = active or 'curseur' in self.request.GET
+        # Ordre explicite (ex: pertinence de recherche) : pagination classique
+        return active and not queryset.query.order_by
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.utilise_curseur(queryset):
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = PaginateurCurseur(
+            queryset, page_size, filtres=self.filtres_liste(), nombre=self.nombre_articles
+        )
+        page = paginator.page(self.request.GET.get('curseur'))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def filtres_liste(self):
+        """Ce qui détermine les articles de la liste (clé du nombre total)"""
+        return (
+            type(self).__name__,
+            sorted(self.kwargs.items()),
+            [(nom, self.request.GET.get(nom)) for nom in self.PARAMETRES_FILTRES],
+        )
+
+    def get_paginator(self, queryset, per_page, *args, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, *args, **kwargs)
+        if self.nombre_articles is not None:
+            # Paginator.count est une cached_property : pas de second COUNT
+            paginator.count = self.nombre_articles
+        return paginator
@@ -0,0 +1,187 @@
+"""
+Caches du blog et publications programmées
+Principe :
+- Les pages n'affichent que les articles dont la date de publication est
+  passée : un article programmé apparaît sans aucune écriture en base,
+  aucun signal ne peut invalider les caches à ce moment-là
+- La prochaine publication (plus petite date_publication future parmi les
+  articles publiés) est conservée dans le cache jusqu'à cette date, ou
+  jusqu'à la prochaine modification d'un article (version incrémentée
+  après le commit, voir blog/signals.py)
+- duree_cache() donne la durée de validité d'une entrée : jusqu'à la
+  prochaine publication, sans expiration s'il n'y en a pas ; utilisée
+  par les agrégats, les flux, le plan du site et les pages ci-dessous
+- page_planifiee : cache des pages de liste du blog (liste, catégorie,
+  tag), avec leurs validateurs ETag / Last-Modified ; un client à jour
+  reçoit un 304 sans requête SQL. Clé : chemin et paramètres lus par les
+  vues (PARAMETRES_PAGE, les autres comme ?utm_source= sont ignorés),
+  sans l'hôte (les listes n'affichent pas d'URL absolue) ; conservée au
+  plus DUREE_PAGE même sans publication programmée
+"""
+
+import hashlib
+import math
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.db.models import Min
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date
+
+from aude_web.repliques import invalider_apres_commit
+
+from .models import Article
+
+CLE_VERSION = 'blog:planification:version'
+CLE_VERSION_PAGES = 'blog:pages:version'
+
+# En-têtes de la réponse conservés avec la page
+EN_TETES = ('Content-Type', 'ETag', 'Last-Modified')
+
+# Paramètres d'URL lus par les vues de liste (clé des pages en cache)
+PARAMETRES_PAGE = ('page', 'categorie', 'tag', 'curseur')
+
+# Durée maximale d'une page en cache (secondes)
+DUREE_PAGE = 3600
+
+
+# ---------------------------------------------------------------------------
+# Prochaine publication
+# ---------------------------------------------------------------------------
+
+def _version(cle):
+    return cache.get_or_set(cle, 1, timeout=None)
+
+
+def _incrementer(cle):
+    try:
+        cache.incr(cle)
+    except ValueError:
+        # Pas encore de version : rien à invalider
+        cache.set(cle, 1, timeout=None)
+
+
+def _secondes_avant(date):
+    return max(1, math.ceil((date - timezone.now()).total_seconds()))
+
+
+def prochaine_publication():
+    """Date de la prochaine publication programmée (None s'il n'y en a pas)"""
+    cle = f'blog:planification:{_version(CLE_VERSION)}'
+    entree = cache.get(cle)
+    if entree is None or (entree['date'] is not None and entree['date'] <= timezone.now()):
+        date = Article.objects.filter(
+            statut='publie',
+            date_publication__gt=timezone.now()
+        ).aggregate(date=Min('date_publication'))['date']
+        entree = {'date': date}
+        cache.set(cle, entree, timeout=_secondes_avant(date) if date else None)
+    return entree['date']
+
+
+def duree_cache(maximum=None):
+    """
+    Durée de validité (secondes) d'une entrée de cache qui dépend des
+    articles visibles : jusqu'à la prochaine publication, au plus maximum
+    None : pas d'expiration
+    """
+    date = prochaine_publication()
+    if date is None:
+        return maximum
+    duree = _secondes_avant(date)
+    return duree if maximum is None else min(duree, maximum)
+
+
+def invalider_planification():
+    """Dates de publication ou statuts modifiés : après le commit"""
+    invalider_apres_commit(lambda: _incrementer(CLE_VERSION))
+
+
+# ---------------------------------------------------------------------------
+# Pages de liste
+# ---------------------------------------------------------------------------
+
+def invalider_pages():
+    """Nouvelle version des pages en cache après le commit"""
+    invalider_apres_commit(lambda: _incrementer(CLE_VERSION_PAGES))
+
+
+def _cle_page(request):
+    parametres = [(nom, request.GET.get(nom)) for nom in PARAMETRES_PAGE if nom in request.GET]
+    url = hashlib.md5(repr((request.path, parametres)).encode()).hexdigest()
+    return f'blog:page:{_version(CLE_VERSION_PAGES)}:{url}'
+
+
+def _en_cache_possible(request):
+    # Recherches : trop d'URL différentes pour le cache
+    return request.method in ('GET', 'HEAD') and not request.GET.get('q')
+
+
+def _reponse(request, entree):
+    """304 si le client est à jour, sinon la page en cache"""
+    en_tetes = entree['en_tetes']
+    derniere = en_tetes.get('Last-Modified')
+    response = get_conditional_response(
+        request,
+        etag=en_tetes.get('ETag'),
+        last_modified=parse_http_date(derniere) if derniere else None,
+    )
+    if response is None:
+        response = HttpResponse(entree['contenu'], content_type=en_tetes['Content-Type'])
+    for nom in ('ETag', 'Last-Modified'):
+        if nom in en_tetes:
+            response.headers[nom] = en_tetes[nom]
+    return response
+
+
+def _mettre_en_cache(cle, response):
+    """Conserve la page (après rendu pour une TemplateResponse)"""
+    def conserver(response):
+        if response.status_code == 200 and not response.streaming:
+            cache.set(cle, {
+                'contenu': response.content,
+                'en_tetes': {nom: response.headers[nom] for nom in EN_TETES if nom in response.headers},
+            }, timeout=duree_cache(maximum=DUREE_PAGE))
+
+    if getattr(response, 'is_rendered', True):
+        conserver(response)
+    else:
+        response.add_post_render_callback(conserver)
+
+
+def page_planifiee(vue):
+    """
+    Décorateur de vue de liste : page conservée dans le cache jusqu'à la
+    prochaine modification du blog ou la prochaine publication programmée
+    Usage (urls.py) :
+        path('', page_planifiee(ArticleListView.as_view()), name='article_list')
+    """
+    if iscoroutinefunction(vue):
+        @wraps(vue)
+        async def vue_planifiee(request, *args, **kwargs):
+            if not _en_cache_possible(request):
+                return await vue(request, *args, **kwargs)
+            cle = await sync_to_async(_cle_page)(request)
+            entree = await cache.aget(cle)
+            if entree is not None:
+                return _reponse(request, entree)
+            response = await vue(request, *args, **kwargs)
+            await sync_to_async(_mettre_en_cache)(cle, response)
+            return response
+    else:
+        @wraps(vue)
+        def vue_planifiee(request, *args, **kwargs):
+            if not _en_cache_possible(request):
+                return vue(request, *args, **kwargs)
+            cle = _cle_page(request)
+            entree = cache.get(cle)
+            if entree is not None:
+                return _reponse(request, entree)
+            response = vue(request, *args, **kwargs)
+            _mettre_en_cache(cle, response)
+            return response
+
+    return vue_planifiee
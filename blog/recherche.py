@@ -0,0 +1,311 @@
+"""
+Index de recherche plein texte pour le blog
+Conventions :
+- SQLite : table virtuelle FTS5 blog_article_fts, classement bm25
+- PostgreSQL : table blog_article_recherche (tsvector + index GIN), classement ts_rank_cd
+- Autres moteurs : repli sur titre/resume/contenu__icontains
+- Texte indexé : titre, résumé et contenu sans balises HTML,
+  sans accents et réduit à la racine des mots (racinisation française légère)
+- Tables créées par la migration 0003 (SQL figé), remplies par
+  python manage.py reindexer_recherche puis à chaque sauvegarde ; tant
+  que l'index ne couvre pas tous les articles : repli sur icontains
+- Au plus LIMITE_RESULTATS articles classés : la vue signale une
+  recherche tronquée (voir blog/views.py)
+"""
+
+import html
+import re
+import unicodedata
+
+from django.db import connections, models, router
+from django.db.models import Q
+from django.utils.html import strip_tags
+
+TABLE_SQLITE = 'blog_article_fts'
+TABLE_POSTGRESQL = 'blog_article_recherche'
+
+# Poids des colonnes (titre, résumé, contenu)
+POIDS_BM25 = (10.0, 5.0, 1.0)
+
+# Nombre maximum de résultats classés renvoyés par l'index (signalé par la vue)
+LIMITE_RESULTATS = 500
+
+MOTS_VIDES = frozenset("""
+a au aux avec ce ces dans de des du elle en et eux il ils je la le les leur
+lui ma mais me meme mes moi mon ne nos notre nous on ou par pas pour qu que
+qui sa se ses son sur ta te tes toi ton tu un une vos votre vous c d j l m n
+s t y est sont ete etre avoir a ont plus
+""".split())
+
+# Suffixes retirés par la racinisation (du plus long au plus court)
+SUFFIXES = (
+    'issement', 'atrice', 'ateur', 'ation', 'ement', 'ment', 'ique', 'able',
+    'iste', 'isme', 'euse', 'eur', 'ite', 'ive', 'if', 'ee', 'er', 'ez', 'e',
+)
+
+
+def texte_brut(contenu_html):
+    """Texte lisible d'un contenu HTML (balises retirées, entités décodées)"""
+    # Espace avant chaque balise : "</p><p>" ne doit pas coller deux mots
+    texte = html.unescape(strip_tags((contenu_html or '').replace('<', ' <')))
+    return ' '.join(texte.split())
+
+
+def normaliser(texte):
+    """Minuscules sans accents (é -> e, ç -> c)"""
+    decompose = unicodedata.normalize('NFKD', texte.lower())
+    return ''.join(c for c in decompose if not unicodedata.combining(c))
+
+
+def raciniser(mot):
+    """
+    Racinisation française légère : pluriel puis un suffixe
+    chantiers -> chantier -> chanti, innovations -> innovation -> innov
+    """
+    if len(mot) <= 4:
+        return mot
+
+    if mot.endswith('aux') and len(mot) > 5:
+        mot = mot[:-3] + 'al'
+    elif mot.endswith(('s', 'x')):
+        mot = mot[:-1]
+
+    for suffixe in SUFFIXES:
+        if mot.endswith(suffixe) and len(mot) - len(suffixe) >= 3:
+            return mot[:-len(suffixe)]
+    return mot
+
+
+def termes(texte):
+    """Liste des racines indexables d'un texte"""
+    return [
+        raciniser(mot)
+        for mot in re.findall(r'\w+', normaliser(texte))
+        if mot not in MOTS_VIDES
+    ]
+
+
+def document(article):
+    """Colonnes indexées (titre, résumé, contenu) d'un article"""
+    return (
+        ' '.join(termes(article.titre)),
+        ' '.join(termes(article.resume)),
+        ' '.join(termes(texte_brut(article.contenu))),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Moteurs
+# ---------------------------------------------------------------------------
+
+class IndexSQLite:
+    """Table virtuelle FTS5 (rowid = id de l'article)"""
+
+    @staticmethod
+    def indexer(cursor, article_id, colonnes):
+        cursor.execute(f"DELETE FROM {TABLE_SQLITE} WHERE rowid = %s", [article_id])
+        cursor.execute(
+            f"INSERT INTO {TABLE_SQLITE} (rowid, titre, resume, contenu) VALUES (%s, %s, %s, %s)",
+            [article_id, *colonnes]
+        )
+
+    @staticmethod
+    def supprimer(cursor, article_id):
+        cursor.execute(f"DELETE FROM {TABLE_SQLITE} WHERE rowid = %s", [article_id])
+
+    @staticmethod
+    def vider(cursor):
+        cursor.execute(f"DELETE FROM {TABLE_SQLITE}")
+
+    @staticmethod
+    def compter(cursor):
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE_SQLITE}")
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def rechercher(cursor, racines, limite):
+        expression = ' '.join(f'"{racine}"*' for racine in racines)
+        cursor.execute(
+            f"SELECT rowid FROM {TABLE_SQLITE} WHERE {TABLE_SQLITE} MATCH %s "
+            f"ORDER BY bm25({TABLE_SQLITE}, %s, %s, %s) LIMIT %s",
+            [expression, *POIDS_BM25, limite]
+        )
+        return [ligne[0] for ligne in cursor.fetchall()]
+
+
+class IndexPostgreSQL:
+    """Table tsvector pondérée (A = titre, B = résumé, C = contenu)"""
+
+    @staticmethod
+    def indexer(cursor, article_id, colonnes):
+        cursor.execute(
+            f"INSERT INTO {TABLE_POSTGRESQL} (article_id, document) VALUES (%s, "
+            f"setweight(to_tsvector('simple', %s), 'A') || "
+            f"setweight(to_tsvector('simple', %s), 'B') || "
+            f"setweight(to_tsvector('simple', %s), 'C')) "
+            f"ON CONFLICT (article_id) DO UPDATE SET document = EXCLUDED.document",
+            [article_id, *colonnes]
+        )
+
+    @staticmethod
+    def supprimer(cursor, article_id):
+        cursor.execute(f"DELETE FROM {TABLE_POSTGRESQL} WHERE article_id = %s", [article_id])
+
+    @staticmethod
+    def vider(cursor):
+        cursor.execute(f"DELETE FROM {TABLE_POSTGRESQL}")
+
+    @staticmethod
+    def compter(cursor):
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE_POSTGRESQL}")
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def rechercher(cursor, racines, limite):
+        expression = ' & '.join(f'{racine}:*' for racine in racines)
+        cursor.execute(
+            f"SELECT article_id FROM {TABLE_POSTGRESQL}, to_tsquery('simple', %s) requete "
+            f"WHERE document @@ requete ORDER BY ts_rank_cd(document, requete) DESC LIMIT %s",
+            [expression, limite]
+        )
+        return [ligne[0] for ligne in cursor.fetchall()]
+
+
+MOTEURS = {
+    'sqlite': IndexSQLite,
+    'postgresql': IndexPostgreSQL,
+}
+
+TABLES = {
+    'sqlite': TABLE_SQLITE,
+    'postgresql': TABLE_POSTGRESQL,
+}
+
+_disponibilite = {}
+
+# Bases dont l'index couvre tous les articles (reindexer_recherche lancé)
+_complets = set()
+
+
+def get_moteur(alias):
+    """
+    Moteur d'index pour la base donnée, ou None si l'index n'existe pas
+    (moteur non supporté, FTS5 absent, migration non appliquée)
+    """
+    if alias not in _disponibilite:
+        connection = connections[alias]
+        table = TABLES.get(connection.vendor)
+        if table is None:
+            _disponibilite[alias] = None
+        else:
+            tables = connection.introspection.table_names()
+            _disponibilite[alias] = MOTEURS[connection.vendor] if table in tables else None
+    return _disponibilite[alias]
+
+
+def oublier_moteurs():
+    """Après migrate : tables d'index créées ou supprimées"""
+    _disponibilite.clear()
+    _complets.clear()
+
+
+def index_complet(moteur, modele, alias):
+    """
+    L'index contient-il tous les articles ? Faux juste après la migration
+    0003 (table vide) : vérifié à chaque recherche jusqu'à ce qu'il le soit,
+    ensuite tenu à jour par les signaux
+    """
+    if alias not in _complets:
+        with connections[alias].cursor() as cursor:
+            indexes = moteur.compter(cursor)
+        if indexes < modele._base_manager.using(alias).count():
+            return False
+        _complets.add(alias)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Synchronisation
+# ---------------------------------------------------------------------------
+
+def _alias(modele):
+    return router.db_for_write(modele)
+
+
+def indexer_article(article):
+    """Ajoute ou remplace un article dans l'index"""
+    alias = _alias(type(article))
+    moteur = get_moteur(alias)
+    if moteur is None:
+        return
+    with connections[alias].cursor() as cursor:
+        moteur.indexer(cursor, article.pk, document(article))
+
+
+def desindexer_article(article):
+    """Retire un article de l'index"""
+    alias = _alias(type(article))
+    moteur = get_moteur(alias)
+    if moteur is None:
+        return
+    with connections[alias].cursor() as cursor:
+        moteur.supprimer(cursor, article.pk)
+
+
+def reconstruire_index(articles, alias):
+    """
+    Vide puis remplit l'index avec les articles donnés
+    Retourne le nombre d'articles indexés
+    """
+    moteur = get_moteur(alias)
+    if moteur is None:
+        return 0
+
+    total = 0
+    with connections[alias].cursor() as cursor:
+        moteur.vider(cursor)
+        for article in articles:
+            moteur.indexer(cursor, article.pk, document(article))
+            total += 1
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Recherche
+# ---------------------------------------------------------------------------
+
+def filtre_icontains(requete):
+    """Ancien filtre (balayage complet de la table)"""
+    return (
+        Q(titre__icontains=requete) |
+        Q(resume__icontains=requete) |
+        Q(contenu__icontains=requete)
+    )
+
+
+def rechercher(queryset, requete):
+    """
+    Filtre le queryset sur la requête et le trie par pertinence
+    Retourne (queryset, tronquée) : tronquée si l'index a renvoyé
+    LIMITE_RESULTATS articles (les suivants, moins pertinents, sont omis)
+    """
+    moteur = get_moteur(queryset.db)
+    racines = termes(requete)
+
+    if moteur is None or not racines or not index_complet(moteur, queryset.model, queryset.db):
+        return queryset.filter(filtre_icontains(requete)), False
+
+    with connections[queryset.db].cursor() as cursor:
+        ids = moteur.rechercher(cursor, racines, LIMITE_RESULTATS)
+
+    if not ids:
+        return queryset.none(), False
+
+    pertinence = models.Case(
+        *[models.When(pk=pk, then=models.Value(rang)) for rang, pk in enumerate(ids)],
+        output_field=models.IntegerField(),
+    )
+    queryset = queryset.filter(pk__in=ids).annotate(
+        rang_recherche=pertinence
+    ).order_by('rang_recherche')
+    return queryset, len(ids) == LIMITE_RESULTATS
@@ -0,0 +1,313 @@
+"""
+Rendu du contenu des articles (HTML CKEditor -> HTML publié)
+Principe :
+- Calculé une fois dans Article.save() et stocké (contenu_html,
+  table_des_matieres) : la page de détail affiche le HTML stocké sans
+  aucun traitement par requête
+- Nettoyage par liste blanche (balises, attributs, propriétés CSS,
+  schémas d'URL) : scripts, styles, formulaires et gestionnaires
+  d'événements sont retirés, les balises inconnues gardent leur texte
+- <img> et <iframe> : loading="lazy" ; <img> : decoding="async"
+- Images envoyées (MEDIA_URL) : remplacées par un <picture> vers leurs
+  variantes AVIF / WebP / JPEG avec width / height (website/images.py),
+  générées à la sauvegarde quel que soit IMAGES_RESPONSIVES['GENERATION']
+- Iframes limitées aux hôtes de IFRAMES (vidéos)
+- Titres du sommaire : ancre (id) unique tirée du texte, table des
+  matières [{'niveau': 2, 'ancre': '...', 'titre': '...'}, ...]
+- Articles d'avant la migration 0005 : rendus à leur première lecture
+  (Article.completer_rendu) ; tous d'un coup ou après un changement des
+  règles : python manage.py rendre_articles
+
+Configuration (settings.py) :
+    BLOG_RENDU = {
+        'IFRAMES': ('www.youtube.com', 'www.youtube-nocookie.com', 'player.vimeo.com'),
+        'SIZES': '(min-width: 992px) 83vw, 100vw',
+        'SOMMAIRE': (2, 3),
+    }
+"""
+
+import posixpath
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.utils.text import slugify
+
+from website.images import derives_du_media, repli, srcset
+
+CONFIGURATION_PAR_DEFAUT = {
+    'IFRAMES': ('www.youtube.com', 'www.youtube-nocookie.com', 'player.vimeo.com'),
+    'SIZES': '(min-width: 992px) 83vw, 100vw',
+    'SOMMAIRE': (2, 3),
+}
+
+BALISES = frozenset("""
+a abbr b blockquote br caption cite code col colgroup dd del div dl dt em
+figcaption figure h1 h2 h3 h4 h5 h6 hr i iframe img ins kbd li mark ol p pre
+q s small span strike strong sub sup table tbody td tfoot th thead tr u ul
+""".split())
+
+# Éléments sans balise fermante
+BALISES_VIDES = frozenset("""
+area base br col embed frame hr img input link meta param source track wbr
+""".split())
+
+# Retirées avec leur contenu
+BALISES_INTERDITES = frozenset("""
+button embed form frame frameset input noscript object script select style
+svg math template textarea title
+""".split())
+
+ATTRIBUTS_COMMUNS = frozenset({'class', 'dir', 'id', 'lang', 'style', 'title'})
+
+ATTRIBUTS = {
+    'a': {'href', 'name', 'rel', 'target'},
+    'col': {'span'},
+    'colgroup': {'span'},
+    'iframe': {'allow', 'allowfullscreen', 'frameborder', 'height', 'src', 'width'},
+    'img': {'alt', 'height', 'src', 'width'},
+    'ol': {'reversed', 'start', 'type'},
+    'table': {'border', 'cellpadding', 'cellspacing', 'summary'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+}
+
+ATTRIBUTS_URL = frozenset({'href', 'src'})
+
+SCHEMAS = frozenset({'', 'http', 'https', 'mailto', 'tel'})
+
+# Propriétés produites par CKEditor (alignement, taille des images, tableaux)
+PROPRIETES_CSS = frozenset("""
+background-color border border-collapse border-color border-style
+border-width color float font-style font-weight height list-style-type
+margin margin-bottom margin-left margin-right margin-top padding text-align
+text-decoration vertical-align width
+""".split())
+
+VALEUR_CSS_INTERDITE = re.compile(r'url\s*\(|expression|javascript:|[\\<>]', re.IGNORECASE)
+
+# Formats déclinés (GIF animés et SVG gardés tels quels)
+EXTENSIONS_DERIVEES = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def configuration():
+    return {**CONFIGURATION_PAR_DEFAUT, **getattr(settings, 'BLOG_RENDU', {})}
+
+
+def _url_autorisee(url):
+    # Caractères de contrôle et espaces ignorés par les navigateurs ("java\tscript:")
+    nettoyee = re.sub(r'[\x00-\x20]', '', url)
+    try:
+        return urlsplit(nettoyee).scheme.lower() in SCHEMAS
+    except ValueError:
+        return False
+
+
+def _style(valeur):
+    """Déclarations CSS autorisées (les autres sont retirées)"""
+    declarations = []
+    for declaration in valeur.split(';'):
+        propriete, _, contenu = declaration.partition(':')
+        propriete, contenu = propriete.strip().lower(), contenu.strip()
+        if propriete in PROPRIETES_CSS and contenu and not VALEUR_CSS_INTERDITE.search(contenu):
+            declarations.append(f'{propriete}: {contenu}')
+    return '; '.join(declarations)
+
+
+def _attributs(attributs):
+    return ''.join(
+        f' {nom}' if valeur is None else f' {nom}="{escape(valeur)}"'
+        for nom, valeur in attributs.items()
+    )
+
+
+def _nom_media(url):
+    """Nom dans MEDIA_ROOT d'une URL d'image envoyée (None sinon)"""
+    prefixe = '/' + settings.MEDIA_URL.lstrip('/')
+    morceaux = urlsplit(url)
+    if morceaux.scheme or morceaux.netloc or not morceaux.path.startswith(prefixe):
+        return None
+    nom = posixpath.normpath(unquote(morceaux.path[len(prefixe):]))
+    if nom.startswith('..') or not nom.lower().endswith(EXTENSIONS_DERIVEES):
+        return None
+    return nom
+
+
+class RenduContenu(HTMLParser):
+    """Analyse du HTML CKEditor et reconstruction du HTML publié"""
+
+    def __init__(self, conf):
+        super().__init__(convert_charrefs=True)
+        self.conf = conf
+        self.sortie = []
+        self.ouvertes = []
+        self.ignoree = None
+        self.profondeur_ignoree = 0
+        self.ancres = set()
+        self.sommaire = []
+        # Titre en cours : (balise, position de la balise ouvrante, attributs, texte)
+        self.titre = None
+
+    # -- Balises -----------------------------------------------------------
+
+    def handle_starttag(self, balise, attrs):
+        if self.ignoree is not None:
+            self.profondeur_ignoree += balise == self.ignoree
+            return
+        if balise in BALISES_INTERDITES:
+            if balise not in BALISES_VIDES:
+                self.ignoree, self.profondeur_ignoree = balise, 1
+            return
+        if balise not in BALISES:
+            # Balise inconnue : seul son texte est conservé
+            return
+
+        attributs = self._filtrer(balise, attrs)
+        if attributs is None:
+            if balise == 'iframe':
+                self.ignoree, self.profondeur_ignoree = balise, 1
+            return
+
+        if balise == 'img':
+            self.sortie.append(self._image(attributs))
+            return
+        if balise == 'iframe':
+            attributs.setdefault('loading', 'lazy')
+        elif balise == 'a' and attributs.get('target') == '_blank':
+            rel = set((attributs.get('rel') or '').split())
+            attributs['rel'] = ' '.join(sorted(rel | {'noopener', 'noreferrer'}))
+        elif self._niveau(balise) in self.conf['SOMMAIRE'] and self.titre is None:
+            self.titre = (balise, len(self.sortie), attributs, [])
+
+        self.sortie.append(f'<{balise}{_attributs(attributs)}>')
+        if balise not in BALISES_VIDES:
+            self.ouvertes.append(balise)
+
+    def handle_startendtag(self, balise, attrs):
+        self.handle_starttag(balise, attrs)
+        if balise not in BALISES_VIDES:
+            self.handle_endtag(balise)
+
+    def handle_endtag(self, balise):
+        if self.ignoree is not None:
+            if balise == self.ignoree:
+                self.profondeur_ignoree -= 1
+                if not self.profondeur_ignoree:
+                    self.ignoree = None
+            return
+        if balise not in self.ouvertes:
+            return
+        # Balises restées ouvertes à l'intérieur : fermées au passage
+        while self.ouvertes:
+            ouverte = self.ouvertes.pop()
+            self._fermer(ouverte)
+            if ouverte == balise:
+                break
+
+    def handle_data(self, texte):
+        if self.ignoree is not None:
+            return
+        if self.titre is not None:
+            self.titre[3].append(texte)
+        self.sortie.append(escape(texte, quote=False))
+
+    def close(self):
+        super().close()
+        while self.ouvertes:
+            self._fermer(self.ouvertes.pop())
+
+    def _fermer(self, balise):
+        self.sortie.append(f'</{balise}>')
+        if self.titre is not None and self.titre[0] == balise:
+            self._ancrer()
+
+    # -- Attributs ---------------------------------------------------------
+
+    def _filtrer(self, balise, attrs):
+        """Attributs autorisés ; None si la balise doit être retirée"""
+        autorises = ATTRIBUTS_COMMUNS | ATTRIBUTS.get(balise, set())
+        attributs = {}
+        for nom, valeur in attrs:
+            if nom not in autorises:
+                continue
+            if nom in ATTRIBUTS_URL:
+                if valeur is None or not _url_autorisee(valeur):
+                    continue
+            elif nom == 'style':
+                valeur = _style(valeur or '')
+                if not valeur:
+                    continue
+            attributs[nom] = valeur
+
+        if balise == 'img' and not attributs.get('src'):
+            return None
+        if balise == 'iframe':
+            hote = urlsplit(attributs.get('src', '')).hostname
+            if not attributs.get('src', '').startswith('https://') or hote not in self.conf['IFRAMES']:
+                return None
+        if 'id' in attributs:
+            self.ancres.add(attributs['id'])
+        return attributs
+
+    # -- Images ------------------------------------------------------------
+
+    def _image(self, attributs):
+        attributs.setdefault('alt', '')
+        attributs.setdefault('loading', 'lazy')
+        attributs['decoding'] = 'async'
+
+        nom = _nom_media(attributs['src'])
+        index = derives_du_media(nom) if nom else None
+        if not index:
+            return f'<img{_attributs(attributs)}>'
+
+        variantes = index['variantes']
+        attributs['src'] = repli(variantes)
+        attributs['srcset'] = srcset(variantes['jpg'])
+        attributs['sizes'] = self.conf['SIZES']
+        # Dimensions choisies dans l'éditeur conservées, sinon celles de l'original
+        if 'width' not in attributs and 'height' not in attributs:
+            attributs['width'], attributs['height'] = str(index['largeur']), str(index['hauteur'])
+        sources = ''.join(
+            f'<source type="image/{extension}" srcset="{escape(srcset(liste))}" '
+            f'sizes="{escape(self.conf["SIZES"])}">'
+            for extension, liste in variantes.items() if extension != 'jpg'
+        )
+        return f'<picture>{sources}<img{_attributs(attributs)}></picture>'
+
+    # -- Sommaire ----------------------------------------------------------
+
+    @staticmethod
+    def _niveau(balise):
+        if len(balise) == 2 and balise[0] == 'h' and balise[1].isdigit():
+            return int(balise[1])
+        return None
+
+    def _ancrer(self):
+        balise, position, attributs, morceaux = self.titre
+        self.titre = None
+        texte = ' '.join(''.join(morceaux).split())
+        if not texte:
+            return
+
+        ancre = attributs.get('id')
+        if not ancre:
+            base = slugify(texte) or 'section'
+            ancre, numero = base, 1
+            while ancre in self.ancres:
+                numero += 1
+                ancre = f'{base}-{numero}'
+            self.ancres.add(ancre)
+            attributs['id'] = ancre
+            self.sortie[position] = f'<{balise}{_attributs(attributs)}>'
+        self.sommaire.append({'niveau': self._niveau(balise), 'ancre': ancre, 'titre': texte})
+
+
+def rendre(contenu):
+    """HTML publié et table des matières d'un contenu CKEditor"""
+    rendu = RenduContenu(configuration())
+    rendu.feed(contenu or '')
+    rendu.close()
+    return ''.join(rendu.sortie), rendu.sommaire
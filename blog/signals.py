@@ -0,0 +1,252 @@
+"""
+Signaux du blog
+Conventions :
+- Un récepteur par responsabilité (index de recherche, caches...)
+- Enregistrés au démarrage via BlogConfig.ready()
+- articles_mis_a_jour : envoyé après un queryset.update() sur des articles
+  (actions de l'admin), qui n'envoie pas post_save ; mêmes invalidations
+  qu'une sauvegarde
+"""
+
+from django.conf import settings
+from django.db.models.signals import post_migrate, post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import Signal, receiver
+
+from aude_web import plan_du_site
+from website.images import generer_a_l_envoi
+
+from .models import Article, ArticleLie, Auteur, Categorie, Tag
+from . import agregats, articles_lies, flux, fragments, planification, recherche, sitemaps
+
+# Arguments : ids (articles modifiés par queryset.update())
+articles_mis_a_jour = Signal()
+
+
+@receiver(post_save, sender=Article, dispatch_uid='blog_indexer_article')
+def indexer_article(sender, instance, raw=False, **kwargs):
+    """Mettre à jour l'index plein texte après chaque sauvegarde"""
+    if raw:
+        return
+    recherche.indexer_article(instance)
+
+
+@receiver(post_delete, sender=Article, dispatch_uid='blog_desindexer_article')
+def desindexer_article(sender, instance, **kwargs):
+    """Retirer l'article supprimé de l'index plein texte"""
+    recherche.desindexer_article(instance)
+
+
+@receiver(post_migrate, dispatch_uid='blog_oublier_moteurs')
+def oublier_moteurs(sender, **kwargs):
+    """Tables d'index créées ou supprimées par la migration 0003"""
+    recherche.oublier_moteurs()
+
+
+@receiver(post_save, sender=Article, dispatch_uid='blog_articles_lies_save')
+def articles_lies_apres_sauvegarde(sender, instance, raw=False, **kwargs):
+    """Recalculer les voisins concernés après le commit"""
+    if raw:
+        return
+    articles_lies.planifier_mise_a_jour([instance.pk])
+
+
+@receiver(articles_mis_a_jour, sender=Article, dispatch_uid='blog_articles_lies_update')
+def articles_lies_apres_mise_a_jour(sender, ids, **kwargs):
+    articles_lies.planifier_mise_a_jour(ids)
+
+
+@receiver(pre_delete, sender=Article, dispatch_uid='blog_articles_lies_delete')
+def articles_lies_avant_suppression(sender, instance, **kwargs):
+    """Les articles qui citaient l'article supprimé perdent un voisin"""
+    citant = ArticleLie.objects.filter(article_lie=instance).values_list('article_id', flat=True)
+    articles_lies.planifier_mise_a_jour([instance.pk, *citant])
+
+
+@receiver(m2m_changed, sender=Article.tags.through, dispatch_uid='blog_articles_lies_tags')
+def articles_lies_apres_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    """Les tags comptent dans le score : recalcul après modification"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # tag.articles.add(...) : pk_set contient les articles (None pour clear)
+        ids = pk_set or []
+    else:
+        ids = [instance.pk]
+    articles_lies.planifier_mise_a_jour(ids)
+
+
+def invalider_agregats(sender, raw=False, update_fields=None, **kwargs):
+    """Compteurs, tags populaires ou article en vedette modifiés"""
+    if raw or update_fields == frozenset({'last_login'}):
+        return
+    agregats.invalider_agregats()
+
+
+def invalider_agregats_tags(sender, action, **kwargs):
+    """Ajout ou retrait de tags : compteurs des tags modifiés"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        agregats.invalider_agregats()
+
+
+# Nom et prénom de l'auteur de l'article en vedette : modèle utilisateur
+for modele in ('blog.Article', 'blog.Categorie', 'blog.Tag', 'blog.Auteur', settings.AUTH_USER_MODEL):
+    for nom, signal in (('save', post_save), ('delete', post_delete)):
+        signal.connect(
+            invalider_agregats,
+            sender=modele,
+            dispatch_uid=f'blog_agregats_{nom}_{modele.lower()}',
+        )
+articles_mis_a_jour.connect(invalider_agregats, sender=Article, dispatch_uid='blog_agregats_update')
+m2m_changed.connect(
+    invalider_agregats_tags,
+    sender=Article.tags.through,
+    dispatch_uid='blog_agregats_tags',
+)
+
+
+def invalider_flux(sender, raw=False, update_fields=None, **kwargs):
+    """Titre, résumé, auteur, catégorie ou publication d'un article modifiés"""
+    if raw or update_fields == frozenset({'last_login'}):
+        return
+    flux.invalider_flux()
+
+
+def invalider_flux_tags(sender, action, **kwargs):
+    """Les flux par tag dépendent des tags de chaque article"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        flux.invalider_flux()
+
+
+# Nom et prénom de l'auteur : modèle utilisateur
+for modele in ('blog.Article', 'blog.Categorie', 'blog.Tag', 'blog.Auteur', settings.AUTH_USER_MODEL):
+    for nom, signal in (('save', post_save), ('delete', post_delete)):
+        signal.connect(
+            invalider_flux,
+            sender=modele,
+            dispatch_uid=f'blog_flux_{nom}_{modele.lower()}',
+        )
+articles_mis_a_jour.connect(invalider_flux, sender=Article, dispatch_uid='blog_flux_update')
+m2m_changed.connect(
+    invalider_flux_tags,
+    sender=Article.tags.through,
+    dispatch_uid='blog_flux_tags',
+)
+
+
+def invalider_planification(sender, raw=False, **kwargs):
+    """Statut ou date de publication d'un article modifiés"""
+    if raw:
+        return
+    planification.invalider_planification()
+
+
+def invalider_pages(sender, raw=False, update_fields=None, **kwargs):
+    """Pages de liste en cache (articles, catégories, tags, auteurs affichés)"""
+    if raw or update_fields == frozenset({'last_login'}):
+        return
+    planification.invalider_pages()
+
+
+def invalider_pages_tags(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        planification.invalider_pages()
+
+
+for nom, signal in (('save', post_save), ('delete', post_delete)):
+    signal.connect(
+        invalider_planification,
+        sender=Article,
+        dispatch_uid=f'blog_planification_{nom}_article',
+    )
+    # Nom et prénom de l'auteur : modèle utilisateur
+    for modele in ('blog.Article', 'blog.Categorie', 'blog.Tag', 'blog.Auteur', settings.AUTH_USER_MODEL):
+        signal.connect(
+            invalider_pages,
+            sender=modele,
+            dispatch_uid=f'blog_pages_{nom}_{modele.lower()}',
+        )
+articles_mis_a_jour.connect(
+    invalider_planification,
+    sender=Article,
+    dispatch_uid='blog_planification_update',
+)
+articles_mis_a_jour.connect(invalider_pages, sender=Article, dispatch_uid='blog_pages_update')
+m2m_changed.connect(
+    invalider_pages_tags,
+    sender=Article.tags.through,
+    dispatch_uid='blog_pages_tags',
+)
+
+
+def invalider_fragments(sender, raw=False, update_fields=None, **kwargs):
+    """Catégorie, tag ou auteur affichés dans les fragments de leurs articles"""
+    if raw or update_fields == frozenset({'last_login'}):
+        # Connexion d'un utilisateur : rien d'affiché ne change
+        return
+    fragments.invalider_fragments()
+
+
+for nom, signal in (('save', post_save), ('delete', post_delete)):
+    # Nom et prénom de l'auteur : modèle utilisateur
+    for modele in ('blog.Categorie', 'blog.Tag', 'blog.Auteur', settings.AUTH_USER_MODEL):
+        signal.connect(
+            invalider_fragments,
+            sender=modele,
+            dispatch_uid=f'blog_fragments_{nom}_{modele.lower()}',
+        )
+
+
+def invalider_plan_article(sender, instance, raw=False, **kwargs):
+    """Tranche de l'article dans le plan du site (et lastmod des tags)"""
+    if raw:
+        return
+    sitemaps.invalider_articles([instance.pk])
+
+
+def invalider_plan_mise_a_jour(sender, ids, **kwargs):
+    sitemaps.invalider_articles(ids)
+
+
+def invalider_plan_taxonomie(sender, instance, raw=False, **kwargs):
+    """Tranche de la catégorie ou du tag modifié"""
+    if raw:
+        return
+    section = sitemaps.CategorieSitemap if sender is Categorie else sitemaps.TagSitemap
+    plan_du_site.invalider(section.section, section.tranche_de(instance.pk))
+
+
+def invalider_plan_tags(sender, action, **kwargs):
+    """Tags d'un article modifiés : tags listés et lastmod"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        plan_du_site.invalider(sitemaps.TagSitemap.section)
+
+
+for nom, signal in (('save', post_save), ('delete', post_delete)):
+    signal.connect(invalider_plan_article, sender=Article, dispatch_uid=f'blog_plan_{nom}_article')
+    for modele in (Categorie, Tag):
+        signal.connect(
+            invalider_plan_taxonomie,
+            sender=modele,
+            dispatch_uid=f'blog_plan_{nom}_{modele._meta.model_name}',
+        )
+articles_mis_a_jour.connect(invalider_plan_mise_a_jour, sender=Article, dispatch_uid='blog_plan_update')
+m2m_changed.connect(
+    invalider_plan_tags,
+    sender=Article.tags.through,
+    dispatch_uid='blog_plan_tags',
+)
+
+
+# Variantes responsives générées à l'envoi des images
+post_save.connect(
+    generer_a_l_envoi('image_couverture'),
+    sender=Article,
+    weak=False,
+    dispatch_uid='blog_images_article',
+)
+post_save.connect(
+    generer_a_l_envoi('photo'),
+    sender=Auteur,
+    weak=False,
+    dispatch_uid='blog_images_auteur',
+)
@@ -0,0 +1,75 @@
+"""
+Sections du plan du site pour le blog (voir aude_web/plan_du_site.py)
+- Articles publiés et visibles, lastmod = date_modification
+- Catégories, lastmod = date_modification
+- Tags, lastmod = dernière modification de leurs articles visibles
+"""
+
+from django.db.models import Max
+from django.urls import reverse
+from django.utils import timezone
+
+from aude_web.plan_du_site import SitemapParTranches, invalider
+
+from .models import Article, Categorie, Tag
+from .planification import duree_cache
+
+
+class ArticleSitemap(SitemapParTranches):
+    section = 'articles'
+
+    def objets(self):
+        return Article.objects.filter(
+            statut='publie',
+            date_publication__lte=timezone.now()
+        ).only('slug', 'date_modification')
+
+    def lastmod(self, article):
+        return article.date_modification
+
+    def duree_cache(self):
+        # Un article programmé apparaît sans modification en base
+        return duree_cache()
+
+
+class CategorieSitemap(SitemapParTranches):
+    section = 'categories'
+
+    def objets(self):
+        return Categorie.objects.only('slug', 'date_modification')
+
+    def lastmod(self, categorie):
+        return categorie.date_modification
+
+
+class TagSitemap(SitemapParTranches):
+    section = 'tags'
+
+    def objets(self):
+        # Jointure filtrée : les agrégats ne portent que sur les articles visibles
+        return Tag.objects.filter(
+            articles__statut='publie',
+            articles__date_publication__lte=timezone.now()
+        ).only('slug')
+
+    def items(self):
+        return super().items().annotate(derniere_modification=self.expression_lastmod())
+
+    def expression_lastmod(self):
+        return Max('articles__date_modification')
+
+    def location(self, tag):
+        return reverse('blog:tag_detail', kwargs={'slug': tag.slug})
+
+    def lastmod(self, tag):
+        return tag.derniere_modification
+
+    def duree_cache(self):
+        return duree_cache()
+
+
+def invalider_articles(ids):
+    """Tranches des articles donnés et tags (lastmod, tags sans article visible)"""
+    for tranche in {ArticleSitemap.tranche_de(pk) for pk in ids}:
+        invalider(ArticleSitemap.section, tranche)
+    invalider(TagSitemap.section)
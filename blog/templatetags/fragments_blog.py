@@ -0,0 +1,92 @@
+"""
+Fragments d'article mis en cache (voir blog/fragments.py)
+
+Usage :
+    {% load fragments_blog %}
+    {% fragment_article article 'carte' %}
+        <h4>{{ article.titre }}</h4>
+        {% hors_cache %}{{ article.vues }} vues{% fin_hors_cache %}
+        <p>{{ article.resume }}</p>
+    {% endfragment_article %}
+
+Le fragment est rendu une fois par version de l'article ; les parties
+hors_cache sont rendues à chaque affichage et insérées à leur place.
+"""
+
+import os
+
+from django import template
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+
+from blog import fragments
+
+register = template.Library()
+
+
+class FragmentArticleNode(template.Node):
+
+    def __init__(self, article, nom, en_cache, hors_cache, source):
+        self.article = article
+        self.nom = nom
+        # Parties en cache et parties vivantes alternées :
+        # en_cache[0] hors_cache[0] en_cache[1] ... en_cache[-1]
+        self.en_cache = en_cache
+        self.hors_cache = hors_cache
+        self.source = source
+
+    def render(self, context):
+        article = self.article.resolve(context)
+        if article is None or article.pk is None:
+            statiques = [partie.render(context) for partie in self.en_cache]
+            return mark_safe(''.join(self._entrelacer(statiques, context)))
+
+        # Une lecture de la version par rendu de template
+        if fragments.CLE_VERSION not in context.render_context:
+            context.render_context[fragments.CLE_VERSION] = fragments.version()
+        cle = fragments.cle_fragment(
+            context.render_context[fragments.CLE_VERSION],
+            self.nom.resolve(context),
+            article,
+            self.source,
+        )
+
+        statiques = cache.get(cle)
+        if statiques is None:
+            statiques = [partie.render(context) for partie in self.en_cache]
+            cache.set(cle, statiques, timeout=fragments.DUREE)
+        return mark_safe(''.join(self._entrelacer(statiques, context)))
+
+    def _entrelacer(self, statiques, context):
+        for statique, partie in zip(statiques, self.hors_cache):
+            yield statique
+            yield partie.render(context)
+        yield statiques[-1]
+
+
+@register.tag
+def fragment_article(parser, token):
+    morceaux = token.split_contents()
+    if len(morceaux) != 3:
+        raise template.TemplateSyntaxError(
+            f"{morceaux[0]} attend un article et un nom de fragment"
+        )
+
+    en_cache, hors_cache = [], []
+    while True:
+        en_cache.append(parser.parse(('hors_cache', 'endfragment_article')))
+        if parser.next_token().contents == 'endfragment_article':
+            break
+        hors_cache.append(parser.parse(('fin_hors_cache',)))
+        parser.delete_first_token()
+
+    # Template modifié (déploiement) : nouvelles clés
+    origine = parser.origin.name if parser.origin else None
+    modification = os.path.getmtime(origine) if origine and os.path.exists(origine) else None
+    return FragmentArticleNode(
+        parser.compile_filter(morceaux[1]),
+        parser.compile_filter(morceaux[2]),
+        en_cache,
+        hors_cache,
+        source=(origine, modification, token.lineno),
+    )
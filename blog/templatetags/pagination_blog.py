@@ -0,0 +1,40 @@
+"""
+Liens de pagination des listes du blog
+
+Usage :
+    {% load pagination_blog %}
+    <a href="{% url_page page_obj.next_page_number %}">Suivant</a>
+
+Les pages suivantes ont un chemin (/blog/page/2/) et non un paramètre
+(?page=2) : l'export statique les écrit en fichiers (voir website/export.py).
+Les filtres de la liste (catégorie, tag, recherche) sont repris en paramètres.
+"""
+
+from django import template
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from blog.pagination import PaginationCurseurMixin
+
+register = template.Library()
+
+SUFFIXE_PAGE = '_page'
+
+
+@register.simple_tag(takes_context=True)
+def url_page(context, numero):
+    """URL de la page numero de la liste affichée (la première sans /page/1/)"""
+    request = context['request']
+    route = request.resolver_match
+    nom = route.view_name.removesuffix(SUFFIXE_PAGE)
+    kwargs = {cle: valeur for cle, valeur in route.kwargs.items() if cle != 'page'}
+    if int(numero) > 1:
+        url = reverse(nom + SUFFIXE_PAGE, kwargs={**kwargs, 'page': numero})
+    else:
+        url = reverse(nom, kwargs=kwargs)
+    filtres = [
+        (parametre, request.GET[parametre])
+        for parametre in PaginationCurseurMixin.PARAMETRES_FILTRES
+        if request.GET.get(parametre)
+    ]
+    return f'{url}?{urlencode(filtres)}' if filtres else url
@@ -1,3 +1,458 @@
-from django.test import TestCase
+import os
+from io import StringIO
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.http import Http404
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+
+from website import export
+
+from .compteur import CompteurVues, TamponCache, TamponMemoire, get_compteur
+from . import agregats, articles_lies
+from .admin import ArticleAdmin
+from .models import Article, ArticleLie, ArticleLieEnAttente, ArticleTermes, Auteur, Categorie, Tag
+from .pagination import PRECEDENT, SUIVANT, decoder_curseur, encoder_curseur
+from .recherche import get_moteur, oublier_moteurs
+from .rendu import rendre
+from .views import ArticleListView
+
+
+def creer_articles(nombre=3):
+    """Articles publiés d'une catégorie, avec un tag, du plus récent au plus ancien"""
+    categorie = Categorie.objects.create(nom="Innovation")
+    tag = Tag.objects.create(nom="Charpente")
+    user = User.objects.create(username="aude", first_name="Aude", last_name="Martin")
+    auteur = Auteur.objects.create(user=user)
+    articles = []
+    for numero in range(nombre):
+        article = Article.objects.create(
+            titre=f"Chantier numéro {numero}",
+            resume=f"Résumé {numero}",
+            contenu=f"<h2>Introduction</h2><p>Béton armé {numero}</p>",
+            image_couverture='blog/covers/test.png',
+            statut='publie',
+            categorie=categorie,
+            auteur=auteur,
+            date_publication=timezone.now() - timedelta(days=numero + 1),
+        )
+        article.tags.set([tag])
+        articles.append(article)
+    return articles
+
+
+class BlogTestCase(TestCase):
+    """Base des tests de vues : cache vidé, médias dans un dossier temporaire"""
+
+    def setUp(self):
+        medias = tempfile.TemporaryDirectory()
+        self.addCleanup(medias.cleanup)
+        reglages = override_settings(MEDIA_ROOT=medias.name, ALLOWED_HOSTS=['testserver'])
+        reglages.enable()
+        self.addCleanup(reglages.disable)
+        os.makedirs(os.path.join(medias.name, 'blog', 'covers'))
+        Image.new('RGB', (64, 48)).save(os.path.join(medias.name, 'blog', 'covers', 'test.png'))
+        cache.clear()
+        # Vues comptées pendant le test : jamais écrites (base de test détruite)
+        self.addCleanup(get_compteur().tampon.extraire)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.articles = creer_articles()
+
+    def modifier(self, fonction):
+        """Modification suivie des invalidations faites après le commit"""
+        with self.captureOnCommitCallbacks(execute=True):
+            fonction()
+
+
+class CurseurTests(SimpleTestCase):
+
+    def test_aller_retour(self):
+        article = Article(pk=42, date_publication=timezone.now())
+        for sens in (SUIVANT, PRECEDENT):
+            curseur = encoder_curseur(sens, article)
+            self.assertNotIn('=', curseur)
+            self.assertEqual(decoder_curseur(curseur), (sens, article.date_publication, 42))
+
+    def test_curseur_invalide(self):
+        # Vide, pas du base64, sens inconnu ('x|x|x'), sens inconnu ('z|2026-01-01|1')
+        for curseur in ('', 'pas-un-curseur', 'eHx4fHg', 'enwyMDI2LTAxLTAxfDE'):
+            with self.assertRaises(Http404, msg=curseur):
+                decoder_curseur(curseur)
+
+
+class RenduTests(SimpleTestCase):
+
+    def test_scripts_et_evenements_retires(self):
+        html, _ = rendre(
+            '<p onclick="voler()">Texte<script>alert(1)</script></p>'
+            '<style>p { color: red }</style><form><input name="x"></form>'
+        )
+        self.assertEqual(html, '<p>Texte</p>')
+
+    def test_urls_dangereuses_retirees(self):
+        html, _ = rendre(
+            '<a href="javascript:alert(1)">a</a><a href="java\tscript:alert(1)">b</a>'
+            '<a href="https://aude.ci/">c</a><a href="/blog/">d</a>'
+        )
+        self.assertEqual(html, '<a>a</a><a>b</a><a href="https://aude.ci/">c</a><a href="/blog/">d</a>')
+
+    def test_styles_filtres(self):
+        html, _ = rendre('<p style="color: red; background: url(x); position: fixed">x</p>')
+        self.assertEqual(html, '<p style="color: red">x</p>')
+
+    def test_iframes_limitees_aux_hotes_autorises(self):
+        html, _ = rendre(
+            '<iframe src="https://www.youtube.com/embed/abc"></iframe>'
+            '<iframe src="https://exemple.com/"><p>repli</p></iframe>'
+        )
+        self.assertEqual(html, '<iframe src="https://www.youtube.com/embed/abc" loading="lazy"></iframe>')
+
+    def test_lien_nouvel_onglet(self):
+        html, _ = rendre('<a href="https://aude.ci/" target="_blank">x</a>')
+        self.assertIn('rel="noopener noreferrer"', html)
+
+    def test_balises_fermees(self):
+        html, _ = rendre('<p><strong>gras<em>italique</p><ul><li>un')
+        self.assertEqual(html, '<p><strong>gras<em>italique</em></strong></p><ul><li>un</li></ul>')
+
+    def test_table_des_matieres(self):
+        html, sommaire = rendre(
+            '<h2>Béton armé</h2><h3 id="perso">Détails</h3><h2>Béton armé</h2><h4>Ignoré</h4>'
+        )
+        self.assertEqual(sommaire, [
+            {'niveau': 2, 'ancre': 'beton-arme', 'titre': 'Béton armé'},
+            {'niveau': 3, 'ancre': 'perso', 'titre': 'Détails'},
+            {'niveau': 2, 'ancre': 'beton-arme-2', 'titre': 'Béton armé'},
+        ])
+        self.assertIn('<h2 id="beton-arme-2">', html)
+        self.assertIn('<h4>Ignoré</h4>', html)
+
+
+class RenduArticleTests(BlogTestCase):
+
+    def test_rendu_a_la_sauvegarde(self):
+        article = self.articles[0]
+        self.assertIn('<h2 id="introduction">', article.contenu_html)
+        self.assertEqual(article.table_des_matieres, [{'niveau': 2, 'ancre': 'introduction', 'titre': 'Introduction'}])
+
+    def test_article_non_rendu(self):
+        # Article d'avant la migration 0005 : contenu_html vide
+        article = self.articles[0]
+        Article.objects.filter(pk=article.pk).update(contenu_html='', table_des_matieres=[])
+
+        self.assertContains(self.client.get(article.get_absolute_url()), '<h2 id="introduction">Introduction</h2>')
+        article.refresh_from_db()
+        self.assertIn('Béton armé 0', article.contenu_html)
+        self.assertEqual(len(article.table_des_matieres), 1)
+
+
+class TempsLectureTests(BlogTestCase):
+
+    def test_calcul_a_la_sauvegarde(self):
+        article = self.articles[0]
+        article.contenu = '<p>' + 'mot ' * 460 + '</p><pre>code</pre>'
+        article.save()
+        # 460 mots de texte à 230/min et 1 mot de code à 80/min
+        self.assertEqual((article.nombre_mots, article.temps_lecture), (461, 3))
+
+    def test_commande_independante_du_rendu(self):
+        # Articles d'avant la migration 0005 : contenu_html pas encore rendu
+        Article.objects.update(contenu_html='', nombre_mots=0, temps_lecture=5)
+        call_command('calculer_temps_lecture', stdout=StringIO())
+        self.assertEqual(set(Article.objects.values_list('nombre_mots', 'temps_lecture')), {(4, 1)})
+
+
+class GetConditionnelTests(BlogTestCase):
+    """Un client à jour reçoit un 304, toute modification affichée change l'ETag"""
+
+    def urls(self):
+        return ['/blog/', self.articles[0].get_absolute_url()]
+
+    def verifier_modification(self, fonction):
+        etags = {}
+        for url in self.urls():
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            etags[url] = response['ETag']
+            self.assertEqual(self.client.get(url, headers={'If-None-Match': etags[url]}).status_code, 304, url)
+
+        self.modifier(fonction)
+        for url in self.urls():
+            response = self.client.get(url, headers={'If-None-Match': etags[url]})
+            self.assertEqual(response.status_code, 200, url)
+            self.assertNotEqual(response['ETag'], etags[url], url)
+
+    def test_modification_article(self):
+        article = self.articles[0]
+
+        def modifier():
+            article.titre = "Titre modifié"
+            article.save()
+
+        self.verifier_modification(modifier)
+
+    def test_renommage_tag(self):
+        def renommer():
+            tag = Tag.objects.get()
+            tag.nom = "Bâtiment"
+            tag.save()
+
+        self.verifier_modification(renommer)
+
+    def test_renommage_auteur(self):
+        def renommer():
+            user = User.objects.get()
+            user.first_name = "Anne"
+            user.save()
+
+        self.verifier_modification(renommer)
+
+    def test_vue_comptee_sur_304(self):
+        article = self.articles[0]
+        url = article.get_absolute_url()
+        etag = self.client.get(url)['ETag']
+        avant = get_compteur().en_attente(article.pk)
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+        self.assertEqual(get_compteur().en_attente(article.pk), avant + 1)
+
+
+class InvalidationTests(BlogTestCase):
+    """Pages de liste et fragments en cache : modification visible dès le commit"""
+
+    def test_liste_apres_modification(self):
+        self.assertContains(self.client.get('/blog/'), "Chantier numéro 0")
+        article = self.articles[0]
+        article.titre = "Chantier rénové"
+        self.modifier(article.save)
+
+        response = self.client.get('/blog/')
+        self.assertContains(response, "Chantier rénové")
+        self.assertNotContains(response, "Chantier numéro 0")
+
+    def test_fragments_apres_renommage_tag(self):
+        url = self.articles[0].get_absolute_url()
+        self.assertContains(self.client.get('/blog/'), "Charpente")
+        self.assertContains(self.client.get(url), "Charpente")
+        tag = Tag.objects.get()
+        tag.nom = "Gros œuvre"
+        self.modifier(tag.save)
+
+        for response in (self.client.get('/blog/'), self.client.get(url)):
+            self.assertContains(response, "Gros œuvre")
+            self.assertNotContains(response, "Charpente")
+
+    def test_agregats_apres_modification_utilisateur(self):
+        user = User.objects.get()
+        with mock.patch.object(agregats, 'invalider_agregats') as invalider:
+            user.last_login = timezone.now()
+            user.save(update_fields=['last_login'])
+            invalider.assert_not_called()
+            user.last_name = "Durand"
+            user.save()
+        invalider.assert_called_once_with()
+
+    def test_liste_apres_publication(self):
+        brouillon = Article.objects.create(
+            titre="Article en préparation",
+            resume="Résumé",
+            contenu="<p>Bientôt</p>",
+            image_couverture='blog/covers/test.png',
+            categorie=self.articles[0].categorie,
+        )
+        self.assertNotContains(self.client.get('/blog/'), "Article en préparation")
+        brouillon.statut = 'publie'
+        brouillon.date_publication = timezone.now() - timedelta(minutes=1)
+        self.modifier(brouillon.save)
+        self.assertContains(self.client.get('/blog/'), "Article en préparation")
+
+
+class PaginationTests(BlogTestCase):
+    """Pages suivantes de la liste sous un chemin, exportées comme la liste"""
+
+    def setUp(self):
+        super().setUp()
+        premier = self.articles[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            for numero in range(3, 3 + ArticleListView.paginate_by):
+                Article.objects.create(
+                    titre=f"Chantier numéro {numero}",
+                    resume=f"Résumé {numero}",
+                    contenu="<p>Béton</p>",
+                    image_couverture='blog/covers/test.png',
+                    statut='publie',
+                    categorie=premier.categorie,
+                    auteur=premier.auteur,
+                    date_publication=timezone.now() - timedelta(days=numero + 1),
+                )
+
+    def test_pages_suivantes_par_chemin(self):
+        self.assertContains(self.client.get('/blog/'), 'href="/blog/page/2/"')
+        response = self.client.get('/blog/page/2/')
+        self.assertContains(response, "Chantier numéro 11")
+        self.assertContains(response, 'href="/blog/"')
+        # Ancienne forme toujours acceptée, filtres repris dans les liens
+        self.assertContains(self.client.get('/blog/?page=2'), "Chantier numéro 11")
+        self.assertContains(
+            self.client.get('/blog/?categorie=innovation'),
+            'href="/blog/page/2/?categorie=innovation"',
+        )
+
+    def test_pages_exportees(self):
+        self.assertEqual(export.pages_liste(), {'/blog/', '/blog/page/2/'})
+        self.assertLessEqual(export.pages_liste(), export.pages_publiques())
+        depuis = timezone.now()
+        article = self.articles[0]
+        self.modifier(lambda: ArticleAdmin(Article, admin.site).changer_statut(
+            Article.objects.filter(pk=article.pk), 'archive'
+        ))
+        article.refresh_from_db()
+        self.assertGreater(article.date_modification, depuis)
+        self.assertIn('/blog/page/2/', export.pages_modifiees(depuis))
+
+
+class CompteurVuesTests(BlogTestCase):
+    """Vues accumulées dans le tampon puis écrites en un UPDATE groupé"""
+
+    def test_extraire_vide_le_tampon(self):
+        for tampon in (TamponMemoire(), TamponCache('default')):
+            with self.subTest(tampon=type(tampon).__name__):
+                premier, second = (article.pk for article in self.articles[:2])
+                tampon.ajouter(premier)
+                tampon.ajouter(premier)
+                tampon.ajouter(second, 3)
+                self.assertEqual(tampon.extraire(), {premier: 2, second: 3})
+                self.assertEqual(tampon.extraire(), {})
+                self.assertEqual(tampon.en_attente(premier), 0)
+
+                tampon.ajouter(premier)
+                self.assertEqual(tampon.extraire(), {premier: 1})
+
+    def test_vider_ecrit_en_base(self):
+        for tampon in (TamponMemoire(), TamponCache('default')):
+            with self.subTest(tampon=type(tampon).__name__):
+                Article.objects.update(vues=0)
+                compteur = CompteurVues(tampon, seuil=100, intervalle=3600)
+                premier, second = self.articles[:2]
+                for _ in range(3):
+                    compteur.incrementer(premier.pk)
+                compteur.incrementer(second.pk)
+                premier.refresh_from_db()
+                self.assertEqual(premier.vues, 0)
+
+                with CaptureQueriesContext(connection) as requetes:
+                    self.assertEqual(compteur.vider(), 4)
+                # Un seul UPDATE pour tous les articles (hors SAVEPOINT du test)
+                self.assertEqual([r['sql'].split()[0] for r in requetes].count('UPDATE'), 1)
+                vues = dict(Article.objects.values_list('pk', 'vues'))
+                self.assertEqual((vues[premier.pk], vues[second.pk]), (3, 1))
+                self.assertEqual(compteur.en_attente(premier.pk), 0)
+                self.assertEqual(compteur.vider(), 0)
+
+    def test_vidage_au_seuil(self):
+        compteur = CompteurVues(TamponMemoire(), seuil=3, intervalle=3600)
+        article = self.articles[0]
+        for _ in range(3):
+            compteur.incrementer(article.pk)
+        article.refresh_from_db()
+        self.assertEqual(article.vues, 3)
+        self.assertEqual(compteur.en_attente(article.pk), 0)
+
+    def test_vidage_par_la_minuterie(self):
+        compteur = CompteurVues(TamponMemoire(), seuil=100, intervalle=0.01)
+        compteur.incrementer(self.articles[0].pk)
+        with mock.patch.object(compteur, 'vider', side_effect=compteur.arreter_minuterie) as vider:
+            compteur.demarrer_minuterie()
+            self.assertTrue(compteur._arret.wait(5))
+        vider.assert_called_once_with()
+
+    def test_restauration_apres_echec(self):
+        tampon = TamponMemoire()
+        compteur = CompteurVues(tampon, seuil=100, intervalle=3600)
+        article = self.articles[0]
+        compteur.incrementer(article.pk)
+        with mock.patch('blog.compteur.ecrire_vues', side_effect=DatabaseError):
+            with self.assertLogs('blog.compteur', 'ERROR'):
+                self.assertEqual(compteur.vider(), 0)
+        self.assertEqual(compteur.en_attente(article.pk), 1)
+
+
+class RechercheTests(BlogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        oublier_moteurs()
+        self.addCleanup(oublier_moteurs)
+        if get_moteur(connection.alias) is None:
+            self.skipTest("Index plein texte indisponible sur cette base")
+
+    def rechercher(self, requete):
+        response = self.client.get('/blog/', {'q': requete})
+        return [article.pk for article in response.context['articles']], response
+
+    def test_recherche_classee(self):
+        # Racinisation et accents : "chantiers" trouve "Chantier", "beton" trouve "Béton"
+        ids, _ = self.rechercher('chantiers beton')
+        self.assertCountEqual(ids, [article.pk for article in self.articles])
+        self.assertEqual(self.rechercher('numéro')[0], self.rechercher('numero')[0])
+
+    def test_index_interroge_une_fois(self):
+        with CaptureQueriesContext(connection) as requetes:
+            self.rechercher('chantier')
+        self.assertEqual(sum('MATCH' in requete['sql'] for requete in requetes), 1)
+
+    def test_index_incomplet(self):
+        # Juste après la migration 0003 : table d'index vide
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM blog_article_fts")
+        oublier_moteurs()
+        self.assertEqual(len(self.rechercher('Chantier')[0]), 3)
+
+        call_command('reindexer_recherche', stdout=StringIO())
+        with CaptureQueriesContext(connection) as requetes:
+            self.assertEqual(len(self.rechercher('Chantier')[0]), 3)
+        self.assertTrue(any('MATCH' in requete['sql'] for requete in requetes))
+
+    def test_recherche_tronquee(self):
+        self.assertNotContains(self.rechercher('chantier')[1], "les plus pertinents")
+        with mock.patch('blog.recherche.LIMITE_RESULTATS', 2), mock.patch('blog.views.LIMITE_RESULTATS', 2):
+            ids, response = self.rechercher('chantier')
+        self.assertEqual(len(ids), 2)
+        self.assertContains(response, "Seuls les 2 résultats les plus pertinents")
+
+
+class ArticlesLiesTests(BlogTestCase):
+
+    def test_mise_en_attente(self):
+        premier, second = (article.pk for article in self.articles[:2])
+        articles_lies.mettre_en_attente([premier])
+        date = ArticleLieEnAttente.objects.get(pk=premier).date
+        articles_lies.mettre_en_attente([premier, second])
+        self.assertEqual(ArticleLieEnAttente.objects.count(), 2)
+        self.assertGreater(ArticleLieEnAttente.objects.get(pk=premier).date, date)
+
+    def test_traitement_et_termes_stockes(self):
+        ArticleLieEnAttente.objects.all().delete()
+        articles_lies.mettre_en_attente([article.pk for article in self.articles])
+        self.assertEqual(articles_lies.traiter_en_attente(), (3, 3))
+        self.assertFalse(ArticleLieEnAttente.objects.exists())
+        self.assertEqual(ArticleLie.objects.filter(article=self.articles[0]).count(), 2)
+        self.assertEqual(ArticleTermes.objects.count(), 3)
+
+        # Mise à jour suivante : seul le contenu de l'article modifié est relu
+        article = self.articles[0]
+        article.contenu = '<p>Charpente métallique</p>'
+        article.save()
+        with CaptureQueriesContext(connection) as requetes:
+            articles_lies.mettre_a_jour([article.pk])
+        contenus = [requete['sql'] for requete in requetes if '"blog_article"."contenu"' in requete['sql']]
+        self.assertEqual(len(contenus), 1)
+        self.assertIn('metall', ArticleTermes.objects.get(pk=article.pk).termes)
@@ -6,32 +6,55 @@ Conventions :
 - Nommage cohérent des routes
 """
 
+from django.conf import settings
 from django.urls import path
 from . import views
+from .planification import page_planifiee
 
 app_name = 'blog'
 
+# Vues async sous ASGI (voir aude_web/asgi.py)
+if settings.VUES_ASYNC:
+    ArticleListView, ArticleDetailView = views.ArticleListAsyncView, views.ArticleDetailAsyncView
+else:
+    ArticleListView, ArticleDetailView = views.ArticleListView, views.ArticleDetailView
+
 urlpatterns = [
     # Liste des articles (page principale)
-    path('', views.ArticleListView.as_view(), name='article_list'),
+    path('', page_planifiee(ArticleListView.as_view()), name='article_list'),
+    path('page/<int:page>/', page_planifiee(ArticleListView.as_view()), name='article_list_page'),
 
     # Détail d'un article
-    path('article/<slug:slug>/', views.ArticleDetailView.as_view(), name='article_detail'),
+    path('article/<slug:slug>/', ArticleDetailView.as_view(), name='article_detail'),
 
     # Articles par catégorie
-    path('categorie/<slug:slug>/', views.CategorieDetailView.as_view(), name='categorie_detail'),
+    path('categorie/<slug:slug>/', page_planifiee(views.CategorieDetailView.as_view()), name='categorie_detail'),
+    path('categorie/<slug:slug>/page/<int:page>/', page_planifiee(views.CategorieDetailView.as_view()), name='categorie_detail_page'),
 
     # Articles par tag
-    path('tag/<slug:slug>/', views.TagDetailView.as_view(), name='tag_detail'),
+    path('tag/<slug:slug>/', page_planifiee(views.TagDetailView.as_view()), name='tag_detail'),
+    path('tag/<slug:slug>/page/<int:page>/', page_planifiee(views.TagDetailView.as_view()), name='tag_detail_page'),
+
+    # Flux RSS / Atom
+    path('feed/', views.FluxView.as_view(), name='flux'),
+    path('feed/atom/', views.FluxView.as_view(format='atom'), name='flux_atom'),
+    path('categorie/<slug:slug>/feed/', views.CategorieFluxView.as_view(), name='categorie_flux'),
+    path('categorie/<slug:slug>/feed/atom/', views.CategorieFluxView.as_view(format='atom'), name='categorie_flux_atom'),
+    path('tag/<slug:slug>/feed/', views.TagFluxView.as_view(), name='tag_flux'),
+    path('tag/<slug:slug>/feed/atom/', views.TagFluxView.as_view(format='atom'), name='tag_flux_atom'),
 ]
 
 """
 EXEMPLES D'URLS GÉNÉRÉES :
 - /blog/                                    → Liste tous les articles
+- /blog/page/2/                             → Page 2 de la liste (?page=2 reste accepté)
 - /blog/?categorie=innovation               → Filtre par catégorie
 - /blog/?tag=ia                             → Filtre par tag
 - /blog/?q=btp                              → Recherche
 - /blog/article/intelligence-revolutionne-btp/  → Détail article
 - /blog/categorie/innovation/               → Tous les articles "Innovation"
 - /blog/tag/ia/                             → Tous les articles avec tag "IA"
+- /blog/feed/  (/blog/feed/atom/)           → Flux RSS (Atom) des derniers articles
+- /blog/categorie/innovation/feed/          → Flux de la catégorie "Innovation"
+- /blog/tag/ia/feed/                        → Flux du tag "IA"
 """
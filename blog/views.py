@@ -9,17 +9,33 @@ Conventions Django :
 - Utilisation de Class-Based Views pour réutilisabilité
 - Optimisation avec select_related/prefetch_related
 - Pagination intégrée
+- Variantes async (ORM async, requêtes indépendantes lancées ensemble)
+  servies sous ASGI (VUES_ASYNC, voir blog/urls.py)
 """
 
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import Http404
 from django.shortcuts import render, get_object_or_404
+from django.views import View
 from django.views.generic import ListView, DetailView
-from django.db.models import Q, Count
 from django.utils import timezone
 
 from .models import Article, Categorie, Tag
-
-
-class ArticleListView(ListView):
+from .agregats import get_agregats
+from .compteur import get_compteur
+from .flux import reponse_flux
+from .recherche import LIMITE_RESULTATS, rechercher
+from .conditionnel import (
+    ListeConditionnelleMixin, DetailConditionnelMixin,
+    aetat_articles, aetat_taxonomie, alister, queryset_par_requete,
+)
+from .pagination import PaginationCurseurMixin
+
+
+class ArticleListView(ListeConditionnelleMixin, PaginationCurseurMixin, ListView):
     """
     Vue liste des articles de blog avec pagination et filtres
     """
@@ -27,7 +43,10 @@ class ArticleListView(ListView):
     template_name = 'article_list.html'
     context_object_name = 'articles'
     paginate_by = 9  # 3 colonnes x 3 lignes
+    # Recherche limitée aux LIMITE_RESULTATS articles les plus pertinents
+    recherche_tronquee = False
 
+    @queryset_par_requete
     def get_queryset(self):
         """
         Requête optimisée avec tous les filtres possibles
@@ -41,6 +60,8 @@ class ArticleListView(ListView):
             'auteur__user'
         ).prefetch_related(
             'tags'
+        ).defer(
+            *Article.CHAMPS_CONTENU
         )
 
         # Filtre par catégorie (ex: ?categorie=innovation)
@@ -53,14 +74,10 @@ class ArticleListView(ListView):
         if tag_slug:
             queryset = queryset.filter(tags__slug=tag_slug)
 
-        # Recherche textuelle (ex: ?q=btp)
+        # Recherche plein texte classée par pertinence (ex: ?q=btp)
         search_query = self.request.GET.get('q')
         if search_query:
-            queryset = queryset.filter(
-                Q(titre__icontains=search_query) |
-                Q(resume__icontains=search_query) |
-                Q(contenu__icontains=search_query)
-            )
+            queryset, self.recherche_tronquee = rechercher(queryset, search_query)
 
         return queryset.distinct()
 
@@ -69,35 +86,33 @@ class ArticleListView(ListView):
         Ajouter des données contextuelles pour les filtres
         """
         context = super().get_context_data(**kwargs)
+        # Catégories, tags populaires et article en vedette : mis en cache
+        context.update(self.contexte_filtres(get_agregats()))
+        return context
 
-        # Toutes les catégories avec compteur d'articles
-        context['categories'] = Categorie.objects.annotate(
-            nb_articles=Count('articles', filter=Q(articles__statut='publie'))
-        ).filter(nb_articles__gt=0)
-
-        # Tous les tags populaires
-        context['tags_populaires'] = Tag.objects.annotate(
-            nb_articles=Count('articles', filter=Q(articles__statut='publie'))
-        ).filter(nb_articles__gt=0).order_by('-nb_articles')[:10]
+    def contexte_filtres(self, agregats):
+        """Barre latérale et filtres actifs"""
+        context = {}
+        context['categories'] = agregats['categories']
+        context['tags_populaires'] = agregats['tags_populaires']
 
         # Article en vedette (si aucun filtre actif)
         if not any([self.request.GET.get('categorie'),
                    self.request.GET.get('tag'),
                    self.request.GET.get('q')]):
-            context['article_vedette'] = Article.objects.filter(
-                statut='publie',
-                en_vedette=True
-            ).select_related('categorie', 'auteur').first()
+            context['article_vedette'] = agregats['article_vedette']
 
         # Paramètres de recherche actifs
         context['categorie_active'] = self.request.GET.get('categorie')
         context['tag_actif'] = self.request.GET.get('tag')
         context['recherche'] = self.request.GET.get('q')
+        if self.recherche_tronquee:
+            context['limite_recherche'] = LIMITE_RESULTATS
 
         return context
 
 
-class ArticleDetailView(DetailView):
+class ArticleDetailView(DetailConditionnelMixin, DetailView):
     """
     Vue détail d'un article avec incrément des vues
     """
@@ -120,6 +135,10 @@ class ArticleDetailView(DetailView):
             'auteur__user'
         ).prefetch_related(
             'tags'
+        ).defer(
+            # Contenu publié : contenu_html (voir blog/rendu.py), contenu
+            # lu seulement s'il n'a pas encore été rendu (completer_rendu)
+            'contenu'
         )
 
     def get_object(self, queryset=None):
@@ -127,38 +146,138 @@ class ArticleDetailView(DetailView):
         Récupération de l'article avec incrément des vues
         """
         obj = super().get_object(queryset)
-
-        # Incrémenter les vues (uniquement si pas en mode preview)
-        if not self.request.GET.get('preview'):
+        obj.completer_rendu()
+        if self.compte_la_vue():
             obj.incrementer_vues()
-
         return obj
 
-    def get_context_data(self, **kwargs):
+    def client_a_jour(self):
         """
-        Données supplémentaires pour la page détail
+        Réponse 304 sans get_object() : la vue est comptée quand même
         """
-        context = super().get_context_data(**kwargs)
+        if self.compte_la_vue():
+            get_compteur().incrementer(self.pk_article)
 
-        # Articles similaires/liés
-        context['articles_lies'] = self.object.get_articles_lies(limit=3)
+    def compte_la_vue(self):
+        # Pas en mode preview ni lors d'un export statique (voir website/export.py)
+        return not self.request.GET.get('preview') and not getattr(self.request, 'export_statique', False)
 
-        # Article précédent
-        context['article_precedent'] = Article.objects.filter(
+    def articles_precedents(self):
+        return Article.objects.filter(
             statut='publie',
             date_publication__lt=self.object.date_publication
-        ).order_by('-date_publication').first()
+        ).order_by('-date_publication').defer(*Article.CHAMPS_CONTENU)
 
-        # Article suivant
-        context['article_suivant'] = Article.objects.filter(
+    def articles_suivants(self):
+        return Article.objects.filter(
             statut='publie',
             date_publication__gt=self.object.date_publication
-        ).order_by('date_publication').first()
+        ).order_by('date_publication').defer(*Article.CHAMPS_CONTENU)
+
+    def get_context_data(self, **kwargs):
+        """
+        Données supplémentaires pour la page détail
+        """
+        context = super().get_context_data(**kwargs)
+
+        # Articles similaires/liés
+        context['articles_lies'] = self.object.get_articles_lies(limit=3)
+
+        # Article précédent / suivant
+        context['article_precedent'] = self.articles_precedents().first()
+        context['article_suivant'] = self.articles_suivants().first()
 
         return context
 
 
-class CategorieDetailView(ListView):
+class ArticleListAsyncView(ArticleListView):
+    """
+    ArticleListView en async (ASGI) : état de la liste et taxonomie
+    pour le 304, puis page d'articles et agrégats, lancés ensemble
+    Le template est rendu par le handler (TemplateResponse)
+    """
+
+    async def get(self, request, *args, **kwargs):
+        # La recherche interroge l'index dès get_queryset()
+        self.object_list = queryset = await sync_to_async(self.get_queryset)()
+        if self.utilise_curseur(queryset):
+            # Pagination par curseur : chemin synchrone
+            return await sync_to_async(super().get)(request, *args, **kwargs)
+
+        etat, taxonomie = await asyncio.gather(aetat_articles(queryset), aetat_taxonomie())
+        validateurs = self.validateurs(etat, taxonomie)
+        response = self.reponse_conditionnelle(request, *validateurs)
+        if response is None:
+            (paginator, page), agregats = await asyncio.gather(
+                self.apaginer(queryset),
+                sync_to_async(get_agregats)(),
+            )
+            # Même contexte que ListView.get_context_data(), sans requête
+            context = {
+                'view': self,
+                'paginator': paginator,
+                'page_obj': page,
+                'is_paginated': page.has_other_pages(),
+                'object_list': page.object_list,
+                self.context_object_name: page.object_list,
+                **self.contexte_filtres(agregats),
+            }
+            response = self.render_to_response(context)
+        return self.ajouter_validateurs(response, *validateurs)
+
+    async def apaginer(self, queryset):
+        """paginate_queryset() en async, nombre d'articles repris de l'état de la liste"""
+        paginator = self.get_paginator(queryset, self.paginate_by)
+        numero = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+        try:
+            page = paginator.page(paginator.num_pages if numero == 'last' else int(numero))
+        except (ValueError, InvalidPage):
+            raise Http404(f"Page invalide ({numero})")
+        page.object_list = await alister(page.object_list)
+        return paginator, page
+
+
+class ArticleDetailAsyncView(ArticleDetailView):
+    """
+    ArticleDetailView en async (ASGI) : validateurs (article, tags,
+    état du blog) puis articles liés, précédent et suivant, lancés ensemble
+    """
+
+    async def get(self, request, *args, **kwargs):
+        validateurs = await self.aget_validateurs()
+        response = self.reponse_conditionnelle(request, *validateurs)
+        if response is None:
+            self.object = await self.aget_object()
+            articles_lies, precedent, suivant = await asyncio.gather(
+                self.object.aget_articles_lies(limit=3),
+                self.articles_precedents().afirst(),
+                self.articles_suivants().afirst(),
+            )
+            # Contexte de DetailView, sans les requêtes de ArticleDetailView
+            context = super(ArticleDetailView, self).get_context_data(
+                articles_lies=articles_lies,
+                article_precedent=precedent,
+                article_suivant=suivant,
+            )
+            response = self.render_to_response(context)
+        elif response.status_code == 304:
+            await sync_to_async(self.client_a_jour)()
+        return self.ajouter_validateurs(response, *validateurs)
+
+    async def aget_object(self):
+        try:
+            obj = await self._article_de_l_url().aget()
+        except Article.DoesNotExist:
+            raise Http404("Aucun article ne correspond à cette URL")
+        if not obj.contenu_html:
+            await sync_to_async(obj.completer_rendu)()
+        if self.compte_la_vue():
+            # Le vidage du tampon écrit en base
+            await sync_to_async(obj.incrementer_vues)()
+        return obj
+
+
+class CategorieDetailView(ListeConditionnelleMixin, PaginationCurseurMixin, ListView):
     """
     Vue pour afficher tous les articles d'une catégorie
     """
@@ -167,6 +286,7 @@ class CategorieDetailView(ListView):
     context_object_name = 'articles'
     paginate_by = 9
 
+    @queryset_par_requete
     def get_queryset(self):
         """Articles de la catégorie sélectionnée"""
         self.categorie = get_object_or_404(
@@ -181,7 +301,7 @@ class CategorieDetailView(ListView):
         ).select_related(
             'categorie',
             'auteur'
-        ).prefetch_related('tags')
+        ).prefetch_related('tags').defer(*Article.CHAMPS_CONTENU)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -189,7 +309,7 @@ class CategorieDetailView(ListView):
         return context
 
 
-class TagDetailView(ListView):
+class TagDetailView(ListeConditionnelleMixin, PaginationCurseurMixin, ListView):
     """
     Vue pour afficher tous les articles d'un tag
     """
@@ -198,6 +318,7 @@ class TagDetailView(ListView):
     context_object_name = 'articles'
     paginate_by = 9
 
+    @queryset_par_requete
     def get_queryset(self):
         """Articles avec le tag sélectionné"""
         self.tag = get_object_or_404(
@@ -212,7 +333,7 @@ class TagDetailView(ListView):
         ).select_related(
             'categorie',
             'auteur'
-        ).prefetch_related('tags')
+        ).prefetch_related('tags').defer(*Article.CHAMPS_CONTENU)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -220,6 +341,34 @@ class TagDetailView(ListView):
         return context
 
 
+class FluxView(View):
+    """
+    Flux RSS / Atom des derniers articles (voir blog/flux.py)
+    """
+    format = 'rss'
+
+    def get(self, request, *args, **kwargs):
+        return reponse_flux(request, self.format)
+
+
+class CategorieFluxView(FluxView):
+    """
+    Flux des articles d'une catégorie
+    """
+
+    def get(self, request, *args, **kwargs):
+        return reponse_flux(request, self.format, categorie=self.kwargs['slug'])
+
+
+class TagFluxView(FluxView):
+    """
+    Flux des articles d'un tag
+    """
+
+    def get(self, request, *args, **kwargs):
+        return reponse_flux(request, self.format, tag=self.kwargs['slug'])
+
+
 # Vue fonction alternative (plus simple pour la liste)
 def article_list_fonction(request):
     """
@@ -228,7 +377,7 @@ def article_list_fonction(request):
     articles = Article.objects.filter(
         statut='publie',
         date_publication__lte=timezone.now()
-    ).select_related('categorie', 'auteur').prefetch_related('tags')
+    ).select_related('categorie', 'auteur').prefetch_related('tags').defer(*Article.CHAMPS_CONTENU)
 
     # Filtres
     categorie_slug = request.GET.get('categorie')
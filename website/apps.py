@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class WebsiteConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'website'
+
+    def ready(self):
+        from .signals import connecter_signaux
+        connecter_signaux()
+
+        from aude_web import verifications  # noqa: F401
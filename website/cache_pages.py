@@ -0,0 +1,168 @@
+"""
+Cache des pages vitrine (accueil, à propos, solutions, tarifs, contact)
+Principe :
+- La page rendue est stockée dans le cache, par chemin et par langue ;
+  seuls les paramètres de PARAMETRES entrent dans la clé (les autres,
+  ?utm_source=... ou paramètres inventés, ne créent pas d'entrée et ne
+  sont pas lus par les vues vitrine)
+- Chaque page déclare les modèles dont elle dépend
+- Vues async acceptées (API async du cache) ; une variante async
+  déclare le nom de la page sync pour partager son cache (page='home')
+- Une version par page est incrémentée après le commit de chaque
+  post_save/post_delete d'un de ces modèles (voir website/signals.py) :
+  seules les pages concernées sont invalidées, et une requête arrivée
+  avant le commit ne remet pas l'ancien contenu sous la nouvelle version
+
+Configuration (settings.py) :
+    CACHE_PAGES = {
+        'ALIAS': 'default',
+        'TIMEOUT': 86400,  # filet de sécurité (ex: modification de template)
+        'PARAMETRES': (),  # paramètres d'URL qui changent la page
+    }
+
+Plusieurs processus : l'invalidation n'atteint que le cache partagé
+(redis, memcached), voir aude_web/settings_production.py
+"""
+
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.utils import translation
+
+from aude_web.repliques import invalider_apres_commit
+
+CONFIGURATION_PAR_DEFAUT = {
+    'ALIAS': 'default',
+    'TIMEOUT': 86400,
+    'PARAMETRES': (),
+}
+
+# Nom de page -> modèles dont dépend son contenu
+PAGES = {}
+
+
+def _configuration():
+    return {**CONFIGURATION_PAR_DEFAUT, **getattr(settings, 'CACHE_PAGES', {})}
+
+
+def _cache():
+    return caches[_configuration()['ALIAS']]
+
+
+def _cle_version(page):
+    return f'website:page:version:{page}'
+
+
+def _cle_page(page, version, request):
+    parametres = sorted(
+        (nom, valeur)
+        for nom in _configuration()['PARAMETRES']
+        for valeur in request.GET.getlist(nom)
+    )
+    chemin = hashlib.md5(repr((request.path, parametres)).encode()).hexdigest()
+    return f'website:page:{page}:{version}:{translation.get_language()}:{chemin}'
+
+
+def _incrementer_version(page):
+    cache = _cache()
+    try:
+        cache.incr(_cle_version(page))
+    except ValueError:
+        # Pas encore de version : aucune entrée à invalider
+        cache.set(_cle_version(page), 1, timeout=None)
+
+
+def invalider_page(page):
+    """Invalide toutes les URL mises en cache pour cette page (après le commit)"""
+    invalider_apres_commit(lambda: _incrementer_version(page))
+
+
+def pages_dependantes(modele):
+    """Pages dont le contenu dépend du modèle donné"""
+    return [page for page, modeles in PAGES.items() if modele in modeles]
+
+
+def page_en_cache(*modeles, page=None):
+    """
+    Décorateur de vue : sert la page depuis le cache
+    Usage :
+        @page_en_cache(HeroSection, StatItem)
+        def home(request): ...
+
+        @page_en_cache(HeroSection, StatItem, page='home')
+        async def home_async(request): ...
+    """
+    def decorateur(vue):
+        nom = page or vue.__name__
+        PAGES[nom] = set(modeles)
+
+        if iscoroutinefunction(vue):
+            vue_en_cache = _vue_async_en_cache(vue, nom)
+        else:
+            vue_en_cache = _vue_en_cache(vue, nom)
+        vue_en_cache.page_en_cache = nom
+        return vue_en_cache
+
+    return decorateur
+
+
+def _vue_en_cache(vue, page):
+    @wraps(vue)
+    def vue_en_cache(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return vue(request, *args, **kwargs)
+
+        cache = _cache()
+        version = cache.get_or_set(_cle_version(page), 1, timeout=None)
+        cle = _cle_page(page, version, request)
+
+        en_cache = cache.get(cle)
+        if en_cache is not None:
+            contenu, content_type = en_cache
+            return HttpResponse(contenu, content_type=content_type)
+
+        response = vue(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            cache.set(
+                cle,
+                (response.content, response['Content-Type']),
+                timeout=_configuration()['TIMEOUT']
+            )
+        return response
+
+    return vue_en_cache
+
+
+def _vue_async_en_cache(vue, page):
+    @wraps(vue)
+    async def vue_en_cache(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return await vue(request, *args, **kwargs)
+
+        cache = _cache()
+        version = await cache.aget_or_set(_cle_version(page), 1, timeout=None)
+        cle = _cle_page(page, version, request)
+
+        en_cache = await cache.aget(cle)
+        if en_cache is not None:
+            contenu, content_type = en_cache
+            return HttpResponse(contenu, content_type=content_type)
+
+        response = await vue(request, *args, **kwargs)
+        if isinstance(response, SimpleTemplateResponse) and not response.is_rendered:
+            # Rendu hors de la boucle d'événements (requêtes paresseuses du template)
+            response = await sync_to_async(response.render)()
+        if response.status_code == 200 and not response.streaming:
+            await cache.aset(
+                cle,
+                (response.content, response['Content-Type']),
+                timeout=_configuration()['TIMEOUT']
+            )
+        return response
+
+    return vue_en_cache
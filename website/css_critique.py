@@ -0,0 +1,164 @@
+"""
+CSS critique (au-dessus de la ligne de flottaison) par page
+Principe :
+- Chaque page publique est rendue, puis analysée (tinyhtml5)
+- Partie visible au chargement : éléments du <body> jusqu'à la N-ième
+  <section> incluse (barre de navigation, boutons flottants, hero...)
+- Seules les règles des feuilles de style dont un sélecteur correspond à
+  l'un de ces éléments sont conservées (cssselect2), avec leurs @media,
+  les @font-face et les @keyframes utilisées
+- Le résultat est écrit dans static/css/critique/<page>.css, avec un
+  index.json des feuilles analysées : la balise {% css_critique %} l'insère
+  dans <head> et {% feuille_de_style %} charge alors ces feuilles en différé
+
+Construction : python manage.py extraire_css_critique (lancée par collectstatic)
+"""
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import cssselect2
+import tinycss2
+import tinyhtml5
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+from aude_web.statiques import chemin_tiers, minifier_css
+
+DOSSIER = 'css/critique'
+INDEX = f'{DOSSIER}/index.json'
+
+# Feuilles de style chargées par base.html (chemins statiques)
+FEUILLES = [
+    chemin_tiers('bootstrap/5.3.0/css/bootstrap.min.css'),
+    chemin_tiers('bootstrap-icons/1.11.3/font/bootstrap-icons.min.css'),
+    'css/style.css',
+]
+
+BALISES_IGNOREES = {'script', 'noscript', 'template', 'style', 'link'}
+
+# Attributs posés sur <html> par js/main.js avant l'affichage (thème sombre)
+VARIANTES_RACINE = [{}, {'data-theme': 'dark'}]
+
+
+def nom_fichier(page):
+    """'blog:article_list' -> 'blog-article_list'"""
+    return page.replace(':', '-')
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+
+def elements_visibles(html, sections=2, attributs_racine=None):
+    """Éléments (ElementWrapper) affichés au chargement de la page"""
+    arbre = tinyhtml5.parse(html)
+    for nom, valeur in (attributs_racine or {}).items():
+        arbre.set(nom, valeur)
+    racine = cssselect2.ElementWrapper.from_html_root(arbre)
+    corps = next(
+        (element for element in racine.iter_subtree() if element.local_name == 'body'),
+        None
+    )
+    if corps is None:
+        return []
+
+    visibles = [racine, corps]
+    vues = 0
+    for bloc in corps.iter_children():
+        if bloc.local_name in BALISES_IGNOREES:
+            continue
+        visibles.extend(bloc.iter_subtree())
+        if bloc.local_name == 'section':
+            vues += 1
+        elif any(element.local_name == 'section' for element in bloc.iter_subtree()):
+            vues += 1
+        if vues >= sections:
+            break
+    return visibles
+
+
+def _selecteurs(prelude):
+    """Sélecteurs compilés d'une règle (None si non pris en charge)"""
+    try:
+        return cssselect2.compile_selector_list(prelude)
+    except cssselect2.SelectorError:
+        return None
+
+
+def _regles_utiles(regles, elements):
+    """Sérialisation des règles qui s'appliquent à au moins un élément"""
+    conservees = []
+    for regle in regles:
+        if regle.type == 'qualified-rule':
+            selecteurs = _selecteurs(regle.prelude)
+            if selecteurs and any(s.test(element) for s in selecteurs for element in elements):
+                conservees.append(tinycss2.serialize([regle]))
+
+        elif regle.type == 'at-rule':
+            mot_cle = regle.lower_at_keyword
+            if mot_cle in ('media', 'supports') and regle.content is not None:
+                internes = tinycss2.parse_rule_list(regle.content, skip_comments=True, skip_whitespace=True)
+                contenu = _regles_utiles(internes, elements)
+                if contenu:
+                    conservees.append(
+                        f'@{mot_cle} {tinycss2.serialize(regle.prelude).strip()}{{{"".join(contenu)}}}'
+                    )
+            elif mot_cle in ('font-face', 'keyframes', '-webkit-keyframes'):
+                conservees.append(tinycss2.serialize([regle]))
+    return conservees
+
+
+def _retirer_animations_inutiles(regles):
+    """@keyframes non référencées par les règles conservées"""
+    autres = ''.join(regle for regle in regles if not regle.lstrip().startswith(('@keyframes', '@-webkit-keyframes')))
+    resultat = []
+    for regle in regles:
+        nom = re.match(r'\s*@(?:-webkit-)?keyframes\s+([\w-]+)', regle)
+        if nom is None or re.search(rf'\b{re.escape(nom[1])}\b', autres):
+            resultat.append(regle)
+    return resultat
+
+
+def extraire(html, feuilles, sections=2):
+    """CSS critique d'une page à partir de son HTML et du texte des feuilles"""
+    elements = [
+        element
+        for attributs in VARIANTES_RACINE
+        for element in elements_visibles(html, sections, attributs)
+    ]
+    regles = []
+    for css in feuilles:
+        regles.extend(_regles_utiles(
+            tinycss2.parse_stylesheet(css, skip_comments=True, skip_whitespace=True),
+            elements
+        ))
+    return minifier_css(''.join(_retirer_animations_inutiles(regles)))
+
+
+# ---------------------------------------------------------------------------
+# Lecture (balises de template)
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def index():
+    """{page: [feuilles analysées]} (vide tant que l'extraction n'a pas tourné)"""
+    chemin = finders.find(INDEX)
+    if chemin is None:
+        return {}
+    return json.loads(Path(chemin).read_text(encoding='utf-8'))
+
+
+@lru_cache(maxsize=None)
+def css_de_page(page):
+    chemin = finders.find(f'{DOSSIER}/{nom_fichier(page)}.css')
+    if chemin is None:
+        return None
+    return Path(chemin).read_text(encoding='utf-8')
+
+
+def dossier_sortie():
+    """static/css/critique dans le premier dossier de STATICFILES_DIRS"""
+    return Path(settings.STATICFILES_DIRS[0]) / DOSSIER
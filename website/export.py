@@ -0,0 +1,293 @@
+"""
+Export statique du site public (HTML + statiques + médias + plan du site)
+Principe :
+- Chaque page publique est rendue par le client de test Django
+  (middlewares et context processors comme en production) puis écrite
+  en <chemin>/index.html : le dossier se sert avec n'importe quel
+  serveur de fichiers
+- Rendu réparti sur plusieurs processus (une connexion SQL par processus)
+- Mode incrémental : un fichier d'état (.export.json) garde la date du
+  dernier export, les pages écrites et la catégorie et les tags de chaque
+  article ; seules les pages touchées par un article, une catégorie ou un
+  contenu vitrine modifié depuis (date_modification / updated_at) sont
+  rendues à nouveau, y compris les pages de catégorie et de tag qu'un
+  article a quittées (ou qu'un article supprimé ou dépublié occupait) ;
+  les pages disparues sont supprimées
+- Les requêtes de l'export portent request.export_statique (ClientExport) :
+  le compteur de vues les ignore (blog/views.py)
+
+- Les pages suivantes de la liste des articles sont exportées sous leur
+  chemin (/blog/page/N/, voir blog/templatetags/pagination_blog.py) et
+  rendues à nouveau avec la liste
+
+Limites :
+- Sans date de modification, un tag renommé, un auteur modifié ou un
+  template changé demandent un export complet ; les pages vitrine dont un
+  modèle n'a pas de updated_at sont toujours rendues à nouveau
+"""
+
+import json
+import math
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.db.models import Max, Q
+from django.test import Client
+from django.test.client import ClientHandler
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Article, Categorie, Tag
+from blog.views import ArticleListView
+
+from . import urls
+from .cache_pages import PAGES
+
+FICHIER_ETAT = '.export.json'
+
+
+# ---------------------------------------------------------------------------
+# Pages
+# ---------------------------------------------------------------------------
+
+def _articles_visibles():
+    return Article.objects.filter(statut='publie', date_publication__lte=timezone.now())
+
+
+def _url_tag(tag):
+    return reverse('blog:tag_detail', kwargs={'slug': tag.slug})
+
+
+def pages_liste():
+    """Liste des articles et ses pages suivantes (/blog/page/N/)"""
+    nombre = math.ceil(_articles_visibles().count() / ArticleListView.paginate_by)
+    return {reverse('blog:article_list')} | {
+        reverse('blog:article_list_page', kwargs={'page': numero}) for numero in range(2, nombre + 1)
+    }
+
+
+def pages_publiques():
+    """Chemins de toutes les pages publiques"""
+    pages = {reverse(pattern.name) for pattern in urls.urlpatterns}
+    pages.update(pages_liste())
+    pages.update(article.get_absolute_url() for article in _articles_visibles().only('slug'))
+    pages.update(categorie.get_absolute_url() for categorie in Categorie.objects.only('slug'))
+    pages.update(
+        _url_tag(tag)
+        for tag in Tag.objects.filter(articles__in=_articles_visibles()).distinct().only('slug')
+    )
+    return pages
+
+
+def _voisins(article, visibles):
+    """Articles dont la page affiche celui-ci (précédent / suivant, articles liés)"""
+    precedent = visibles.filter(
+        date_publication__lt=article.date_publication
+    ).order_by('-date_publication').only('slug').first()
+    suivant = visibles.filter(
+        date_publication__gt=article.date_publication
+    ).order_by('date_publication').only('slug').first()
+    citant = visibles.filter(voisins__article_lie=article).only('slug')
+    return [voisin for voisin in (precedent, suivant, *citant) if voisin is not None]
+
+
+def _pages_vitrine_modifiees(depuis):
+    """Pages vitrine dont un contenu a changé (ou sans date de modification)"""
+    pages = set()
+    for pattern in urls.urlpatterns:
+        modeles = PAGES.get(getattr(pattern.callback, 'page_en_cache', None), ())
+        for modele in modeles:
+            if not any(champ.name == 'updated_at' for champ in modele._meta.fields):
+                pages.add(reverse(pattern.name))
+                break
+            derniere = modele.objects.aggregate(date=Max('updated_at'))['date']
+            if derniere is not None and derniere > depuis:
+                pages.add(reverse(pattern.name))
+                break
+    return pages
+
+
+def _pages_taxonomie(article):
+    return [article.categorie.get_absolute_url(), *(_url_tag(tag) for tag in article.tags.all())]
+
+
+def taxonomie_articles():
+    """{id d'article visible: pages de sa catégorie et de ses tags} (fichier d'état)"""
+    articles = _articles_visibles().select_related('categorie').prefetch_related('tags').only(
+        'pk', 'categorie__slug'
+    )
+    return {str(article.pk): _pages_taxonomie(article) for article in articles}
+
+
+def pages_modifiees(depuis, taxonomie_precedente=None):
+    """
+    Chemins dont le contenu a pu changer depuis la date donnée
+    taxonomie_precedente : taxonomie_articles() du dernier export
+    """
+    maintenant = timezone.now()
+    visibles = _articles_visibles()
+    pages = _pages_vitrine_modifiees(depuis)
+    taxonomie_precedente = taxonomie_precedente or {}
+
+    # Modifiés, ou publication programmée arrivée à échéance
+    articles = Article.objects.filter(
+        Q(date_modification__gt=depuis)
+        | Q(statut='publie', date_publication__gt=depuis, date_publication__lte=maintenant)
+    ).select_related('categorie').prefetch_related('tags')
+    categories = Categorie.objects.filter(date_modification__gt=depuis)
+
+    for article in articles:
+        pages.add(article.get_absolute_url())
+        pages.update(_pages_taxonomie(article))
+        # Catégorie et tags quittés depuis le dernier export
+        pages.update(taxonomie_precedente.get(str(article.pk), ()))
+        pages.update(voisin.get_absolute_url() for voisin in _voisins(article, visibles))
+
+    # Articles exportés la dernière fois, supprimés ou plus visibles depuis
+    disparus = set(taxonomie_precedente) - {str(pk) for pk in visibles.values_list('pk', flat=True)}
+    for pk in disparus:
+        pages.update(taxonomie_precedente[pk])
+
+    for categorie in categories:
+        pages.add(categorie.get_absolute_url())
+        pages.update(
+            article.get_absolute_url()
+            for article in visibles.filter(categorie=categorie).only('slug')
+        )
+
+    if articles or categories or disparus:
+        # Liste (toutes ses pages), filtres et article en vedette
+        pages.update(pages_liste())
+    return pages
+
+
+# ---------------------------------------------------------------------------
+# Rendu (processus de travail)
+# ---------------------------------------------------------------------------
+
+_rendu = {}
+
+
+class HandlerExport(ClientHandler):
+    """Marque les requêtes de l'export (attribut, pas d'en-tête falsifiable)"""
+
+    def get_response(self, request):
+        request.export_statique = True
+        return super().get_response(request)
+
+
+class ClientExport(Client):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.handler = HandlerExport(enforce_csrf_checks=False)
+
+
+def initialiser_processus(dossier, domaine, securise):
+    """Initialisation d'un processus de travail (aussi en démarrage spawn)"""
+    if not apps.ready:
+        django.setup()
+    _rendu.update(
+        dossier=Path(dossier),
+        client=ClientExport(HTTP_HOST=domaine, raise_request_exception=False),
+        securise=securise,
+    )
+
+
+def fichier_de_page(dossier, chemin):
+    return Path(dossier) / chemin.strip('/') / 'index.html'
+
+
+def rendre(chemin):
+    """Rend la page et l'écrit sur disque : (chemin, code HTTP)"""
+    response = _rendu['client'].get(chemin, secure=_rendu['securise'])
+    if response.status_code == 200:
+        fichier = fichier_de_page(_rendu['dossier'], chemin)
+        fichier.parent.mkdir(parents=True, exist_ok=True)
+        contenu = b''.join(response.streaming_content) if response.streaming else response.content
+        fichier.write_bytes(contenu)
+    return chemin, response.status_code
+
+
+def rendre_pages(chemins, dossier, domaine, securise=True, processus=1):
+    """Rend les pages, en parallèle si processus > 1 (générateur de résultats)"""
+    initargs = (str(dossier), domaine, securise)
+    if processus <= 1:
+        initialiser_processus(*initargs)
+        yield from map(rendre, chemins)
+        return
+
+    # Les processus ouvrent leurs propres connexions
+    connections.close_all()
+    with ProcessPoolExecutor(
+        max_workers=processus,
+        initializer=initialiser_processus,
+        initargs=initargs,
+    ) as executeur:
+        yield from executeur.map(rendre, chemins, chunksize=max(1, len(chemins) // (processus * 8)))
+
+
+# ---------------------------------------------------------------------------
+# Fichiers
+# ---------------------------------------------------------------------------
+
+def lire_etat(dossier):
+    """(date, pages, taxonomie des articles) du dernier export, ou None"""
+    chemin = Path(dossier) / FICHIER_ETAT
+    if not chemin.exists():
+        return None
+    etat = json.loads(chemin.read_text(encoding='utf-8'))
+    return datetime.fromisoformat(etat['date']), set(etat['pages']), etat.get('taxonomie', {})
+
+
+def ecrire_etat(dossier, date, pages, taxonomie):
+    (Path(dossier) / FICHIER_ETAT).write_text(
+        json.dumps({'date': date.isoformat(), 'pages': sorted(pages), 'taxonomie': taxonomie}, indent=2),
+        encoding='utf-8',
+    )
+
+
+def supprimer_page(dossier, chemin):
+    """Supprime index.html et les dossiers devenus vides"""
+    fichier = fichier_de_page(dossier, chemin)
+    fichier.unlink(missing_ok=True)
+    parent = fichier.parent
+    while parent != Path(dossier) and parent.exists() and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
+
+
+def copier_dossier(source, destination):
+    """Copie les fichiers nouveaux ou modifiés (taille, date) ; retourne leur nombre"""
+    source = Path(source)
+    if not source.is_dir():
+        return 0
+    copies = 0
+    for racine, _, fichiers in os.walk(source):
+        for nom in fichiers:
+            origine = Path(racine) / nom
+            cible = Path(destination) / origine.relative_to(source)
+            infos = origine.stat()
+            if cible.exists():
+                actuel = cible.stat()
+                if actuel.st_size == infos.st_size and actuel.st_mtime >= infos.st_mtime:
+                    continue
+            cible.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(origine, cible)
+            copies += 1
+    return copies
+
+
+def copier_ressources(dossier):
+    """Statiques collectés (STATIC_ROOT) et médias ; retourne {dossier: fichiers copiés}"""
+    copies = {}
+    for racine, url in ((settings.STATIC_ROOT, settings.STATIC_URL), (settings.MEDIA_ROOT, settings.MEDIA_URL)):
+        if racine and not url.startswith(('http://', 'https://', '//')):
+            copies[url] = copier_dossier(racine, Path(dossier) / url.strip('/'))
+    return copies
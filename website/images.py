@@ -0,0 +1,200 @@
+"""
+Déclinaisons responsives des images envoyées (couvertures, photos, hero)
+Principe :
+- Pillow génère des variantes AVIF / WebP / JPEG à largeurs fixes
+- Dossier par version du fichier : MEDIA_ROOT/derives/ab/abcdef.../640.webp,
+  empreinte du nom, de la taille et de la date de modification (l'original
+  n'est pas relu ; fichier remplacé = nouveau dossier, jamais de cache périmé)
+- Noms de variantes fixes : deux processus qui génèrent la même image
+  écrivent les mêmes fichiers, la copie renommée par le stockage est retirée
+- Un index.json par image décrit les variantes (pas de relecture de l'original)
+- Génération à l'envoi (post_save) ou au premier affichage (balise de template)
+
+Configuration (settings.py) :
+    IMAGES_RESPONSIVES = {
+        'LARGEURS': (320, 640, 960, 1280, 1920),
+        'QUALITE': 80,
+        'GENERATION': 'envoi',  # 'envoi' ou 'affichage'
+    }
+"""
+
+import hashlib
+import json
+import logging
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+CONFIGURATION_PAR_DEFAUT = {
+    'LARGEURS': (320, 640, 960, 1280, 1920),
+    'QUALITE': 80,
+    'GENERATION': 'envoi',
+}
+
+DOSSIER = 'derives'
+
+# Échec de génération (fichier pas encore écrit, stockage indisponible) :
+# mis en cache brièvement pour ne pas relire l'original à chaque affichage
+DUREE_ECHEC = 300
+
+# Format Pillow, extension, type MIME (du plus léger au plus compatible)
+FORMATS = [
+    ('AVIF', 'avif', 'image/avif'),
+    ('WEBP', 'webp', 'image/webp'),
+    ('JPEG', 'jpg', 'image/jpeg'),
+]
+
+# Largeur de l'image de repli (src) quand le navigateur ignore srcset
+LARGEUR_REPLI = 960
+
+
+def configuration():
+    return {**CONFIGURATION_PAR_DEFAUT, **getattr(settings, 'IMAGES_RESPONSIVES', {})}
+
+
+def formats_disponibles():
+    """AVIF uniquement si Pillow a été compilé avec libavif"""
+    return [
+        (format_pillow, extension, mime)
+        for format_pillow, extension, mime in FORMATS
+        if format_pillow != 'AVIF' or features.check('avif')
+    ]
+
+
+def empreinte(fichier):
+    """SHA-256 du nom, de la taille et de la date de modification de l'image"""
+    nom = fichier.name
+    version = f'{nom}:{default_storage.size(nom)}:{default_storage.get_modified_time(nom).timestamp()}'
+    return hashlib.sha256(version.encode()).hexdigest()
+
+
+def _dossier(hachage):
+    return f'{DOSSIER}/{hachage[:2]}/{hachage}'
+
+
+def _ecrire(chemin, contenu):
+    """
+    Écrit le fichier sous ce nom exact ; s'il a été écrit entre-temps par
+    un autre processus (même contenu), la copie renommée est supprimée
+    """
+    nom = default_storage.save(chemin, ContentFile(contenu))
+    if nom != chemin:
+        default_storage.delete(nom)
+
+
+def _enregistrer_variante(image, chemin, format_pillow, qualite):
+    if format_pillow == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    tampon = BytesIO()
+    image.save(tampon, format_pillow, quality=qualite, optimize=format_pillow == 'JPEG')
+    _ecrire(chemin, tampon.getvalue())
+
+
+def generer(fichier):
+    """
+    Génère les variantes manquantes de l'image et retourne son index :
+    {'largeur': ..., 'hauteur': ..., 'variantes': {ext: [[largeur, url], ...]}}
+    """
+    hachage = empreinte(fichier)
+    dossier = _dossier(hachage)
+    chemin_index = f'{dossier}/index.json'
+
+    if default_storage.exists(chemin_index):
+        with default_storage.open(chemin_index) as index:
+            return json.load(index)
+
+    conf = configuration()
+    fichier.open('rb')
+    try:
+        original = ImageOps.exif_transpose(Image.open(fichier))
+        original.load()
+    finally:
+        fichier.close()
+
+    largeur, hauteur = original.size
+    # Pas d'agrandissement : l'original sert de plus grande variante
+    largeurs = sorted({min(l, largeur) for l in conf['LARGEURS']})
+
+    variantes = {}
+    for format_pillow, extension, _ in formats_disponibles():
+        variantes[extension] = []
+        for cible in largeurs:
+            chemin = f'{dossier}/{cible}.{extension}'
+            if not default_storage.exists(chemin):
+                image = original.resize(
+                    (cible, max(1, round(hauteur * cible / largeur))),
+                    Image.Resampling.LANCZOS
+                )
+                _enregistrer_variante(image, chemin, format_pillow, conf['QUALITE'])
+            variantes[extension].append([cible, default_storage.url(chemin)])
+
+    index = {'largeur': largeur, 'hauteur': hauteur, 'variantes': variantes}
+    # Écrit en dernier : sa présence garantit celle des variantes
+    _ecrire(chemin_index, json.dumps(index).encode())
+    return index
+
+
+def derives(fichier):
+    """
+    Index des variantes d'un champ image (None si l'image est illisible)
+    Mis en cache par nom de fichier : les noms envoyés sont uniques
+    """
+    if not fichier:
+        return None
+
+    cle = f'images:derives:{hashlib.md5(fichier.name.encode()).hexdigest()}'
+    index = cache.get(cle)
+    if index is None:
+        try:
+            index = generer(fichier)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            logger.warning("Variantes impossibles pour %s", fichier.name)
+            cache.set(cle, {}, timeout=DUREE_ECHEC)
+            return None
+        cache.set(cle, index, timeout=None)
+    return index or None
+
+
+def srcset(variantes):
+    """Attribut srcset d'une liste [[largeur, url], ...]"""
+    return ', '.join(f'{url} {largeur}w' for largeur, url in variantes)
+
+
+def repli(variantes):
+    """URL de la plus grande variante JPEG jusqu'à LARGEUR_REPLI (src de <img>)"""
+    jpeg = variantes['jpg']
+    return next((url for largeur, url in reversed(jpeg) if largeur <= LARGEUR_REPLI), jpeg[0][1])
+
+
+def derives_du_media(nom):
+    """
+    Index des variantes d'un fichier de MEDIA_ROOT désigné par son nom
+    (images insérées dans un contenu riche, sans champ image)
+    """
+    if not default_storage.exists(nom):
+        return None
+    fichier = default_storage.open(nom)
+    try:
+        return derives(fichier)
+    finally:
+        fichier.close()
+
+
+def generer_a_l_envoi(*champs):
+    """
+    Fabrique un récepteur post_save qui génère les variantes des champs image
+    (sans effet si GENERATION = 'affichage')
+    """
+    def recepteur(sender, instance, raw=False, **kwargs):
+        if raw or configuration()['GENERATION'] != 'envoi':
+            return
+        for champ in champs:
+            derives(getattr(instance, champ))
+
+    return recepteur
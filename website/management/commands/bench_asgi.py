@@ -0,0 +1,304 @@
+"""
+Banc d'essai WSGI / ASGI sous clients lents
+
+Usage:
+    python manage.py seed_blog
+    python manage.py bench_asgi
+    python manage.py bench_asgi --lents 400 --threads 8 --requetes 300 --sortie bench/asgi.json
+    python manage.py bench_asgi --wsgi-url http://127.0.0.1:8000 --asgi-url http://127.0.0.1:8001
+
+Chaque serveur reçoit en même temps :
+- des clients lents qui envoient leurs en-têtes au compte-gouttes
+  (réseau mobile, connexion saturée) puis lisent la réponse
+- des clients rapides mesurés (débit, latences), comme bench_site
+
+Sans URL, les deux serveurs sont lancés dans des processus séparés :
+- WSGI : aude_web.wsgi sur un serveur à nombre de threads fixe (--threads) ;
+  un thread reste occupé de la lecture de la requête à l'envoi de la
+  réponse, comme les workers synchrones de gunicorn ou uWSGI
+- ASGI : daphne aude_web.asgi (vues async, voir VUES_ASYNC) ; une
+  connexion lente ne coûte qu'un socket dans la boucle d'événements
+"""
+
+import asyncio
+import importlib.util
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from wsgiref.simple_server import WSGIServer
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+
+from aude_web.profilage import centile
+from blog.models import Article
+
+from .bench_site import GestionnaireSilencieux, requete
+
+
+class ServeurWSGIThreads(WSGIServer):
+    """Serveur WSGI à threads fixes : les connexions attendent un thread libre"""
+
+    def __init__(self, adresse, gestionnaire, threads):
+        super().__init__(adresse, gestionnaire)
+        self.executeur = ThreadPoolExecutor(threads)
+
+    def process_request(self, request, client_address):
+        self.executeur.submit(self._traiter, request, client_address)
+
+    def _traiter(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def servir_wsgi(port, threads):
+    """Processus du serveur WSGI (aussi en démarrage spawn)"""
+    if not apps.ready:
+        django.setup()
+    from aude_web.wsgi import application
+
+    serveur = ServeurWSGIThreads(('127.0.0.1', port), GestionnaireSilencieux, threads)
+    serveur.set_app(application)
+    serveur.serve_forever()
+
+
+def port_libre():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def attendre_serveur(hote, port, delai=30):
+    """Attend que le serveur réponde (première requête : chargement des vues)"""
+    limite = time.monotonic() + delai
+    while time.monotonic() < limite:
+        try:
+            requete(hote, port, '/')
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f'Le serveur {hote}:{port} ne répond pas après {delai} s')
+
+
+async def client_lent(hote, port, chemins, entetes, intervalle, arret, compteurs):
+    """Requêtes en boucle, un en-tête toutes les `intervalle` secondes"""
+    # Départs étalés : les clients ne sont pas synchronisés
+    await asyncio.sleep(random.uniform(0, intervalle))
+    while not arret.is_set():
+        ecrivain = None
+        try:
+            lecteur, ecrivain = await asyncio.open_connection(hote, port)
+            ecrivain.write(f'GET {random.choice(chemins)} HTTP/1.1\r\nHost: {hote}:{port}\r\n'.encode())
+            for numero in range(entetes):
+                await asyncio.sleep(intervalle)
+                ecrivain.write(f'X-Lent-{numero}: 1\r\n'.encode())
+                await ecrivain.drain()
+            ecrivain.write(b'Connection: close\r\n\r\n')
+            await ecrivain.drain()
+            await lecteur.read()
+            compteurs['reponses'] += 1
+        except OSError:
+            compteurs['erreurs'] += 1
+            await asyncio.sleep(intervalle)
+        finally:
+            if ecrivain is not None:
+                ecrivain.close()
+
+
+class ClientsLents:
+    """Clients lents dans une boucle d'événements (thread dédié)"""
+
+    def __init__(self, hote, port, chemins, nombre, entetes, intervalle):
+        self.parametres = (hote, port, chemins, entetes, intervalle)
+        self.nombre = nombre
+        self.arret = threading.Event()
+        self.compteurs = {'reponses': 0, 'erreurs': 0}
+        self.thread = threading.Thread(target=asyncio.run, args=(self._executer(),), daemon=True)
+
+    async def _executer(self):
+        taches = [
+            asyncio.create_task(client_lent(*self.parametres, self.arret, self.compteurs))
+            for _ in range(self.nombre)
+        ]
+        while not self.arret.is_set():
+            await asyncio.sleep(0.1)
+        for tache in taches:
+            tache.cancel()
+        await asyncio.gather(*taches, return_exceptions=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.arret.set()
+        self.thread.join(timeout=10)
+
+
+class Command(BaseCommand):
+    help = 'Compare WSGI et ASGI sous charge avec des clients lents'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', help='Serveur WSGI déjà lancé (sinon serveur interne)')
+        parser.add_argument('--asgi-url', help='Serveur ASGI déjà lancé (sinon daphne)')
+        parser.add_argument('--threads', type=int, default=8, help='Threads du serveur WSGI interne')
+        parser.add_argument('--lents', type=int, default=200, help='Clients lents simultanés')
+        parser.add_argument('--entetes', type=int, default=10, help='En-têtes envoyés par un client lent')
+        parser.add_argument('--intervalle', type=float, default=0.5, help='Secondes entre deux en-têtes')
+        parser.add_argument('--concurrence', type=int, default=8, help='Clients rapides mesurés')
+        parser.add_argument('--requetes', type=int, default=200, help='Requêtes mesurées par serveur')
+        parser.add_argument('--sortie', help='Fichier JSON des résultats')
+
+    def handle(self, *args, **options):
+        chemins = self._chemins()
+        serveurs = {
+            'wsgi': options['wsgi_url'] or self._lancer_wsgi,
+            'asgi': options['asgi_url'] or self._lancer_asgi,
+        }
+
+        self.stdout.write(
+            f"🚀 {options['lents']} client(s) lent(s) ({options['entetes']} en-têtes, "
+            f"1 toutes les {options['intervalle']} s), {options['concurrence']} client(s) mesuré(s), "
+            f"{options['requetes']} requête(s)\n"
+        )
+        self.stdout.write(
+            f"{'Serveur':<8} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'erreurs':>8} {'lents servis':>13}"
+        )
+
+        resultats = {}
+        for nom, serveur in serveurs.items():
+            arreter = None
+            if callable(serveur):
+                url, arreter = serveur(options)
+            else:
+                url = serveur
+            try:
+                resultats[nom] = {'url': url, **self._mesurer(urlsplit(url), chemins, options)}
+            finally:
+                if arreter is not None:
+                    arreter()
+            self._afficher(nom, resultats[nom])
+
+        if options['sortie']:
+            rapport = {
+                'date': timezone.now().isoformat(),
+                'options': {cle: options[cle] for cle in (
+                    'threads', 'lents', 'entetes', 'intervalle', 'concurrence', 'requetes'
+                )},
+                'serveurs': resultats,
+            }
+            with open(options['sortie'], 'w', encoding='utf-8') as fichier:
+                json.dump(rapport, fichier, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"\n✅ Résultats enregistrés dans {options['sortie']}"))
+
+    def _chemins(self):
+        """Pages servies par les vues async"""
+        slugs = Article.objects.filter(
+            statut='publie', date_publication__lte=timezone.now()
+        ).order_by('?').values_list('slug', flat=True)[:20]
+        return [
+            reverse('home'),
+            reverse('tarifs'),
+            reverse('blog:article_list'),
+            *(reverse('blog:article_detail', args=[slug]) for slug in slugs),
+        ]
+
+    def _lancer_wsgi(self, options):
+        port = port_libre()
+        # Le processus ouvre ses propres connexions
+        connections.close_all()
+        processus = multiprocessing.Process(
+            target=servir_wsgi, args=(port, options['threads']), daemon=True
+        )
+        processus.start()
+        attendre_serveur('127.0.0.1', port)
+
+        def arreter():
+            processus.terminate()
+            processus.join()
+
+        return f'http://127.0.0.1:{port}', arreter
+
+    def _lancer_asgi(self, options):
+        if importlib.util.find_spec('daphne') is None:
+            raise CommandError("daphne n'est pas installé (pip install daphne) : passer --asgi-url")
+
+        port = port_libre()
+        processus = subprocess.Popen(
+            [sys.executable, '-m', 'daphne', '-b', '127.0.0.1', '-p', str(port), 'aude_web.asgi:application'],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'AUDE_VUES_ASYNC': '1'},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            attendre_serveur('127.0.0.1', port)
+        except CommandError:
+            processus.kill()
+            raise
+
+        def arreter():
+            processus.terminate()
+            processus.wait()
+
+        return f'http://127.0.0.1:{port}', arreter
+
+    def _mesurer(self, adresse, chemins, options):
+        plan = [chemins[i % len(chemins)] for i in range(options['requetes'])]
+
+        def executer(chemin):
+            try:
+                return requete(adresse.hostname, adresse.port, chemin)
+            except OSError:
+                return None
+
+        with ClientsLents(
+            adresse.hostname, adresse.port, chemins,
+            options['lents'], options['entetes'], options['intervalle'],
+        ) as lents:
+            # Tous les clients lents connectés avant la mesure
+            time.sleep(options['intervalle'] * 2)
+            with ThreadPoolExecutor(options['concurrence']) as executeur:
+                debut = time.perf_counter()
+                mesures = list(executeur.map(executer, plan))
+                duree = time.perf_counter() - debut
+
+        reussies = [m for m in mesures if m is not None and m[1] < 400]
+        latences = sorted(m[0] * 1000 for m in reussies)
+        return {
+            'req_s': round(len(reussies) / duree, 1) if duree else 0,
+            'p50_ms': round(centile(latences, 50), 1) if latences else None,
+            'p95_ms': round(centile(latences, 95), 1) if latences else None,
+            'p99_ms': round(centile(latences, 99), 1) if latences else None,
+            'erreurs': len(mesures) - len(reussies),
+            'lents_servis': lents.compteurs['reponses'],
+            'lents_erreurs': lents.compteurs['erreurs'],
+        }
+
+    def _afficher(self, nom, resultat):
+        def ms(valeur):
+            return '-' if valeur is None else f'{valeur:.1f}'
+
+        ligne = (
+            f"{nom:<8} {resultat['req_s']:>8.1f} {ms(resultat['p50_ms']):>9} "
+            f"{ms(resultat['p95_ms']):>9} {ms(resultat['p99_ms']):>9} "
+            f"{resultat['erreurs']:>8} {resultat['lents_servis']:>13}"
+        )
+        self.stdout.write(self.style.ERROR(ligne) if resultat['erreurs'] else ligne)
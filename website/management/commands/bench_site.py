@@ -0,0 +1,229 @@
+"""
+Banc d'essai de charge du site public (débit, latences, requêtes SQL)
+
+Usage:
+    python manage.py seed_blog
+    python manage.py bench_site
+    python manage.py bench_site --concurrence 16 --requetes 500 --sortie bench/avant.json
+    python manage.py bench_site --url http://127.0.0.1:8000 --comparer bench/avant.json
+
+Sans --url, l'application WSGI (aude_web.wsgi) est servie dans le processus
+par un serveur wsgiref multi-thread : pratique pour comparer deux commits,
+mais le client et le serveur partagent le GIL. Pour des chiffres absolus,
+lancer gunicorn / daphne (aude_web.asgi) et passer --url.
+
+Le nombre de requêtes SQL par requête HTTP est lu dans l'en-tête
+Server-Timing (voir aude_web/profilage.py).
+"""
+
+import json
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from socketserver import ThreadingMixIn
+from urllib.parse import urlencode, urlsplit
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import timezone
+
+from aude_web.profilage import centile
+from blog.models import Article, Categorie, Tag
+
+REQUETES_SQL = re.compile(r'sql;desc="(\d+)')
+
+
+class ServeurWSGI(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class GestionnaireSilencieux(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def demarrer_serveur():
+    """Sert aude_web.wsgi sur un port libre ; retourne (serveur, url)"""
+    from aude_web.wsgi import application
+
+    serveur = make_server(
+        '127.0.0.1', 0, application,
+        server_class=ServeurWSGI, handler_class=GestionnaireSilencieux
+    )
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    return serveur, f'http://127.0.0.1:{serveur.server_port}'
+
+
+def requete(hote, port, chemin):
+    """GET complet (corps lu) ; retourne (durée en s, statut, requêtes SQL)"""
+    debut = time.perf_counter()
+    connexion = HTTPConnection(hote, port, timeout=30)
+    try:
+        connexion.request('GET', chemin)
+        reponse = connexion.getresponse()
+        reponse.read()
+        statut = reponse.status
+        requetes_sql = REQUETES_SQL.search(reponse.getheader('Server-Timing') or '')
+    finally:
+        connexion.close()
+    return time.perf_counter() - debut, statut, int(requetes_sql[1]) if requetes_sql else None
+
+
+class Command(BaseCommand):
+    help = 'Mesure débit et latences des principales pages sous charge'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Serveur déjà lancé (sinon serveur WSGI interne)')
+        parser.add_argument('--concurrence', type=int, default=8, help='Clients simultanés')
+        parser.add_argument('--requetes', type=int, default=200, help='Requêtes par scénario')
+        parser.add_argument('--echauffement', type=int, default=10, help='Requêtes ignorées par scénario')
+        parser.add_argument('--scenario', action='append', dest='scenarios', help='Scénario à exécuter (répétable)')
+        parser.add_argument('--sortie', help='Fichier JSON des résultats')
+        parser.add_argument('--comparer', help='Résultats JSON de référence')
+
+    def handle(self, *args, **options):
+        scenarios = self._scenarios()
+        if options['scenarios']:
+            inconnus = set(options['scenarios']) - set(scenarios)
+            if inconnus:
+                raise CommandError(f"Scénario(s) inconnu(s) : {', '.join(sorted(inconnus))}")
+            scenarios = {nom: scenarios[nom] for nom in options['scenarios']}
+
+        serveur = None
+        url = options['url']
+        if not url:
+            serveur, url = demarrer_serveur()
+        adresse = urlsplit(url)
+
+        self.stdout.write(
+            f"🚀 {url} : {options['concurrence']} client(s), "
+            f"{options['requetes']} requête(s) par scénario\n"
+        )
+        self.stdout.write(
+            f"{'Scénario':<22} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'SQL':>6} {'erreurs':>8}"
+        )
+
+        resultats = {}
+        try:
+            for nom, chemins in scenarios.items():
+                resultats[nom] = self._executer(adresse, chemins, options)
+                self._afficher(nom, resultats[nom])
+        finally:
+            if serveur is not None:
+                serveur.shutdown()
+
+        rapport = {
+            'date': timezone.now().isoformat(),
+            'commit': self._commit(),
+            'url': url if options['url'] else 'wsgi interne',
+            'concurrence': options['concurrence'],
+            'requetes': options['requetes'],
+            'scenarios': resultats,
+        }
+
+        if options['comparer']:
+            self._comparer(options['comparer'], resultats)
+
+        if options['sortie']:
+            with open(options['sortie'], 'w', encoding='utf-8') as fichier:
+                json.dump(rapport, fichier, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"\n✅ Résultats enregistrés dans {options['sortie']}"))
+
+    def _scenarios(self):
+        """Nom -> chemins parcourus en boucle (plusieurs URL : cache moins favorable)"""
+        articles = Article.objects.filter(statut='publie', date_publication__lte=timezone.now())
+        slugs = list(articles.order_by('?').values_list('slug', flat=True)[:50])
+        categorie = Categorie.objects.filter(articles__in=articles).values_list('slug', flat=True).first()
+        tag = Tag.objects.filter(articles__in=articles).values_list('slug', flat=True).first()
+        liste = reverse('blog:article_list')
+
+        scenarios = {
+            'home': [reverse('home')],
+            'tarifs': [reverse('tarifs')],
+            'blog_liste': [liste],
+            'blog_liste_page_5': [f"{liste}?{urlencode({'page': 5})}"],
+            'blog_recherche': [f"{liste}?{urlencode({'q': mot})}" for mot in ('béton', 'chantier', 'bim', 'énergie solaire')],
+            'article_detail': [reverse('blog:article_detail', args=[slug]) for slug in slugs],
+        }
+        if categorie:
+            scenarios['blog_categorie'] = [f"{liste}?{urlencode({'categorie': categorie})}"]
+        if tag:
+            scenarios['blog_tag'] = [f"{liste}?{urlencode({'tag': tag})}"]
+        return {nom: chemins for nom, chemins in scenarios.items() if chemins}
+
+    def _executer(self, adresse, chemins, options):
+        total = options['echauffement'] + options['requetes']
+        plan = [chemins[i % len(chemins)] for i in range(total)]
+
+        def executer(chemin):
+            try:
+                return requete(adresse.hostname, adresse.port, chemin)
+            except OSError:
+                return None
+
+        with ThreadPoolExecutor(options['concurrence']) as executeur:
+            list(executeur.map(executer, plan[:options['echauffement']]))
+            debut = time.perf_counter()
+            mesures = list(executeur.map(executer, plan[options['echauffement']:]))
+            duree = time.perf_counter() - debut
+
+        reussies = [m for m in mesures if m is not None and m[1] < 400]
+        latences = sorted(m[0] * 1000 for m in reussies)
+        requetes_sql = [m[2] for m in reussies if m[2] is not None]
+        return {
+            'req_s': round(len(reussies) / duree, 1) if duree else 0,
+            'p50_ms': round(centile(latences, 50), 1) if latences else None,
+            'p95_ms': round(centile(latences, 95), 1) if latences else None,
+            'p99_ms': round(centile(latences, 99), 1) if latences else None,
+            'requetes_sql': round(sum(requetes_sql) / len(requetes_sql), 1) if requetes_sql else None,
+            'erreurs': len(mesures) - len(reussies),
+        }
+
+    def _afficher(self, nom, resultat):
+        def ms(valeur):
+            return '-' if valeur is None else f'{valeur:.1f}'
+
+        ligne = (
+            f"{nom:<22} {resultat['req_s']:>8.1f} {ms(resultat['p50_ms']):>9} "
+            f"{ms(resultat['p95_ms']):>9} {ms(resultat['p99_ms']):>9} "
+            f"{ms(resultat['requetes_sql']):>6} {resultat['erreurs']:>8}"
+        )
+        self.stdout.write(self.style.ERROR(ligne) if resultat['erreurs'] else ligne)
+
+    def _comparer(self, chemin, resultats):
+        """Écart en % par rapport à une exécution précédente"""
+        with open(chemin, encoding='utf-8') as fichier:
+            reference = json.load(fichier)
+
+        self.stdout.write(f"\n📊 Comparaison avec {chemin} ({reference.get('commit') or '?'})")
+        self.stdout.write(f"{'Scénario':<22} {'req/s':>10} {'p95':>10} {'SQL':>10}")
+        for nom, resultat in resultats.items():
+            ancien = reference['scenarios'].get(nom)
+            if not ancien:
+                continue
+            self.stdout.write(
+                f"{nom:<22} {self._ecart(ancien['req_s'], resultat['req_s']):>10} "
+                f"{self._ecart(ancien['p95_ms'], resultat['p95_ms']):>10} "
+                f"{self._ecart(ancien['requetes_sql'], resultat['requetes_sql']):>10}"
+            )
+
+    @staticmethod
+    def _ecart(ancien, nouveau):
+        if not ancien or nouveau is None:
+            return '-'
+        return f'{(nouveau - ancien) * 100 / ancien:+.1f} %'
+
+    @staticmethod
+    def _commit():
+        """Commit courant (pour retrouver la version mesurée)"""
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,37 @@
+"""
+collectstatic précédé de l'extraction du CSS critique
+
+Usage:
+    python manage.py vendoriser_statiques
+    python manage.py collectstatic --noinput
+    python manage.py collectstatic --noinput --sans-css-critique
+
+Remplace la commande de django.contrib.staticfiles ('website' est placé
+avant elle dans INSTALLED_APPS) : static/css/critique est régénéré à
+partir des templates et des feuilles du moment, puis collecté avec le
+reste. Les pages sont rendues : la base doit être migrée.
+"""
+
+from django.contrib.staticfiles.management.commands import collectstatic
+from django.core.management import call_command
+
+
+class Command(collectstatic.Command):
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--sans-css-critique',
+            action='store_true',
+            help="Collecte sans extraire à nouveau le CSS critique",
+        )
+
+    def handle(self, **options):
+        if not options['dry_run'] and not options['sans_css_critique']:
+            call_command(
+                'extraire_css_critique',
+                stdout=self.stdout,
+                stderr=self.stderr,
+                verbosity=options['verbosity'],
+            )
+        return super().handle(**options)
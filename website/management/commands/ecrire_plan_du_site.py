@@ -0,0 +1,47 @@
+"""
+Écriture du plan du site (sitemap.xml + tranches) sur disque
+
+Usage:
+    python manage.py ecrire_plan_du_site --domaine www.aude.fr --dossier /var/www/aude
+    python manage.py ecrire_plan_du_site --domaine localhost:8000 --protocole http --dossier public
+
+Les fichiers portent les mêmes noms que les URL servies par Django
+(/sitemap.xml, /sitemap-articles-0.xml...) : le serveur web peut les
+servir directement depuis le dossier. Seuls les fichiers dont le contenu
+change sont réécrits.
+
+Le contenu vient du cache du plan du site : avec un cache partagé
+(AUDE_CACHE_URL, voir aude_web/caches.py), seules les tranches modifiées
+depuis le dernier passage sont recalculées ; avec LocMemCache, le cache
+est propre au processus de la commande et toutes les tranches sont
+recalculées.
+"""
+
+from django.core.management.base import BaseCommand
+
+from aude_web import plan_du_site
+from aude_web.urls import SITEMAPS
+
+
+class Command(BaseCommand):
+    help = 'Écrit sitemap.xml et ses tranches dans un dossier'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dossier', required=True, help='Dossier de destination')
+        parser.add_argument('--domaine', required=True, help='Domaine des URL (ex: www.aude.fr)')
+        parser.add_argument('--protocole', default='https', choices=['http', 'https'])
+
+    def handle(self, *args, **options):
+        ecrits, inchanges, supprimes = plan_du_site.ecrire(
+            SITEMAPS, options['dossier'], options['domaine'], options['protocole']
+        )
+
+        for chemin in ecrits:
+            self.stdout.write(f'  ✅ {chemin.name}')
+        for chemin in supprimes:
+            self.stdout.write(f'  🗑️  {chemin.name}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Plan du site : {len(ecrits)} fichier(s) écrit(s), '
+            f'{len(inchanges)} inchangé(s), {len(supprimes)} supprimé(s)'
+        ))
@@ -0,0 +1,95 @@
+"""
+Export statique du site public
+
+Usage:
+    python manage.py collectstatic --noinput
+    python manage.py exporter_site export/ --domaine www.aude.fr
+    python manage.py exporter_site export/ --domaine www.aude.fr --incremental
+    python manage.py exporter_site export/ --domaine localhost:8000 --protocole http --processus 1
+
+Le domaine doit faire partie de ALLOWED_HOSTS. Les statiques sont copiés
+depuis STATIC_ROOT (collectstatic préalable), les médias depuis MEDIA_ROOT,
+et le plan du site est écrit à la racine du dossier.
+Voir website/export.py pour le principe et les limites du mode incrémental.
+"""
+
+import os
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from aude_web import plan_du_site
+from aude_web.urls import SITEMAPS
+from website import export
+
+
+class Command(BaseCommand):
+    help = 'Exporte le site public en HTML statique'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dossier', help='Dossier de destination')
+        parser.add_argument('--domaine', default='localhost', help='Domaine du site (ex: www.aude.fr)')
+        parser.add_argument('--protocole', default='https', choices=['http', 'https'])
+        parser.add_argument(
+            '--processus',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Nombre de processus de rendu (défaut : nombre de processeurs)',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Ne rend que les pages modifiées depuis le dernier export',
+        )
+
+    def handle(self, *args, **options):
+        dossier = Path(options['dossier'])
+        dossier.mkdir(parents=True, exist_ok=True)
+        debut_export = timezone.now()
+        debut = time.perf_counter()
+
+        pages = export.pages_publiques()
+        taxonomie = export.taxonomie_articles()
+        etat = export.lire_etat(dossier)
+        precedentes = etat[1] if etat else set()
+        obsoletes = precedentes - pages
+        if options['incremental'] and etat is not None:
+            a_rendre = (export.pages_modifiees(etat[0], etat[2]) & pages) | (pages - precedentes)
+        else:
+            if options['incremental']:
+                self.stdout.write(self.style.WARNING('⚠️  Aucun export précédent : export complet'))
+            a_rendre = pages
+
+        self.stdout.write(f'🔄 {len(a_rendre)} page(s) à rendre sur {len(pages)}...')
+        exportees = (precedentes & pages) - a_rendre
+        erreurs = 0
+        for chemin, code in export.rendre_pages(
+            sorted(a_rendre),
+            dossier,
+            options['domaine'],
+            securise=options['protocole'] == 'https',
+            processus=options['processus'],
+        ):
+            if code == 200:
+                exportees.add(chemin)
+            else:
+                erreurs += 1
+                self.stdout.write(self.style.WARNING(f'  ⚠️  {chemin} ({code})'))
+
+        for chemin in obsoletes:
+            export.supprimer_page(dossier, chemin)
+            self.stdout.write(f'  🗑️  {chemin}')
+
+        copies = export.copier_ressources(dossier)
+        for url, nombre in copies.items():
+            self.stdout.write(f'  📁 {url} : {nombre} fichier(s) copié(s)')
+
+        plan_du_site.ecrire(SITEMAPS, dossier, options['domaine'], options['protocole'])
+        export.ecrire_etat(dossier, debut_export, exportees, taxonomie)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {len(a_rendre) - erreurs} page(s) rendue(s), {len(obsoletes)} supprimée(s), '
+            f'{erreurs} erreur(s) en {time.perf_counter() - debut:.1f} s'
+        ))
@@ -0,0 +1,116 @@
+"""
+Extraction du CSS critique de chaque page publique
+
+Usage:
+    python manage.py vendoriser_statiques
+    python manage.py extraire_css_critique
+    python manage.py extraire_css_critique --sections 3
+
+Chaque page est rendue, les règles CSS qui s'appliquent à sa partie visible
+au chargement sont écrites dans static/css/critique/<page>.css et insérées
+dans <head> par {% css_critique %}. collectstatic lance cette extraction
+avant la collecte (website/management/commands/collectstatic.py) : le CSS
+critique déployé suit toujours les templates et css/style.css.
+"""
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from blog.models import Article
+from website import css_critique, urls
+
+
+def pages_publiques():
+    """(nom de la page, chemin) des pages vitrine et du blog"""
+    for pattern in urls.urlpatterns:
+        yield pattern.name, reverse(pattern.name)
+
+    yield 'blog:article_list', reverse('blog:article_list')
+
+    article = Article.objects.filter(
+        statut='publie',
+        date_publication__lte=timezone.now()
+    ).order_by('-date_publication').first()
+    if article is not None:
+        yield 'blog:article_detail', article.get_absolute_url()
+
+
+def hote():
+    """Nom d'hôte accepté par ALLOWED_HOSTS (liens absolus des pages)"""
+    for nom in settings.ALLOWED_HOSTS:
+        if nom != '*' and not nom.startswith('.'):
+            return nom
+    return 'localhost'
+
+
+class Command(BaseCommand):
+    help = 'Extrait le CSS critique (au-dessus de la ligne de flottaison) de chaque page'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sections',
+            type=int,
+            default=2,
+            help='Nombre de <section> considérées visibles au chargement (défaut : 2)',
+        )
+
+    def handle(self, *args, **options):
+        feuilles = {}
+        for chemin in css_critique.FEUILLES:
+            fichier = finders.find(chemin)
+            if fichier is None:
+                self.stdout.write(self.style.WARNING(f'  ⚠️  {chemin} introuvable (CDN) : ignorée'))
+                continue
+            feuilles[chemin] = Path(fichier).read_text(encoding='utf-8')
+        if not feuilles:
+            raise CommandError('Aucune feuille de style locale à analyser')
+        taille_complete = sum(len(css.encode()) for css in feuilles.values())
+
+        sortie = css_critique.dossier_sortie()
+        sortie.mkdir(parents=True, exist_ok=True)
+        factory = RequestFactory(SERVER_NAME=hote())
+        index = {}
+        # URL statiques sans manifeste : il n'existe pas encore au premier
+        # déploiement (collectstatic n'a pas tourné)
+        sans_manifeste = override_settings(STORAGES={
+            **settings.STORAGES,
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        })
+
+        with sans_manifeste:
+            for page, chemin in pages_publiques():
+                request = factory.get(chemin)
+                request.resolver_match = resolve(chemin)
+                response = request.resolver_match.func(
+                    request, *request.resolver_match.args, **request.resolver_match.kwargs
+                )
+                if hasattr(response, 'render'):
+                    response.render()
+                if response.status_code != 200:
+                    self.stdout.write(self.style.WARNING(f'  ⚠️  {chemin} ({response.status_code})'))
+                    continue
+
+                css = css_critique.extraire(
+                    response.content.decode(response.charset),
+                    feuilles.values(),
+                    sections=options['sections'],
+                )
+                (sortie / f'{css_critique.nom_fichier(page)}.css').write_text(css, encoding='utf-8')
+                index[page] = list(feuilles)
+                self.stdout.write(
+                    f'  ✅ {chemin} : {len(css.encode()) // 1024} Ko en ligne '
+                    f'(feuilles complètes : {taille_complete // 1024} Ko)'
+                )
+
+        (sortie / 'index.json').write_text(json.dumps(index, indent=2), encoding='utf-8')
+        css_critique.index.cache_clear()
+        css_critique.css_de_page.cache_clear()
+
+        self.stdout.write(self.style.SUCCESS(f'✅ CSS critique de {len(index)} pages dans {sortie}'))
@@ -0,0 +1,134 @@
+"""
+Copie en masse des données d'un fichier SQLite vers la base configurée
+
+Usage:
+    # 1. Créer le schéma dans la nouvelle base
+    AUDE_DB_MOTEUR=postgresql AUDE_DB_NOM=aude_web AUDE_DB_HOTE=localhost \\
+        AUDE_DB_UTILISATEUR=aude AUDE_DB_MOT_DE_PASSE=... python manage.py migrate
+
+    # 2. Copier les données (mêmes variables d'environnement)
+    AUDE_DB_MOTEUR=postgresql ... python manage.py migrer_depuis_sqlite
+    AUDE_DB_MOTEUR=postgresql AUDE_DB_SOURCE=/sauvegardes/db.sqlite3 ... python manage.py migrer_depuis_sqlite
+
+Principe :
+- Le fichier source est l'alias 'sqlite_source' de DATABASES
+  (AUDE_DB_SOURCE, défaut : db.sqlite3, voir aude_web/base_de_donnees.py)
+- Les tables de la base cible sont vidées (contenttypes et permissions
+  créés par migrate compris), puis remplies par bulk_create en conservant
+  les clés primaires, dans l'ordre des dépendances (clés étrangères)
+- Tout est fait dans une seule transaction : en cas d'erreur, la base
+  cible reste inchangée
+- Les séquences d'identifiants sont recalées, puis l'index de recherche
+  est reconstruit pour le moteur cible
+"""
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+
+from aude_web.base_de_donnees import ALIAS_SOURCE_SQLITE as ALIAS_SOURCE
+
+# Objets copiés par requête INSERT
+TAILLE_LOT = 1000
+
+
+def ordre_dependances(modeles):
+    """Tri topologique : un modèle après ceux vers lesquels il pointe"""
+    restants = list(modeles)
+    ordonnes = []
+    while restants:
+        for modele in restants:
+            cibles = {
+                champ.related_model._meta.concrete_model
+                for champ in modele._meta.concrete_fields
+                if champ.is_relation and champ.related_model is not None
+            }
+            cibles.discard(modele)
+            if not cibles & set(restants):
+                ordonnes.append(modele)
+                restants.remove(modele)
+                break
+        else:
+            # Cycle de clés étrangères : ordre d'origine pour le reste
+            ordonnes.extend(restants)
+            break
+    return ordonnes
+
+
+class Command(BaseCommand):
+    help = 'Copie toutes les données d\'un fichier SQLite vers la base par défaut'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sans-index',
+            action='store_true',
+            help='Ne pas reconstruire l\'index de recherche',
+        )
+
+    def handle(self, *args, **options):
+        cible = connections[DEFAULT_DB_ALIAS]
+        fichier_source = str(connections[ALIAS_SOURCE].settings_dict['NAME'])
+        if cible.vendor == 'sqlite' and str(cible.settings_dict['NAME']) == fichier_source:
+            raise CommandError(
+                'La base cible est le fichier source : définir AUDE_DB_MOTEUR / AUDE_DB_NOM'
+            )
+
+        modeles = ordre_dependances([
+            modele for modele in apps.get_models(include_auto_created=True)
+            if modele._meta.managed and not modele._meta.proxy
+            and router.allow_migrate_model(DEFAULT_DB_ALIAS, modele)
+        ])
+
+        self.stdout.write("\n" + "="*60)
+        self.stdout.write(self.style.SUCCESS(
+            f"🚀 COPIE {fichier_source} → {cible.vendor} ({cible.settings_dict['NAME']})"
+        ))
+        self.stdout.write("="*60 + "\n")
+
+        try:
+            with transaction.atomic(using=DEFAULT_DB_ALIAS):
+                self.stdout.write(self.style.WARNING('⚠️  Vidage des tables cibles...'))
+                cible.ops.execute_sql_flush(cible.ops.sql_flush(
+                    no_style(),
+                    [modele._meta.db_table for modele in modeles],
+                    allow_cascade=True,
+                ))
+
+                total = 0
+                for modele in modeles:
+                    total += self._copier(modele)
+
+                # Prochains identifiants après les clés copiées (PostgreSQL)
+                with cible.cursor() as curseur:
+                    for requete in cible.ops.sequence_reset_sql(no_style(), modeles):
+                        curseur.execute(requete)
+        finally:
+            connections[ALIAS_SOURCE].close()
+
+        if not options['sans_index']:
+            call_command('reindexer_recherche', stdout=self.stdout)
+
+        self.stdout.write("\n" + "="*60)
+        self.stdout.write(self.style.SUCCESS(f'✅ {total} ligne(s) copiée(s) ({len(modeles)} tables)'))
+        self.stdout.write("="*60 + "\n")
+
+    def _copier(self, modele):
+        lignes = modele._base_manager.using(ALIAS_SOURCE).order_by('pk').iterator(chunk_size=TAILLE_LOT)
+
+        nombre = 0
+        lot = []
+        for objet in lignes:
+            lot.append(objet)
+            if len(lot) == TAILLE_LOT:
+                modele._base_manager.using(DEFAULT_DB_ALIAS).bulk_create(lot)
+                nombre += len(lot)
+                lot = []
+        if lot:
+            modele._base_manager.using(DEFAULT_DB_ALIAS).bulk_create(lot)
+            nombre += len(lot)
+
+        if nombre:
+            self.stdout.write(f'  ✅ {modele._meta.label} : {nombre}')
+        return nombre
@@ -0,0 +1,40 @@
+"""
+Commande de préchauffage du cache des pages vitrine
+
+Usage:
+    python manage.py prechauffer_pages
+
+À utiliser avec un cache partagé entre processus (fichiers, redis, memcached) :
+avec LocMemCache, seul le cache du processus de la commande serait rempli.
+"""
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import reverse
+
+from website import urls
+
+
+class Command(BaseCommand):
+    help = 'Rend et met en cache les pages vitrine'
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+
+        for pattern in urls.urlpatterns:
+            vue = pattern.callback
+            if not getattr(vue, 'page_en_cache', None):
+                continue
+
+            chemin = reverse(pattern.name)
+            if iscoroutinefunction(vue):
+                # Vues async (VUES_ASYNC)
+                vue = async_to_sync(vue)
+            response = vue(factory.get(chemin))
+            if response.status_code == 200:
+                self.stdout.write(f'  ✅ {chemin}')
+            else:
+                self.stdout.write(self.style.WARNING(f'  ⚠️  {chemin} ({response.status_code})'))
+
+        self.stdout.write(self.style.SUCCESS('✅ Cache des pages préchauffé'))
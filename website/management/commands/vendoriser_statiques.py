@@ -0,0 +1,64 @@
+"""
+Copie locale des dépendances front (Bootstrap, Bootstrap Icons)
+
+Usage:
+    python manage.py vendoriser_statiques
+    python manage.py vendoriser_statiques --forcer  (télécharge à nouveau)
+    python manage.py collectstatic --noinput
+
+Les fichiers sont téléchargés depuis le CDN dans static/vendor/ puis servis
+par WhiteNoise avec le reste des statiques. Tant qu'un fichier n'est pas
+présent, la balise {% statique_tierce %} continue de pointer vers le CDN
+(développement) et collectstatic échoue (déploiement, voir
+aude_web/statiques.py).
+"""
+
+import re
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from aude_web.statiques import FICHIERS_TIERS, chemin_tiers, url_cdn
+
+# Les cartes de sources (.map) ne sont pas copiées : le manifeste
+# échouerait sur la référence manquante
+SOURCE_MAP = re.compile(rb'\n?(/\*# sourceMappingURL=[^*]*\*/|//# sourceMappingURL=\S*)\s*$')
+
+
+class Command(BaseCommand):
+    help = 'Télécharge Bootstrap et Bootstrap Icons dans static/vendor'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--forcer',
+            action='store_true',
+            help='Télécharge à nouveau les fichiers déjà présents',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.STATICFILES_DIRS:
+            raise CommandError('STATICFILES_DIRS est vide')
+        racine = Path(settings.STATICFILES_DIRS[0])
+
+        for fichier in FICHIERS_TIERS:
+            destination = racine / chemin_tiers(fichier)
+            if destination.exists() and not options['forcer']:
+                self.stdout.write(f'  ⏭️  {fichier}')
+                continue
+
+            try:
+                with urlopen(url_cdn(fichier), timeout=30) as reponse:
+                    contenu = reponse.read()
+            except OSError as erreur:
+                raise CommandError(f'Téléchargement impossible de {fichier} : {erreur}')
+
+            if fichier.endswith(('.css', '.js')):
+                contenu = SOURCE_MAP.sub(b'\n', contenu)
+
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            destination.write_bytes(contenu)
+            self.stdout.write(f'  ✅ {fichier} ({len(contenu) // 1024} Ko)')
+
+        self.stdout.write(self.style.SUCCESS('✅ Dépendances copiées dans static/vendor'))
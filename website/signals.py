@@ -0,0 +1,50 @@
+"""
+Signaux du site vitrine
+- Invalidation du cache des pages à chaque modification dans l'admin
+- Invalidation de la section pages du plan du site
+- Génération des variantes responsives des images envoyées
+"""
+
+from django.db.models.signals import post_save, post_delete
+
+from aude_web import plan_du_site
+
+from . import views  # noqa: F401  (enregistre les pages en cache)
+from .cache_pages import PAGES, invalider_page, pages_dependantes
+from .images import generer_a_l_envoi
+from .models import AboutHero, HeroSection, Testimonial
+from .sitemaps import PagesSitemap
+
+
+def invalider_pages_dependantes(sender, raw=False, **kwargs):
+    """Invalide les pages qui affichent le modèle modifié (pas pendant loaddata)"""
+    if raw:
+        return
+    for page in pages_dependantes(sender):
+        invalider_page(page)
+
+
+def invalider_plan_pages(sender, raw=False, **kwargs):
+    """lastmod des pages vitrine dans le plan du site"""
+    if raw:
+        return
+    plan_du_site.invalider(PagesSitemap.section)
+
+
+def connecter_signaux():
+    modeles = set().union(*PAGES.values())
+    for modele in modeles:
+        uid = f'website_cache_pages_{modele._meta.label_lower}'
+        post_save.connect(invalider_pages_dependantes, sender=modele, dispatch_uid=uid)
+        post_delete.connect(invalider_pages_dependantes, sender=modele, dispatch_uid=uid)
+        uid = f'website_plan_du_site_{modele._meta.label_lower}'
+        post_save.connect(invalider_plan_pages, sender=modele, dispatch_uid=uid)
+        post_delete.connect(invalider_plan_pages, sender=modele, dispatch_uid=uid)
+
+    for modele, champ in ((HeroSection, 'image'), (AboutHero, 'image'), (Testimonial, 'photo')):
+        post_save.connect(
+            generer_a_l_envoi(champ),
+            sender=modele,
+            weak=False,
+            dispatch_uid=f'website_images_{modele._meta.label_lower}',
+        )
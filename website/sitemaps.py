@@ -0,0 +1,43 @@
+"""
+Section du plan du site pour les pages vitrine (voir aude_web/plan_du_site.py)
+lastmod = dernière modification (updated_at) des contenus affichés par la page
+"""
+
+from django.db.models import Max
+from django.urls import reverse
+
+from aude_web.plan_du_site import SitemapParTranches
+
+from . import urls
+from .cache_pages import PAGES
+
+
+def _derniere_modification(modeles):
+    dates = [
+        modele.objects.aggregate(date=Max('updated_at'))['date']
+        for modele in modeles
+        if any(champ.name == 'updated_at' for champ in modele._meta.fields)
+    ]
+    dates = [date for date in dates if date is not None]
+    return max(dates) if dates else None
+
+
+class PagesSitemap(SitemapParTranches):
+    section = 'pages'
+
+    def objets(self):
+        """Motifs d'URL des pages vitrine (une seule tranche, pas de queryset)"""
+        return list(urls.urlpatterns)
+
+    def items(self):
+        return self.objets() if self.tranche == 0 else []
+
+    def location(self, pattern):
+        return reverse(pattern.name)
+
+    def lastmod(self, pattern):
+        return _derniere_modification(PAGES.get(getattr(pattern.callback, 'page_en_cache', None), ()))
+
+    def tranches(self):
+        dates = [date for date in map(self.lastmod, self.items()) if date is not None]
+        return [(0, max(dates, default=None))]
@@ -0,0 +1,58 @@
+"""
+CSS critique en ligne et feuilles de style différées
+
+Usage :
+    {% load css_critique %}
+    {% css_critique %}
+    {% feuille_de_style 'css/style.css' %}
+    {% feuille_de_style 'bootstrap/5.3.0/css/bootstrap.min.css' tierce=True %}
+
+{% css_critique %} insère le CSS extrait pour la page en cours
+(commande extraire_css_critique). Une feuille prise en compte dans ce
+CSS est chargée en différé (preload + onload, <noscript> en secours) :
+elle ne bloque plus le premier rendu. Sans extraction pour la page,
+les feuilles restent des <link rel="stylesheet"> classiques.
+"""
+
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from aude_web.statiques import chemin_tiers
+from website import css_critique as critique
+from website.templatetags.statiques import statique_tierce
+
+register = template.Library()
+
+
+def _page(context):
+    request = context.get('request')
+    correspondance = getattr(request, 'resolver_match', None)
+    return correspondance.view_name if correspondance else None
+
+
+@register.simple_tag(takes_context=True)
+def css_critique(context):
+    page = _page(context)
+    css = critique.css_de_page(page) if page else None
+    if not css:
+        return ''
+    # Fichier généré à partir des feuilles du projet : pas d'échappement
+    return format_html('<style>{}</style>', mark_safe(css))
+
+
+@register.simple_tag(takes_context=True)
+def feuille_de_style(context, fichier, tierce=False):
+    if tierce:
+        chemin, url = chemin_tiers(fichier), statique_tierce(fichier)
+    else:
+        chemin, url = fichier, static(fichier)
+
+    if chemin not in critique.index().get(_page(context), ()):
+        return format_html('<link rel="stylesheet" href="{}">', url)
+    return format_html(
+        '<link rel="preload" href="{0}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        '<noscript><link rel="stylesheet" href="{0}"></noscript>',
+        url
+    )
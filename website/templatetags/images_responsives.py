@@ -0,0 +1,50 @@
+"""
+Balise d'image responsive (srcset / sizes / width / height)
+
+Usage :
+    {% load images_responsives %}
+    {% image_responsive article.image_couverture alt=article.titre sizes="(min-width: 992px) 33vw, 100vw" class="img-fluid" %}
+
+Génère un <picture> avec une source par format (AVIF, WebP) et un <img>
+JPEG de repli. Si l'image ne peut pas être déclinée, un simple <img> est rendu.
+"""
+
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from website.images import derives, repli, srcset
+
+register = template.Library()
+
+
+@register.simple_tag
+def image_responsive(fichier, alt='', sizes='100vw', loading='lazy', **attributs):
+    """
+    Attributs supplémentaires (class, style, onmouseover...) recopiés sur <img>
+    loading="eager" pour une image visible au chargement (LCP)
+    """
+    if not fichier:
+        return ''
+
+    attributs_img = format_html_join(
+        '', ' {}="{}"', ((nom, valeur) for nom, valeur in attributs.items())
+    )
+    index = derives(fichier)
+
+    if index is None:
+        return format_html(
+            '<img src="{}" alt="{}" loading="{}" decoding="async"{}>',
+            fichier.url, alt, loading, attributs_img
+        )
+
+    variantes = index['variantes']
+    sources = format_html_join(
+        '', '<source type="image/{}" srcset="{}" sizes="{}">',
+        ((extension, srcset(liste), sizes) for extension, liste in variantes.items() if extension != 'jpg')
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" '
+        'alt="{}" loading="{}" decoding="async"{}></picture>',
+        sources, repli(variantes), srcset(variantes['jpg']), sizes, index['largeur'], index['hauteur'],
+        alt, loading, attributs_img
+    )
@@ -0,0 +1,33 @@
+"""
+Dépendances front servies localement si elles ont été copiées
+
+Usage :
+    {% load statiques %}
+    <link href="{% statique_tierce 'bootstrap/5.3.0/css/bootstrap.min.css' %}" rel="stylesheet">
+
+URL du fichier sous static/vendor (nom haché en production) si la commande
+vendoriser_statiques l'a téléchargé, sinon URL du CDN.
+"""
+
+from functools import lru_cache
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+from aude_web.statiques import chemin_tiers, url_cdn
+
+register = template.Library()
+
+
+@lru_cache(maxsize=None)
+def _est_copie(chemin):
+    return finders.find(chemin) is not None
+
+
+@register.simple_tag
+def statique_tierce(fichier):
+    chemin = chemin_tiers(fichier)
+    if _est_copie(chemin):
+        return static(chemin)
+    return url_cdn(fichier)
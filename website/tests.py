@@ -1,3 +1,253 @@
-from django.test import TestCase
+import os
+import posixpath
+import re
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.files.storage import default_storage
+from django.http import HttpResponse
+from django.template.backends import django as backend_django
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from PIL import Image
+
+from aude_web import profilage, repliques
+from aude_web.statiques import minifier_js
+
+from . import css_critique, images, views
+from .models import AboutPillar, StatItem
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class CachePagesTests(TestCase):
+    """Pages vitrine servies depuis le cache, invalidées par leurs modèles"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_page_servie_depuis_le_cache(self):
+        self.assertEqual(self.client.get('/').status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/').status_code, 200)
+            # Paramètre hors CACHE_PAGES['PARAMETRES'] : même entrée
+            self.assertEqual(self.client.get('/?utm_source=lettre').status_code, 200)
+
+    def test_invalidation_a_la_sauvegarde(self):
+        self.assertNotContains(self.client.get('/'), "Chantiers livrés")
+        with self.captureOnCommitCallbacks(execute=True):
+            StatItem.objects.create(number="1200", label="Chantiers livrés")
+        self.assertContains(self.client.get('/'), "Chantiers livrés")
+
+    def test_autres_pages_conservees(self):
+        self.client.get('/')
+        self.client.get('/about/')
+        with self.captureOnCommitCallbacks(execute=True):
+            AboutPillar.objects.create(title="Sécurité des chantiers")
+        with self.assertNumQueries(0):
+            self.client.get('/')
+        self.assertContains(self.client.get('/about/'), "Sécurité des chantiers")
+
+    def test_invalidation_apres_le_commit(self):
+        self.client.get('/')
+        with self.captureOnCommitCallbacks() as rappels:
+            StatItem.objects.create(number="1200", label="Chantiers livrés")
+            # Avant le commit, l'ancienne version reste servie
+            self.assertNotContains(self.client.get('/'), "Chantiers livrés")
+        for rappel in rappels:
+            rappel()
+        self.assertContains(self.client.get('/'), "Chantiers livrés")
+
+    def test_loaddata_n_invalide_pas(self):
+        self.client.get('/')
+        with self.captureOnCommitCallbacks() as rappels:
+            StatItem(number="1200", label="Chantiers livrés").save_base(raw=True)
+        self.assertEqual(rappels, [])
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class CSSCritiqueTests(TestCase):
+    """CSS extrait inséré dans <head>, feuilles analysées chargées en différé"""
+
+    def setUp(self):
+        sortie = tempfile.TemporaryDirectory()
+        self.addCleanup(sortie.cleanup)
+        # Premier dossier : celui où l'extraction écrit
+        reglages = override_settings(STATICFILES_DIRS=[sortie.name, settings.BASE_DIR / 'static'])
+        reglages.enable()
+        self.addCleanup(reglages.disable)
+        for lecture in (css_critique.index, css_critique.css_de_page):
+            lecture.cache_clear()
+            self.addCleanup(lecture.cache_clear)
+        cache.clear()
+
+    def test_css_en_ligne(self):
+        self.assertNotContains(self.client.get('/'), '<style>')
+        call_command('extraire_css_critique', stdout=StringIO())
+        # Page vitrine mise en cache par le premier affichage
+        cache.clear()
+
+        response = self.client.get('/')
+        self.assertContains(response, '<style>')
+        self.assertContains(response, '.navbar{')
+        self.assertContains(response, 'rel="preload" href="/static/css/style.css" as="style"')
+        self.assertContains(response, '<noscript><link rel="stylesheet" href="/static/css/style.css"></noscript>')
+
+
+@override_settings(REPLIQUES={'ALIAS': ['replique_1'], 'DUREE_PRIMAIRE': 5})
+class RepliquesTests(TestCase):
+    """Vues publiques sur la base principale juste après une nouvelle version de cache"""
+
+    def setUp(self):
+        cache.clear()
+
+    def lit_sur_replique(self):
+        def vue(request):
+            middleware.process_view(request, views.home, (), {})
+            return HttpResponse(str(repliques._etat.get().repliques))
+
+        middleware = repliques.RepliquesMiddleware(vue)
+        return middleware(RequestFactory().get('/')).content == b'True'
+
+    def test_base_principale_apres_invalidation(self):
+        self.assertTrue(self.lit_sur_replique())
+        incrementer = mock.Mock()
+        with self.captureOnCommitCallbacks(execute=True):
+            repliques.invalider_apres_commit(incrementer)
+            # Avant le commit : rien ne change
+            self.assertTrue(self.lit_sur_replique())
+        incrementer.assert_called_once_with()
+        self.assertFalse(self.lit_sur_replique())
+
+        cache.delete(repliques.CLE_VERSION_RECENTE)  # DUREE_PRIMAIRE écoulée
+        self.assertTrue(self.lit_sur_replique())
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class ProfilageTests(TestCase):
+    """Remise à zéro des mesures par POST, chronométrage retiré hors profilage"""
+
+    def setUp(self):
+        staff = User.objects.create(username='admin', is_staff=True)
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.force_login(staff)
+        profilage.statistiques.vider()
+        profilage.statistiques.ajouter('blog:article_list', profilage.Mesure())
+
+    def test_remise_a_zero_par_post(self):
+        self.client.get('/admin/profilage/?vider=1')
+        self.assertIn('blog:article_list', profilage.statistiques.resume())
+        self.assertEqual(self.client.post('/admin/profilage/').status_code, 403)
+
+        jeton = 'a' * 32
+        self.client.cookies[settings.CSRF_COOKIE_NAME] = jeton
+        response = self.client.post('/admin/profilage/', headers={'X-CSRFToken': jeton})
+        self.assertEqual(response.status_code, 200)
+        # Seule la requête de remise à zéro, mesurée après la vue, reste
+        self.assertNotIn('blog:article_list', profilage.statistiques.resume())
+
+    def test_render_retabli(self):
+        with override_settings(PROFILAGE={'ACTIF': True}):
+            profilage.ProfilageMiddleware(lambda request: None)
+            origine = profilage._render_d_origine
+            self.assertIsNotNone(origine)
+            self.assertIsNot(backend_django.Template.render, origine)
+            with override_settings(PROFILAGE={'ACTIF': False}):
+                self.assertIs(backend_django.Template.render, origine)
+                self.assertIsNone(profilage._render_d_origine)
+
+
+class ImagesTests(SimpleTestCase):
+    """Variantes responsives générées une fois, échecs mis en cache brièvement"""
+
+    def setUp(self):
+        medias = tempfile.TemporaryDirectory()
+        self.addCleanup(medias.cleanup)
+        reglages = override_settings(
+            MEDIA_ROOT=medias.name,
+            IMAGES_RESPONSIVES={'LARGEURS': (320, 640, 1280)},
+        )
+        reglages.enable()
+        self.addCleanup(reglages.disable)
+        cache.clear()
+        Image.new('RGB', (800, 600)).save(os.path.join(medias.name, 'photo.png'))
+
+    def test_variantes(self):
+        index = images.derives_du_media('photo.png')
+        self.assertEqual((index['largeur'], index['hauteur']), (800, 600))
+        # Pas d'agrandissement : 1280 ramené à la largeur de l'original
+        self.assertEqual([largeur for largeur, _ in index['variantes']['jpg']], [320, 640, 800])
+        for variantes in index['variantes'].values():
+            for largeur, url in variantes:
+                chemin = url.removeprefix('/media/')
+                self.assertTrue(default_storage.exists(chemin), url)
+
+        # Deuxième appel : index lu dans le cache, rien n'est régénéré
+        with mock.patch.object(images, 'generer') as generer:
+            self.assertEqual(images.derives_du_media('photo.png'), index)
+        generer.assert_not_called()
+
+    def test_variantes_ecrites_par_un_autre_processus(self):
+        enregistrer = default_storage.save
+
+        def concurrent(nom, contenu, **kwargs):
+            # Autre processus : même variante écrite juste avant celle-ci
+            if nom.endswith('/320.jpg') and not default_storage.exists(nom):
+                enregistrer(nom, ContentFile(b'variante'))
+            return enregistrer(nom, contenu, **kwargs)
+
+        with mock.patch.object(default_storage, 'save', side_effect=concurrent):
+            index = images.derives_du_media('photo.png')
+        dossier = posixpath.dirname(index['variantes']['jpg'][0][1].removeprefix('/media/'))
+        fichiers = default_storage.listdir(dossier)[1]
+        self.assertIn('index.json', fichiers)
+        self.assertTrue(all(re.fullmatch(r'\d+\.\w+|index\.json', nom) for nom in fichiers), fichiers)
+
+    def test_fichier_remplace_nouveau_dossier(self):
+        with default_storage.open('photo.png') as fichier:
+            avant = images.empreinte(fichier)
+        Image.new('RGB', (400, 300)).save(os.path.join(default_storage.location, 'photo.png'))
+        with default_storage.open('photo.png') as fichier:
+            self.assertNotEqual(images.empreinte(fichier), avant)
+
+    def test_echec_mis_en_cache_brievement(self):
+        with open(os.path.join(default_storage.location, 'illisible.png'), 'wb') as fichier:
+            fichier.write(b'pas une image')
+
+        with mock.patch.object(cache, 'set', wraps=cache.set) as mise_en_cache:
+            with self.assertLogs('website.images', 'WARNING'):
+                self.assertIsNone(images.derives_du_media('illisible.png'))
+        mise_en_cache.assert_called_once_with(mock.ANY, {}, timeout=images.DUREE_ECHEC)
+        self.assertIsNone(images.derives_du_media('illisible.png'))
+
+
+class MinificationJSTests(SimpleTestCase):
+    """Blancs et commentaires réduits, chaînes, gabarits et regex intacts"""
+
+    def test_code(self):
+        js = "// titre\nfunction f(a, b) {\n    /* corps */\n    return a - -b;\n}\n"
+        self.assertEqual(minifier_js(js), "function f(a,b){return a - -b;}\n")
+
+    def test_litteraux_conserves(self):
+        litteraux = [
+            "`gabarit  ${ {a: '}'}.a + `${x  }` }\n   suite`",
+            "'chaîne // pas un commentaire'",
+            '"continu\\\n   ation"',
+            "/a  b\\/[/]c/g",
+        ]
+        for litteral in litteraux:
+            with self.subTest(litteral):
+                self.assertEqual(minifier_js(f"const  x = {litteral} ;"), f"const x={litteral};\n")
+
+    def test_fin_de_ligne_conservee(self):
+        # Insertion automatique de point-virgule : les retours à la ligne restent
+        js = "var c=a\n++b\nreturn\nx\n"
+        self.assertEqual(minifier_js(js), js)
+
+    def test_illisible_laisse_tel_quel(self):
+        js = "var s = 'non terminée\n;"
+        self.assertIs(minifier_js(js), js)
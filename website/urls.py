@@ -1,10 +1,17 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Vues async sous ASGI (voir aude_web/asgi.py)
+if settings.VUES_ASYNC:
+    home, tarifs = views.home_async, views.tarifs_async
+else:
+    home, tarifs = views.home, views.tarifs
+
 urlpatterns = [
-    path('', views.home, name='home'),
+    path('', home, name='home'),
     path('about/', views.a_propos, name='about'),
     path('solutions/', views.solutions, name='solutions'),
-    path('tarifs/', views.tarifs, name='tarifs'),
+    path('tarifs/', tarifs, name='tarifs'),
     path('contact/', views.contact, name='contact'),
 ]
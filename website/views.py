@@ -1,6 +1,9 @@
 
 # Create your views here.
+import asyncio
+
 from django.shortcuts import render
+from django.template.response import TemplateResponse
 from .models import HeroSection
 from .models import StatItem
 from .models import AdvantageItem
@@ -8,10 +11,12 @@ from .models import CallToAction
 from .models import AboutHero, AboutPillar, AboutStat, AboutCTA
 from .models import SolutionAudienceCategory, SolutionFeatureBTP, SolutionFeatureArchitecture, SolutionCTA
 from .models import PricingPlan, PricingFeature, FAQ, CTASection, Testimonial
+from .cache_pages import page_en_cache
 
 
 
 
+@page_en_cache(HeroSection, StatItem, CallToAction, Testimonial, AdvantageItem)
 def home(request):
     hero_section = HeroSection.objects.first()
     stats = StatItem.objects.all()
@@ -23,6 +28,26 @@ def home(request):
     return render(request, "home.html", {"hero_section": hero_section, "stats": stats, "advantages": advantages,"ctas": ctas,"testimonials": testimonials,})
 
 
+async def _liste(queryset):
+    return [objet async for objet in queryset]
+
+
+# Version async de home (serveur ASGI, voir website/urls.py) :
+# requêtes lancées ensemble, même cache que home
+@page_en_cache(HeroSection, StatItem, CallToAction, Testimonial, AdvantageItem, page='home')
+async def home_async(request):
+    hero_section, stats, ctas, testimonials, advantages = await asyncio.gather(
+        HeroSection.objects.afirst(),
+        _liste(StatItem.objects.all()),
+        _liste(CallToAction.objects.filter(is_active=True)),
+        _liste(Testimonial.objects.all()),
+        _liste(AdvantageItem.objects.all()),
+    )
+    # Rendu du template hors de la boucle d'événements (TemplateResponse)
+    return TemplateResponse(request, "home.html", {"hero_section": hero_section, "stats": stats, "advantages": advantages, "ctas": ctas, "testimonials": testimonials})
+
+
+@page_en_cache(AboutHero, AboutPillar, AboutStat, AboutCTA)
 def a_propos(request):
     context = {
         "hero": AboutHero.objects.filter(is_active=True).first(),
@@ -32,6 +57,7 @@ def a_propos(request):
     }
     return render(request, "a-propos.html", context)
 
+@page_en_cache(SolutionAudienceCategory, SolutionFeatureBTP, SolutionFeatureArchitecture, SolutionCTA)
 def solutions(request):
     audiences = SolutionAudienceCategory.objects.all()
     btp_features = SolutionFeatureBTP.objects.all()
@@ -79,7 +105,17 @@ def pricing_page(request):
     return render(request, 'pricing/pricing_page.html', context)
 
 
+# Choix de périodes avec les pourcentages de réduction
+PERIODES_TARIFS = [
+    ('monthly', 'Mensuel', 0),
+    ('quarterly', 'Trimestriel', 3.5),
+    ('biannual', 'Semestriel', 4),
+    ('annual', 'Annuel', 5),
+]
+
+
 # Vue alternative avec filtre par période (optionnel)
+@page_en_cache(PricingPlan, PricingFeature, FAQ, CTASection)
 def tarifs(request):
     """
     Vue pour afficher la page des tarifs avec tous les plans
@@ -96,22 +132,36 @@ def tarifs(request):
     # Récupérer le CTA pour la page tarifs
     cta = CTASection.objects.filter(page='pricing', is_active=True).first()
 
-    # Préparer les choix de périodes avec les pourcentages de réduction
-    period_choices = [
-        ('monthly', 'Mensuel', 0),
-        ('quarterly', 'Trimestriel', 3.5),
-        ('biannual', 'Semestriel', 4),
-        ('annual', 'Annuel', 5),
-    ]
-
     context = {
         'plans': plans,  # TOUS les plans (16 au total)
         'faqs': faqs,
         'cta': cta,
-        'period_choices': period_choices,
+        'period_choices': PERIODES_TARIFS,
     }
 
     return render(request, 'tarifs.html', context)
 
+
+# Version async de tarifs (serveur ASGI, voir website/urls.py)
+@page_en_cache(PricingPlan, PricingFeature, FAQ, CTASection, page='tarifs')
+async def tarifs_async(request):
+    plans, faqs, cta = await asyncio.gather(
+        _liste(PricingPlan.objects.filter(
+            is_active=True
+        ).prefetch_related('features').order_by('period', 'display_order')),
+        _liste(FAQ.objects.filter(is_active=True).order_by('display_order')),
+        CTASection.objects.filter(page='pricing', is_active=True).afirst(),
+    )
+
+    context = {
+        'plans': plans,
+        'faqs': faqs,
+        'cta': cta,
+        'period_choices': PERIODES_TARIFS,
+    }
+
+    return TemplateResponse(request, 'tarifs.html', context)
+
+@page_en_cache()
 def contact(request):
     return render(request, 'contact.html')